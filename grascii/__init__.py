@@ -1,6 +1,8 @@
 # ruff: noqa: E402
 from __future__ import annotations
 
+from typing import TYPE_CHECKING
+
 APP_NAME = "grascii"
 __version__ = "0.10.0"
 
@@ -9,6 +11,7 @@ from grascii.dictionary.build import (
     BuildMessage,
     BuildSummary,
     DictionaryBuilder,
+    DictionaryFormat,
     DictionaryOutputOptions,
 )
 from grascii.dictionary.pipeline import CancelPipeline, PipelineFunc
@@ -17,19 +20,26 @@ from grascii.interpreter import (
     Interpretation,
     interpretation_to_string,
 )
-from grascii.parser import GrasciiParser, InvalidGrascii
 from grascii.regen import SearchMode, Strictness
 from grascii.searchers import (
+    GrasciiQuery,
     GrasciiSearcher,
+    GrasciiSearcherOptions,
     GrasciiSearchOptions,
     RegexSearcher,
     ReverseSearcher,
+    SearchEngine,
     Searcher,
     SearcherOptions,
+    SearchExecutor,
+    SearchPlan,
     SearchResult,
 )
 from grascii.validator import GrasciiValidator
 
+if TYPE_CHECKING:
+    from grascii.parser import GrasciiParser, InvalidGrascii
+
 __all__ = [
     "Dictionary",
     "DictionaryEntry",
@@ -37,6 +47,7 @@ __all__ = [
     "BuildMessage",
     "BuildSummary",
     "DictionaryBuilder",
+    "DictionaryFormat",
     "DictionaryOutputOptions",
     "CancelPipeline",
     "PipelineFunc",
@@ -47,12 +58,26 @@ __all__ = [
     "InvalidGrascii",
     "SearchMode",
     "Strictness",
+    "GrasciiQuery",
     "GrasciiSearcher",
+    "GrasciiSearcherOptions",
     "GrasciiSearchOptions",
     "RegexSearcher",
     "ReverseSearcher",
+    "SearchEngine",
+    "SearchExecutor",
+    "SearchPlan",
     "Searcher",
     "SearcherOptions",
     "SearchResult",
     "GrasciiValidator",
 ]
+
+
+def __getattr__(name: str):
+    # the parser imports lark, which is only imported when it is needed
+    if name in ("GrasciiParser", "InvalidGrascii"):
+        from grascii import parser
+
+        return getattr(parser, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -98,7 +98,7 @@ def get_preset_config(preset: ConfigPreset):
         preset_config = preset_config.replace(
             "Dictionary = :preanniversary :preanniversary-phrases",
             "Dictionary = :anniversary",
-        )
+        ).replace("Preset = preanniversary", "Preset = anniversary")
     return preset_config
 
 
@@ -5,10 +5,11 @@ import sys
 from functools import lru_cache
 from typing import TYPE_CHECKING
 
-from lark import Lark, Token, Transformer, UnexpectedInput
+from lark import Token, Transformer, UnexpectedInput
 from lark.exceptions import VisitError
 from lark.visitors import v_args
 
+from grascii.grammars import get_parser
 from grascii.interpreter import interpretation_to_string
 from grascii.lark_ambig_tools import Disambiguator
 from grascii.parser import GrasciiFlattener
@@ -142,8 +143,7 @@ def dephrase(phrase: str, aggressive: bool = False) -> Iterable[str]:
     :returns: A generator of possible dephrasings
     """
     grammar_name = "phrases_extended.lark" if aggressive else "phrases.lark"
-    parser = Lark.open_from_package(
-        "grascii.grammars",
+    parser = get_parser(
         grammar_name,
         parser="earley",
         ambiguity="explicit",
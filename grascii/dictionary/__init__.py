@@ -7,21 +7,34 @@ from typing import (
     IO,
     TYPE_CHECKING,
     Any,
-    NamedTuple,
 )
 
 from grascii.dictionary import build, install, uninstall
 from grascii.dictionary import list as list_dict
+from grascii.dictionary.binary import InvalidDictionaryFile
 from grascii.dictionary.common import (
     BUILTINS_PACKAGE,
     INSTALLATION_DIR,
+    DictionaryEntry,
     DictionaryNotFound,
     get_dictionary_installed_name,
     get_dictionary_path_name,
     is_dictionary_installed_name,
 )
+from grascii.dictionary.index import (
+    NGRAM_INDEX,
+    WORD_INDEX,
+    read_ngram_index,
+    read_word_index,
+)
 from grascii.dictionary.install import install_dictionary  # noqa: F401
 from grascii.dictionary.list import get_built_ins, get_installed  # noqa: F401
+from grascii.dictionary.store import get_dictionary_store
+from grascii.dictionary.strokes import (
+    STROKES_SUFFIX,
+    TOKENS_CHECKSUM,
+    read_stroke_file,
+)
 from grascii.dictionary.uninstall import uninstall_dictionary  # noqa: F401
 from grascii.grammar import HARD_CHARACTERS
 
@@ -30,6 +43,10 @@ if TYPE_CHECKING:
     import os
     from importlib.resources.abc import Traversable
 
+    from grascii.dictionary.index import NgramIndex, WordIndex
+    from grascii.dictionary.store import Shard
+    from grascii.dictionary.strokes import StrokeFile
+
 description = "Create and manage Grascii dictionaries"
 
 
@@ -71,11 +88,6 @@ def build_argparser(argparser: argparse.ArgumentParser) -> None:
     list_parser.set_defaults(func=list_dict.cli_list)
 
 
-class DictionaryEntry(NamedTuple):
-    grascii: str
-    translation: str
-
-
 class DictionaryType(Enum):
     BUILTIN = 0
     INSTALLED = 1
@@ -108,6 +120,71 @@ class Dictionary:
         """
         return self.path.joinpath(name).open()
 
+    def load(self, name: str) -> Shard:
+        """Load a file from the dictionary with the given name through the
+        shared ``DictionaryStore``. The file is only read from disk if it is not
+        already loaded or has changed since it was loaded.
+
+        :param name: The name of the file to load.
+        :type name: str
+
+        :returns: The loaded file.
+        :raises FileNotFoundError: If the file does not exist.
+        """
+        return get_dictionary_store().get(self.path.joinpath(name))
+
+    def load_ngram_index(self) -> NgramIndex | None:
+        """Load the n-gram index of the dictionary through the shared
+        ``DictionaryStore``.
+
+        :returns: The loaded index, or ``None`` if the dictionary has no valid
+            n-gram index.
+        """
+        try:
+            return get_dictionary_store().load(
+                self.path.joinpath(NGRAM_INDEX), read_ngram_index
+            )
+        except (FileNotFoundError, InvalidDictionaryFile):
+            return None
+
+    def load_word_index(self) -> WordIndex | None:
+        """Load the word index of the dictionary through the shared
+        ``DictionaryStore``.
+
+        :returns: The loaded index, or ``None`` if the dictionary has no valid
+            word index.
+        """
+        try:
+            return get_dictionary_store().load(
+                self.path.joinpath(WORD_INDEX), read_word_index
+            )
+        except (FileNotFoundError, InvalidDictionaryFile):
+            return None
+
+    def load_strokes(self, name: str) -> StrokeFile | None:
+        """Load the stroke file of a file from the dictionary through the
+        shared ``DictionaryStore``.
+
+        :param name: The name of the dictionary file.
+        :type name: str
+
+        :returns: The loaded stroke file, or ``None`` if the file has no stroke
+            file, the file has changed since its stroke file was written, or
+            the stroke file was written with a different token table.
+        """
+        try:
+            strokes = get_dictionary_store().load(
+                self.path.joinpath(name + STROKES_SUFFIX), read_stroke_file
+            )
+            shard = self.load(name)
+        except FileNotFoundError:
+            return None
+        if strokes.checksum != shard.checksum or len(strokes) != len(shard):
+            return None
+        if strokes.tokens_checksum != TOKENS_CHECKSUM:
+            return None
+        return strokes
+
     def dump(self) -> list[DictionaryEntry]:
         """Get all the entries in this dictionary.
 
@@ -117,12 +194,10 @@ class Dictionary:
 
         for c in HARD_CHARACTERS:
             try:
-                with self.open(c) as f:
-                    for line in f:
-                        grascii, translation = line.strip().split(maxsplit=1)
-                        entries.append(DictionaryEntry(grascii, translation))
+                shard = self.load(c)
             except FileNotFoundError:
                 continue
+            entries.extend(shard)
 
         return entries
 
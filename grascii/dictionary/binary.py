@@ -0,0 +1,379 @@
+"""
+Contains the reader and writer for the binary dictionary file format.
+
+A binary dictionary file consists of:
+
+1. A header containing the magic bytes, the format version, flags and the
+   number of entries. The ``FLAG_SORTED`` flag is set when the entries are
+   sorted by their Grascii strings.
+2. An offset table of ``count + 1`` unsigned 32-bit integers giving the start
+   of each entry relative to the entry data. The last offset is the length of
+   the entry data.
+3. A table of ``count`` unsigned 16-bit integers giving the length in bytes of
+   the Grascii string of each entry.
+4. A newline followed by the entry data: UTF-8 encoded lines of the form
+   ``GRASCII Translation``, each terminated by a newline.
+
+All integers are little-endian. Because the entry data is laid out as lines,
+line-anchored regular expressions can run over the entry data directly.
+"""
+
+from __future__ import annotations
+
+import mmap
+import os
+import re
+import struct
+import sys
+import zlib
+from array import array
+from bisect import bisect_right
+from functools import cached_property, lru_cache
+from typing import TYPE_CHECKING, TypeVar
+
+from grascii.dictionary.common import DictionaryEntry, estimate_size
+from grascii.dictionary.shards import (
+    LineBuffer,
+    find_prefix_ranges,
+    is_line_safe,
+    match_lines,
+    scan_lines,
+)
+from grascii.dictionary.trie import GrasciiTrie
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator, Sequence
+    from importlib.resources.abc import Traversable
+    from re import Pattern
+
+    from grascii.dictionary.shards import Range, ShardMatch
+
+IT = TypeVar("IT")
+
+MAGIC = b"GRASCIIB"
+"""The bytes that begin every binary dictionary file."""
+VERSION = 1
+"""The current version of the binary dictionary format."""
+FLAG_SORTED = 1
+"""The flag set when the entries of a file are sorted by Grascii string."""
+
+_HEADER = struct.Struct("<8sHHI")
+_UINT32 = "I" if array("I").itemsize == 4 else "L"
+_UINT16 = "H"
+_NON_ASCII = re.compile(rb"[\x80-\xff]")
+
+
+class InvalidDictionaryFile(Exception):
+    """Exception raised when reading a malformed binary dictionary file."""
+
+    def __init__(self, message: str) -> None:
+        super().__init__(message)
+
+
+def _to_little_endian(values: array) -> array:
+    if sys.byteorder == "big":
+        values.byteswap()
+    return values
+
+
+def write_binary_shard(
+    path: os.PathLike | str, entries: Sequence[tuple[str, str]]
+) -> None:
+    """Write entries to a binary dictionary file.
+
+    The file is written to a temporary file and moved into place, so that
+    processes that have the previous version of the file mapped into memory
+    are unaffected. Windows does not allow replacing a mapped file, so the
+    previous version must not be mapped by the writing process; see
+    ``DictionaryStore.close_file``. ``FLAG_SORTED`` is set if the entries are
+    sorted by their Grascii strings.
+
+    :param path: The path of the file to write.
+    :param entries: A sequence of Grascii strings and their translations.
+    """
+
+    offsets = array(_UINT32, [0])
+    splits = array(_UINT16)
+    data = bytearray()
+    flags = FLAG_SORTED
+    previous = ""
+    for grascii, translation in entries:
+        if grascii < previous:
+            flags &= ~FLAG_SORTED
+        previous = grascii
+        encoded = grascii.encode()
+        splits.append(len(encoded))
+        data += encoded
+        data += b" "
+        data += translation.encode()
+        data += b"\n"
+        offsets.append(len(data))
+
+    temp_path = f"{os.fspath(path)}.tmp"
+    with open(temp_path, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, VERSION, flags, len(entries)))
+        f.write(_to_little_endian(offsets).tobytes())
+        f.write(_to_little_endian(splits).tobytes())
+        f.write(b"\n")
+        f.write(data)
+    os.replace(temp_path, path)
+
+
+def is_binary_shard(path: Traversable) -> bool:
+    """Check whether a dictionary file is in the binary format.
+
+    :param path: The path to a dictionary file.
+    :returns: True if the file begins with the binary format's magic bytes.
+    """
+
+    with path.open("rb") as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+
+@lru_cache(maxsize=256)
+def to_bytes_pattern(pattern: Pattern[str]) -> Pattern[bytes] | None:
+    """Compile a multiline bytes equivalent of a string pattern.
+
+    The bytes pattern treats the text with ASCII semantics, so it matches the
+    same lines as the original pattern only if the text is ASCII.
+
+    :param pattern: A compiled string pattern.
+    :returns: A compiled bytes pattern, or ``None`` if the pattern cannot be
+        converted or is not line-safe.
+    """
+
+    if not pattern.pattern.isascii() or not is_line_safe(pattern):
+        return None
+    flags = (pattern.flags & ~re.UNICODE) | re.MULTILINE
+    try:
+        return re.compile(pattern.pattern.encode(), flags)
+    except re.error:
+        return None
+
+
+class _Keys:
+    """A sequence view of the encoded Grascii strings of a binary dictionary
+    file."""
+
+    def __init__(self, shard: BinaryShard) -> None:
+        self._shard = shard
+
+    def __len__(self) -> int:
+        return len(self._shard)
+
+    def __getitem__(self, index: int) -> bytes:
+        return self._shard.key(index)
+
+
+class _Lines:
+    """A sequence view of the decoded lines of a binary dictionary file."""
+
+    def __init__(self, shard: BinaryShard) -> None:
+        self._shard = shard
+
+    def __len__(self) -> int:
+        return len(self._shard)
+
+    def __getitem__(self, index: int) -> str:
+        return self._shard.line(index)
+
+
+class BinaryShard:
+    """The entries of a binary dictionary file.
+
+    Entries are read directly from the buffer and are only decoded when they
+    are accessed or matched by a search.
+
+    :param buffer: The contents of a binary dictionary file.
+    :raises InvalidDictionaryFile: If the buffer is not a valid binary
+        dictionary file.
+    """
+
+    def __init__(self, buffer: bytes | mmap.mmap) -> None:
+        if len(buffer) < _HEADER.size:
+            raise InvalidDictionaryFile("File is too small")
+        magic, version, self.flags, count = _HEADER.unpack_from(buffer)
+        if magic != MAGIC:
+            raise InvalidDictionaryFile("Not a binary dictionary file")
+        if version != VERSION:
+            raise InvalidDictionaryFile(f"Unsupported version: {version}")
+
+        position = _HEADER.size
+        self._offsets = array(_UINT32)
+        self._offsets.frombytes(buffer[position : position + 4 * (count + 1)])
+        _to_little_endian(self._offsets)
+        position += 4 * (count + 1)
+        self._splits = array(_UINT16)
+        self._splits.frombytes(buffer[position : position + 2 * count])
+        _to_little_endian(self._splits)
+        position += 2 * count
+
+        if buffer[position : position + 1] != b"\n":
+            raise InvalidDictionaryFile("Missing entry data")
+        self._data_start = position + 1
+        if self._data_start + self._offsets[-1] != len(buffer):
+            raise InvalidDictionaryFile("Truncated entry data")
+        self._buffer = buffer
+        # the pages of a mapped file stay resident once they are read
+        self.size = len(buffer) + estimate_size((self._offsets, self._splits))
+        """The estimated size in bytes of the shard in memory."""
+        self.sorted = bool(self.flags & FLAG_SORTED)
+
+    def __len__(self) -> int:
+        return len(self._splits)
+
+    def close(self) -> None:
+        """Unmap the file of the shard if it is mapped into memory. The shard
+        cannot be used once it is closed."""
+
+        if isinstance(self._buffer, mmap.mmap):
+            self._buffer.close()
+
+    def __getitem__(self, index: int) -> DictionaryEntry:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("entry index out of range")
+        start = self._data_start + self._offsets[index]
+        split = start + self._splits[index]
+        end = self._data_start + self._offsets[index + 1] - 1
+        return DictionaryEntry(
+            self._buffer[start:split].decode(), self._buffer[split + 1 : end].decode()
+        )
+
+    def __iter__(self) -> Iterator[DictionaryEntry]:
+        for i in range(len(self)):
+            yield self[i]
+
+    def line(self, index: int) -> str:
+        """Get the line of an entry.
+
+        :param index: The index of the entry.
+        :returns: The Grascii string and translation separated by a space.
+        """
+
+        start = self._data_start + self._offsets[index]
+        end = self._data_start + self._offsets[index + 1] - 1
+        return self._buffer[start:end].decode()
+
+    def key(self, index: int) -> bytes:
+        """Get the encoded Grascii string of an entry.
+
+        :param index: The index of the entry.
+        :returns: The UTF-8 encoded Grascii string.
+        """
+
+        start = self._data_start + self._offsets[index]
+        return self._buffer[start : start + self._splits[index]]
+
+    @cached_property
+    def trie(self) -> GrasciiTrie:
+        """A trie of the Grascii strings of the entries, built on first use."""
+        return GrasciiTrie(self.key(i).decode() for i in range(len(self)))
+
+    @cached_property
+    def checksum(self) -> int:
+        """A CRC-32 checksum of the file, computed on first use."""
+        return zlib.crc32(self._buffer)
+
+    def find_ranges(
+        self, prefix_steps: Iterable[Sequence[Sequence[str]]]
+    ) -> list[Range] | None:
+        """Find the ranges of entries whose Grascii strings begin with a prefix
+        made from the given steps.
+
+        :param prefix_steps: An iterable of lists of steps as created by
+            ``RegexBuilder.get_prefix_steps``.
+        :returns: A sorted list of ranges, or ``None`` if the shard is not
+            sorted.
+        """
+
+        if not self.sorted:
+            return None
+        # UTF-8 preserves the order of code points and never contains 0xff
+        encoded = (
+            [[option.encode() for option in step] for step in steps]
+            for steps in prefix_steps
+        )
+        return find_prefix_ranges(_Keys(self), encoded, b"\xff")
+
+    @cached_property
+    def is_ascii(self) -> bool:
+        """Whether the entries only contain ASCII characters, which allows
+        patterns to run over the encoded entries directly."""
+        return _NON_ASCII.search(self._buffer, self._data_start) is None
+
+    @cached_property
+    def _text(self) -> LineBuffer:
+        """The decoded entries, used to run patterns over entries that are not
+        ASCII."""
+        return LineBuffer(self._buffer[self._data_start :].decode())
+
+    def _locate(self, position: int) -> tuple[int, int]:
+        index = bisect_right(self._offsets, position - self._data_start) - 1
+        return (
+            self._data_start + self._offsets[index],
+            self._data_start + self._offsets[index + 1] - 1,
+        )
+
+    def search(
+        self,
+        patterns: Iterable[tuple[IT, Pattern[str]]],
+        ranges: Iterable[Range] | None = None,
+        prefilter: Pattern[str] | None = None,
+    ) -> Iterator[ShardMatch[IT]]:
+        """Search the shard for entries matching any of the given patterns.
+
+        :param patterns: An iterable of interpretations and corresponding
+            compiled regular expression patterns.
+        :param ranges: The ranges of entries to search. All entries are
+            searched by default.
+        :param prefilter: A pattern that matches every line matched by any of
+            the patterns. Only the lines it matches are checked against each
+            pattern.
+        :returns: An iterator over the matches of each matching entry.
+        """
+
+        patterns = list(patterns)
+        if ranges is None:
+            ranges = [(0, len(self))]
+        for start, end in ranges:
+            if not self.is_ascii:
+                for matches, i in self._text.search(patterns, start, end, prefilter):
+                    yield matches, self[i], i
+                continue
+            hits = scan_lines(
+                self._buffer,
+                patterns,
+                self._data_start + self._offsets[start],
+                self._data_start + self._offsets[end],
+                self._locate,
+                prefilter,
+                to_bytes_pattern,
+            )
+            if hits is None:
+                lines = _Lines(self)
+                for matches, i in match_lines(lines, patterns, start, end, prefilter):
+                    yield matches, self[i], i
+                continue
+            for line_start in sorted(hits):
+                index = bisect_right(self._offsets, line_start - self._data_start) - 1
+                yield hits[line_start], self[index], index
+
+
+def read_binary_shard(path: Traversable) -> BinaryShard:
+    """Map a binary dictionary file into memory.
+
+    :param path: The path to a binary dictionary file.
+    :returns: The loaded shard.
+    :raises InvalidDictionaryFile: If the file is not a valid binary
+        dictionary file.
+    """
+
+    with path.open("rb") as f:
+        try:
+            fileno = f.fileno()
+        except (AttributeError, OSError):
+            # not backed by a file on disk, e.g. inside a zip archive
+            return BinaryShard(f.read())
+        return BinaryShard(mmap.mmap(fileno, 0, access=mmap.ACCESS_READ))
@@ -17,10 +17,13 @@ import sys
 import time
 from contextlib import nullcontext
 from dataclasses import dataclass
+from enum import Enum
 from fileinput import FileInput
 from typing import TYPE_CHECKING, NamedTuple, TextIO
 
 from grascii import grammar
+from grascii.dictionary.binary import write_binary_shard
+from grascii.dictionary.index import remove_indexes, write_indexes
 from grascii.dictionary.pipeline import (
     CancelPipeline,
     PipelineFunc,
@@ -29,6 +32,8 @@ from grascii.dictionary.pipeline import (
     remove_boundaries,
     standardize_case,
 )
+from grascii.dictionary.store import get_dictionary_store
+from grascii.dictionary.strokes import remove_stroke_files, write_stroke_files
 
 if TYPE_CHECKING:
     from collections.abc import Iterable
@@ -69,6 +74,31 @@ def build_argparser(argparser: argparse.ArgumentParser) -> None:
         action="store_true",
         help="clean the output directory before building",
     )
+    output_group.add_argument(
+        "-f",
+        "--format",
+        dest="output_format",
+        choices=[output_format.value for output_format in DictionaryFormat],
+        default=DictionaryFormat.TEXT.value,
+        help="the format of the output files",
+    )
+    output_group.add_argument(
+        "-s",
+        "--sort",
+        action="store_true",
+        help="sort the entries of each output file by grascii",
+    )
+    output_group.add_argument(
+        "-i",
+        "--index",
+        action="store_true",
+        help="write index files to speed up searches",
+    )
+    output_group.add_argument(
+        "--strokes",
+        action="store_true",
+        help="write the canonical interpretation of each entry to stroke files",
+    )
     validation_group = argparser.add_argument_group("validation")
     validation_group.add_argument(
         "-p",
@@ -181,6 +211,13 @@ class _BuilderLoggerAdapter(logging.LoggerAdapter):
         self.logger.error(message, *args, **kwargs)
 
 
+class DictionaryFormat(Enum):
+    """An enum representing the formats of dictionary output files."""
+
+    TEXT = "text"
+    BINARY = "binary"
+
+
 @dataclass
 class DictionaryOutputOptions:
     """Options for dictionary build output.
@@ -188,12 +225,29 @@ class DictionaryOutputOptions:
     :param output_dir: The directory where to output the dictionary files.
     :param clean: Whether to delete all files in the output directory before
         building.
+    :param format: The format of the output files.
+    :param sort: Whether to sort the entries of each output file by their
+        Grascii strings. Sorted files allow searches to look up entries by
+        prefix instead of scanning the whole file.
+    :param index: Whether to write index files that narrow searches that do
+        not match the beginning of Grascii strings.
+    :param strokes: Whether to write stroke files holding the canonical
+        interpretation of each entry, so that it does not need to be computed
+        when searching.
     :type output_dir: os.PathLike
     :type clean: bool
+    :type format: DictionaryFormat
+    :type sort: bool
+    :type index: bool
+    :type strokes: bool
     """
 
     output_dir: os.PathLike
     clean: bool = False
+    format: DictionaryFormat = DictionaryFormat.TEXT
+    sort: bool = False
+    index: bool = False
+    strokes: bool = False
 
 
 class _OutputManager:
@@ -224,12 +278,12 @@ class _OutputManager:
             for entry in out_dir.iterdir():
                 entry.unlink()
 
-    def _get_output_file(self, grascii: str) -> TextIO:
-        """Get an output file corresponding to the first alphabetic characters
-        in a grascii string.
+    def _get_output_name(self, grascii: str) -> str:
+        """Get the name of the output file corresponding to the first alphabetic
+        character in a grascii string.
 
-        :param grascii: A grascii string to get an output file for.
-        :returns: A text stream.
+        :param grascii: A grascii string to get an output file name for.
+        :returns: The name of an output file.
         """
 
         index = 0
@@ -237,14 +291,25 @@ class _OutputManager:
             index += 1
         if index == len(grascii):
             raise NoMatchingOutputFile()
+        return grascii[index]
+
+    def _get_output_file(self, grascii: str) -> TextIO:
+        """Get an output file corresponding to the first alphabetic characters
+        in a grascii string.
 
-        char = grascii[index]
+        :param grascii: A grascii string to get an output file for.
+        :returns: A text stream.
+        """
+
+        char = self._get_output_name(grascii)
         try:
             result = self._out_files[char]
             self.entry_counts[char] += 1
             return result
         except KeyError:
             out_file = pathlib.Path(self.options.output_dir, char)
+            # the previous version of the file may be mapped into memory
+            get_dictionary_store().close_file(out_file)
             self._out_files[char] = out_file.open("w")
             self._logger.info("Opened output file: %s", out_file)
             self.entry_counts[char] = 1
@@ -269,6 +334,59 @@ class _OutputManager:
         self._logger.info("Closed output files")
 
 
+class _BufferedOutputManager(_OutputManager):
+    """An output manager that collects the entries of each output file and
+    writes them when closed, sorting them if requested.
+    """
+
+    def __init__(
+        self,
+        options: DictionaryOutputOptions,
+        logger: logging.LoggerAdapter,
+    ):
+        super().__init__(options, logger)
+        self._entries: dict[str, list[tuple[str, str]]] = {}
+
+    def _write_entry(self, grascii: str, translation: str) -> None:
+        char = self._get_output_name(grascii)
+        try:
+            self._entries[char].append((grascii, translation))
+            self.entry_counts[char] += 1
+        except KeyError:
+            self._entries[char] = [(grascii, translation)]
+            self.entry_counts[char] = 1
+
+    def _close_output_files(self) -> None:
+        for char, entries in self._entries.items():
+            if self.options.sort:
+                entries.sort(key=lambda entry: entry[0])
+            out_file = pathlib.Path(self.options.output_dir, char)
+            get_dictionary_store().close_file(out_file)
+            self._write_file(out_file, entries)
+            self._logger.info("Wrote output file: %s", out_file)
+
+    def _write_file(self, path: pathlib.Path, entries: list[tuple[str, str]]) -> None:
+        """Write entries to an output file.
+
+        :param path: The path of the output file.
+        :param entries: A list of Grascii strings and their translations.
+        """
+
+        with path.open("w") as out:
+            for grascii, translation in entries:
+                out.write(grascii + " ")
+                out.write(translation + "\n")
+
+
+class _BinaryOutputManager(_BufferedOutputManager):
+    """An output manager that writes the collected entries of each output file
+    in the binary dictionary format.
+    """
+
+    def _write_file(self, path: pathlib.Path, entries: list[tuple[str, str]]) -> None:
+        write_binary_shard(path, entries)
+
+
 @dataclass
 class BuildSummary:
     """Results of a dictionary build.
@@ -417,11 +535,15 @@ class DictionaryBuilder:
                 "Only checking source files. Output files will not be generated."
             )
 
-        out = (
-            _OutputManager(output, self._logger)
-            if output
-            else nullcontext(lambda x, y: None)
-        )
+        out: _OutputManager | nullcontext
+        if not output:
+            out = nullcontext(lambda x, y: None)
+        elif output.format is DictionaryFormat.BINARY:
+            out = _BinaryOutputManager(output, self._logger)
+        elif output.sort:
+            out = _BufferedOutputManager(output, self._logger)
+        else:
+            out = _OutputManager(output, self._logger)
 
         seen_entries: dict[tuple[str, str], tuple[int, int]] = {}
         seen_files: list[str] = []
@@ -464,6 +586,18 @@ class DictionaryBuilder:
                     self._logger.error(f"No output file for {grascii} {translation}")
                     continue
 
+        if output:
+            if output.index:
+                write_indexes(output.output_dir)
+                self._logger.info("Wrote index files")
+            else:
+                remove_indexes(output.output_dir)
+            if output.strokes:
+                write_stroke_files(output.output_dir)
+                self._logger.info("Wrote stroke files")
+            else:
+                remove_stroke_files(output.output_dir)
+
         end_time = time.perf_counter()
         total_time = end_time - start_time
         self._logger.info("Build completed in %s seconds", total_time)
@@ -500,7 +634,16 @@ def cli_build(args: argparse.Namespace) -> int:
         quiet=args.quiet,
     )
     output_options = (
-        DictionaryOutputOptions(args.output, args.clean) if args.output else None
+        DictionaryOutputOptions(
+            args.output,
+            args.clean,
+            DictionaryFormat(args.output_format),
+            args.sort,
+            args.index,
+            args.strokes,
+        )
+        if args.output
+        else None
     )
     summary = builder.build(args.infiles, output_options)
 
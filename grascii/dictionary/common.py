@@ -1,5 +1,8 @@
 from __future__ import annotations
 
+import sys
+from typing import NamedTuple
+
 from platformdirs import user_data_path
 
 from grascii import APP_NAME
@@ -9,6 +12,36 @@ INSTALLATION_DIR = user_data_path(APP_NAME) / "dictionaries"
 BUILTINS_PACKAGE = "grascii.dictionary"
 
 
+def estimate_size(value: object) -> int:
+    """Estimate the memory used by a value, including the strings, numbers
+    and containers it holds. Objects held more than once are counted once.
+
+    :param value: A value made of built-in containers and scalars.
+    :returns: The estimated size in bytes.
+    """
+
+    seen = set()
+    size = 0
+    stack = [value]
+    while stack:
+        item = stack.pop()
+        if id(item) in seen:
+            continue
+        seen.add(id(item))
+        size += sys.getsizeof(item)
+        if isinstance(item, dict):
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple, set, frozenset)):
+            stack.extend(item)
+    return size
+
+
+class DictionaryEntry(NamedTuple):
+    grascii: str
+    translation: str
+
+
 class DictionaryException(Exception):
     """The base class for all dictionary-related exceptions."""
 
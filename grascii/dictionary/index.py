@@ -0,0 +1,415 @@
+"""
+Contains inverted indexes of Grascii dictionaries, which narrow searches that
+cannot be narrowed by the first letter of the searched Grascii string.
+
+Indexes are written alongside the files of a built dictionary and record the
+number of entries and the checksum of each file they were built from, so that
+an index is ignored for files that have changed since it was built.
+"""
+
+from __future__ import annotations
+
+import json
+import pathlib
+import re
+from bisect import bisect_left
+from itertools import pairwise
+from typing import TYPE_CHECKING
+
+from grascii import grammar
+from grascii.dictionary.binary import InvalidDictionaryFile
+from grascii.dictionary.common import estimate_size
+from grascii.dictionary.store import read_shard
+
+if TYPE_CHECKING:
+    import os
+    from collections.abc import Iterable, Mapping, Sequence
+    from importlib.resources.abc import Traversable
+
+    from grascii.dictionary.common import DictionaryEntry
+    from grascii.dictionary.store import Shard
+
+NGRAM_INDEX = "ngrams.json"
+"""The name of the n-gram index file of a dictionary."""
+WORD_INDEX = "words.json"
+"""The name of the word index file of a dictionary."""
+INDEX_FILES = [NGRAM_INDEX, WORD_INDEX]
+"""The names of all index files of a dictionary."""
+INDEX_VERSION = 2
+"""The current version of the index file format."""
+NGRAM_SIZE = 3
+"""The length of the longest n-grams in an n-gram index."""
+
+Postings = dict[str, list[int]]
+"""The indices of the entries containing a key, by dictionary file name."""
+
+_WORD_SEPARATOR = re.compile(r"[\s-]+")
+
+# characters that case-insensitive regular expressions match with ASCII
+# letters but str.lower does not map to them
+_CASE_FOLDS = str.maketrans({"İ": "i", "ı": "i", "ſ": "s"})
+
+
+def skeleton(grascii: str) -> str:
+    """Get the characters of a Grascii string that belong to strokes, removing
+    annotations, aspirates, disjoiners, boundaries and intersections.
+
+    Removing characters preserves substrings, so if a search pattern matches
+    part of a Grascii string, the skeleton of the matched strokes is a
+    substring of the skeleton of the Grascii string.
+
+    :param grascii: A Grascii string.
+    :returns: The skeleton of the Grascii string.
+    """
+
+    return "".join(c for c in grascii if c.isalpha() or c == "&")
+
+
+def fold_word(word: str) -> str:
+    """Normalize the case of a word the way case-insensitive regular
+    expressions compare ASCII letters.
+
+    :param word: A word.
+    :returns: The normalized word.
+    """
+
+    return word.translate(_CASE_FOLDS).lower()
+
+
+def split_words(translation: str) -> list[str]:
+    """Split a translation into normalized words at whitespace and hyphens.
+
+    :param translation: The translation of a dictionary entry.
+    :returns: A list of normalized words.
+    """
+
+    return [fold_word(word) for word in _WORD_SEPARATOR.split(translation) if word]
+
+
+def _union(postings: Iterable[Mapping[str, Iterable[int]]]) -> dict[str, set[int]]:
+    result: dict[str, set[int]] = {}
+    for posting in postings:
+        for name, indices in posting.items():
+            result.setdefault(name, set()).update(indices)
+    return result
+
+
+def _intersect(
+    a: Mapping[str, set[int]], b: Mapping[str, Iterable[int]]
+) -> dict[str, set[int]]:
+    result = {}
+    for name in a.keys() & b.keys():
+        indices = a[name].intersection(b[name])
+        if indices:
+            result[name] = indices
+    return result
+
+
+class _Index:
+    def __init__(
+        self, counts: dict[str, int], size: int, checksums: dict[str, int]
+    ) -> None:
+        self.counts = counts
+        self.size = size
+        self.checksums = checksums
+
+    def is_current(self, name: str, shard: Shard) -> bool:
+        """Check whether a dictionary file has the same entries as when the
+        index was built.
+
+        :param name: The name of a dictionary file.
+        :param shard: The loaded dictionary file.
+        :returns: True if the index can be used for the file.
+        """
+
+        return (
+            self.counts.get(name) == len(shard)
+            and self.checksums.get(name) == shard.checksum
+        )
+
+
+class NgramIndex(_Index):
+    """An index of the n-grams of the skeletons of the Grascii strings in a
+    dictionary. All n-grams up to ``n`` characters long are indexed.
+
+    :param counts: The number of entries in each indexed dictionary file.
+    :param postings: The postings of each n-gram.
+    :param n: The length of the longest indexed n-grams.
+    :param size: The estimated size in bytes of the index in memory.
+    :param checksums: The checksum of each indexed dictionary file.
+    """
+
+    def __init__(
+        self,
+        counts: dict[str, int],
+        postings: dict[str, Postings],
+        n: int = NGRAM_SIZE,
+        size: int = 0,
+        checksums: dict[str, int] | None = None,
+    ) -> None:
+        super().__init__(counts, size, checksums or {})
+        self.postings = postings
+        self.n = n
+
+    @classmethod
+    def from_entries(
+        cls,
+        files: Mapping[str, Sequence[DictionaryEntry]],
+        n: int = NGRAM_SIZE,
+        checksums: Mapping[str, int] | None = None,
+    ) -> NgramIndex:
+        """Create an index of the entries of dictionary files.
+
+        :param files: The entries of each dictionary file by file name.
+        :param n: The length of the longest n-grams to index.
+        :param checksums: The checksum of each dictionary file by file name.
+        :returns: A new index.
+        """
+
+        postings: dict[str, Postings] = {}
+        for name, entries in files.items():
+            for i, entry in enumerate(entries):
+                text = skeleton(entry.grascii)
+                grams = {
+                    text[start : start + length]
+                    for length in range(1, n + 1)
+                    for start in range(len(text) - length + 1)
+                }
+                for gram in grams:
+                    postings.setdefault(gram, {}).setdefault(name, []).append(i)
+        counts = {name: len(entries) for name, entries in files.items()}
+        return cls(counts, postings, n, checksums=dict(checksums or {}))
+
+    def write(self, path: os.PathLike | str) -> None:
+        """Write the index to a file.
+
+        :param path: The path of the file to write.
+        """
+
+        data = {
+            "version": INDEX_VERSION,
+            "n": self.n,
+            "counts": self.counts,
+            "checksums": self.checksums,
+            "postings": self.postings,
+        }
+        with open(path, "w") as f:
+            json.dump(data, f, separators=(",", ":"))
+
+    def lookup(self, text: str) -> dict[str, set[int]]:
+        """Find the entries whose skeletons contain a string.
+
+        :param text: A skeleton of strokes.
+        :returns: The indices of the entries by dictionary file name.
+        """
+
+        if len(text) <= self.n:
+            return _union([self.postings.get(text, {})])
+        result = _union([self.postings.get(text[: self.n], {})])
+        for start in range(1, len(text) - self.n + 1):
+            result = _intersect(
+                result, self.postings.get(text[start : start + self.n], {})
+            )
+        return result
+
+    def find_candidates(
+        self, strokes: Iterable[Sequence[Sequence[str]]]
+    ) -> dict[str, list[int]] | None:
+        """Find the entries that may contain one of the given sequences of
+        strokes.
+
+        Each adjacent pair of strokes is looked up, so a candidate contains
+        every pair but not necessarily the whole sequence. Candidates must be
+        confirmed by matching them against a search pattern.
+
+        :param strokes: An iterable of sequences of strokes, one for each
+            interpretation, as created by
+            ``RegexBuilder.get_stroke_alternatives``. Each stroke is a sequence
+            of alternative strings.
+        :returns: The sorted indices of the candidates by dictionary file name,
+            or ``None`` if an interpretation has no strokes to look up.
+        """
+
+        candidates: dict[str, set[int]] = {}
+        for alternatives in strokes:
+            found = self._find_sequence(alternatives)
+            if found is None:
+                return None
+            for name, indices in found.items():
+                candidates.setdefault(name, set()).update(indices)
+        return {name: sorted(indices) for name, indices in candidates.items()}
+
+    def _find_sequence(
+        self, alternatives: Sequence[Sequence[str]]
+    ) -> dict[str, set[int]] | None:
+        skeletons = [{skeleton(a) for a in stroke} for stroke in alternatives]
+        if not skeletons:
+            return None
+        if len(skeletons) == 1:
+            groups = skeletons
+        else:
+            groups = [{a + b for a in x for b in y} for x, y in pairwise(skeletons)]
+
+        result = None
+        for group in groups:
+            found = _union(self.lookup(text) for text in group)
+            result = found if result is None else _intersect(result, found)
+        return result
+
+
+class WordIndex(_Index):
+    """An index of the words in the translations of a dictionary. Words are
+    split at whitespace and hyphens and normalized with ``fold_word``.
+
+    :param counts: The number of entries in each indexed dictionary file.
+    :param postings: The postings of each word.
+    :param size: The estimated size in bytes of the index in memory.
+    :param checksums: The checksum of each indexed dictionary file.
+    """
+
+    def __init__(
+        self,
+        counts: dict[str, int],
+        postings: dict[str, Postings],
+        size: int = 0,
+        checksums: dict[str, int] | None = None,
+    ) -> None:
+        super().__init__(counts, size, checksums or {})
+        self.postings = postings
+        self.words = sorted(postings)
+
+    @classmethod
+    def from_entries(
+        cls,
+        files: Mapping[str, Sequence[DictionaryEntry]],
+        checksums: Mapping[str, int] | None = None,
+    ) -> WordIndex:
+        """Create an index of the entries of dictionary files.
+
+        :param files: The entries of each dictionary file by file name.
+        :param checksums: The checksum of each dictionary file by file name.
+        :returns: A new index.
+        """
+
+        postings: dict[str, Postings] = {}
+        for name, entries in files.items():
+            for i, entry in enumerate(entries):
+                for word in set(split_words(entry.translation)):
+                    postings.setdefault(word, {}).setdefault(name, []).append(i)
+        counts = {name: len(entries) for name, entries in files.items()}
+        return cls(counts, postings, checksums=dict(checksums or {}))
+
+    def write(self, path: os.PathLike | str) -> None:
+        """Write the index to a file.
+
+        :param path: The path of the file to write.
+        """
+
+        data = {
+            "version": INDEX_VERSION,
+            "counts": self.counts,
+            "checksums": self.checksums,
+            "postings": self.postings,
+        }
+        with open(path, "w") as f:
+            json.dump(data, f, separators=(",", ":"))
+
+    def find_candidates(self, word: str) -> dict[str, list[int]] | None:
+        """Find the entries whose translations may contain a word where
+        ``ReverseSearcher`` would match it: at the start of a word of the
+        translation.
+
+        :param word: The searched word, which may contain whitespace and
+            hyphens.
+        :returns: The sorted indices of the candidates by dictionary file name,
+            or ``None`` if the index cannot narrow a search for the word.
+        """
+
+        folded = fold_word(word)
+        first = _WORD_SEPARATOR.split(folded, maxsplit=1)[0]
+        if not first or not folded.isascii():
+            return None
+
+        if len(first) < len(folded):
+            # the first word is followed by a separator, so it is a whole word
+            words = [first] if first in self.postings else []
+        else:
+            start = bisect_left(self.words, first)
+            end = bisect_left(self.words, first + "\U0010ffff", start)
+            words = self.words[start:end]
+
+        candidates = _union(self.postings[w] for w in words)
+        return {name: sorted(indices) for name, indices in candidates.items()}
+
+
+def _read_index_data(path: Traversable) -> dict:
+    with path.open("rb") as f:
+        contents = f.read()
+    try:
+        data = json.loads(contents)
+    except ValueError as e:
+        raise InvalidDictionaryFile("Not an index file") from e
+    if not isinstance(data, dict) or data.get("version") != INDEX_VERSION:
+        raise InvalidDictionaryFile("Unsupported index version")
+    return data
+
+
+def read_ngram_index(path: Traversable) -> NgramIndex:
+    """Read an n-gram index file.
+
+    :param path: The path to an n-gram index file.
+    :returns: The loaded index.
+    :raises InvalidDictionaryFile: If the file is not a valid index file.
+    """
+
+    data = _read_index_data(path)
+    return NgramIndex(
+        data["counts"],
+        data["postings"],
+        data["n"],
+        estimate_size(data),
+        data["checksums"],
+    )
+
+
+def read_word_index(path: Traversable) -> WordIndex:
+    """Read a word index file.
+
+    :param path: The path to a word index file.
+    :returns: The loaded index.
+    :raises InvalidDictionaryFile: If the file is not a valid index file.
+    """
+
+    data = _read_index_data(path)
+    return WordIndex(
+        data["counts"], data["postings"], estimate_size(data), data["checksums"]
+    )
+
+
+def write_indexes(output_dir: os.PathLike | str) -> None:
+    """Write the index files of a built dictionary.
+
+    :param output_dir: The directory containing the dictionary files.
+    """
+
+    directory = pathlib.Path(output_dir)
+    files = {}
+    checksums = {}
+    for name in sorted(grammar.HARD_CHARACTERS):
+        path = directory / name
+        if path.is_file():
+            shard = read_shard(path)
+            files[name] = list(shard)
+            checksums[name] = shard.checksum
+    NgramIndex.from_entries(files, checksums=checksums).write(directory / NGRAM_INDEX)
+    WordIndex.from_entries(files, checksums).write(directory / WORD_INDEX)
+
+
+def remove_indexes(output_dir: os.PathLike | str) -> None:
+    """Remove the index files of a built dictionary if they exist.
+
+    :param output_dir: The directory containing the dictionary files.
+    """
+
+    for name in INDEX_FILES:
+        pathlib.Path(output_dir, name).unlink(missing_ok=True)
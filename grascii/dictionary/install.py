@@ -11,6 +11,8 @@ from grascii.dictionary.common import (
     get_dictionary_installed_name,
     get_dictionary_path_name,
 )
+from grascii.dictionary.index import INDEX_FILES
+from grascii.dictionary.strokes import STROKES_SUFFIX
 
 description = "Install a Grascii Dictionary"
 
@@ -63,6 +65,16 @@ def install_dictionary(
     files = dictionary.glob("[A-Z]")
     for f in files:
         copy(f, destination)
+    for stale in destination.glob("[A-Z]" + STROKES_SUFFIX):
+        stale.unlink()
+    for f in dictionary.glob("[A-Z]" + STROKES_SUFFIX):
+        copy(f, destination)
+    for index_name in INDEX_FILES:
+        index_file = dictionary / index_name
+        if index_file.exists():
+            copy(index_file, destination)
+        else:
+            (destination / index_name).unlink(missing_ok=True)
     return get_dictionary_installed_name(name)
 
 
@@ -0,0 +1,477 @@
+"""
+Contains in-memory representations of the files of a Grascii dictionary.
+
+Each file of a built dictionary holds the entries whose Grascii strings begin
+with a particular letter. These files are referred to as shards.
+"""
+
+from __future__ import annotations
+
+import re
+import zlib
+from bisect import bisect_left, bisect_right
+from functools import cached_property, lru_cache
+from itertools import pairwise
+from operator import itemgetter
+from typing import TYPE_CHECKING, TypeVar
+
+from grascii.dictionary.common import DictionaryEntry, estimate_size
+from grascii.dictionary.trie import GrasciiTrie
+
+if TYPE_CHECKING:
+    import mmap
+    from collections.abc import Callable, Iterable, Iterator, Sequence
+    from re import Match, Pattern
+
+IT = TypeVar("IT")
+KT = TypeVar("KT", str, bytes)
+
+PREFIX_LIMIT = 256
+"""The maximum number of prefixes tracked while narrowing a search of a
+sorted shard."""
+
+ShardMatch = tuple[list[tuple[IT, "Match[str]"]], DictionaryEntry, int]
+"""A list of interpretations with their corresponding matches, the matched
+entry and the index of the entry."""
+
+Range = tuple[int, int]
+"""A half-open range of entry indices."""
+
+LineMatches = dict[int, list[tuple[IT, "Match[str]"]]]
+"""The matches of each matching line by the position of the start of the
+line."""
+
+# constructs that may match differently at the end of a line when the line is
+# followed by a newline and more lines: string anchors and lookarounds
+_LINE_UNSAFE = re.compile(r"\\[AZz]|\(\?<?[=!]")
+# constructs created by RegexBuilder that match the same either way
+_LINE_SAFE = (r"(?:\Z|\s)", "(?!H)", "(?!&)")
+
+
+def find_prefix_ranges(
+    keys: Sequence[KT],
+    prefix_steps: Iterable[Sequence[Sequence[KT]]],
+    sentinel: KT,
+    limit: int = PREFIX_LIMIT,
+) -> list[Range]:
+    """Find the ranges of sorted keys that begin with a prefix made from the
+    given steps.
+
+    For each list of steps, the prefixes are extended one step at a time and
+    each prefix is narrowed to the keys that begin with it by binary search.
+    Prefixes that no key begins with are dropped. If the number of prefixes
+    would exceed the limit, the ranges of the previous step are used.
+
+    :param keys: A sorted sequence of keys.
+    :param prefix_steps: An iterable of lists of steps, each of which is a
+        sequence of alternative strings.
+    :param sentinel: A string that compares greater than any character of a
+        key.
+    :param limit: The maximum number of prefixes to track.
+    :returns: A sorted list of non-overlapping ranges.
+    """
+
+    ranges = []
+    for steps in prefix_steps:
+        frontier = {sentinel[:0]: (0, len(keys))}
+        for step in steps:
+            next_frontier = {}
+            for prefix, (lo, hi) in frontier.items():
+                for option in step:
+                    candidate = prefix + option
+                    if candidate in next_frontier:
+                        continue
+                    start = bisect_left(keys, candidate, lo, hi)
+                    if start == hi or not keys[start].startswith(candidate):
+                        continue
+                    end = bisect_left(keys, candidate + sentinel, start, hi)
+                    next_frontier[candidate] = (start, end)
+            if len(next_frontier) > limit:
+                break
+            frontier = next_frontier
+            if not frontier:
+                break
+        ranges += frontier.values()
+    return merge_ranges(ranges)
+
+
+def merge_ranges(ranges: Iterable[Range]) -> list[Range]:
+    """Merge ranges of entry indices that overlap or touch.
+
+    :param ranges: An iterable of ranges in any order.
+    :returns: A sorted list of non-overlapping ranges.
+    """
+
+    merged: list[Range] = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(end, merged[-1][1]))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def in_ranges(ranges: Sequence[Range], index: int) -> bool:
+    """Check whether an entry index falls within any of some ranges.
+
+    :param ranges: A sorted list of non-overlapping ranges.
+    :param index: An entry index.
+    :returns: Whether one of the ranges contains the index.
+    """
+
+    i = bisect_right(ranges, index, key=itemgetter(0)) - 1
+    return i >= 0 and ranges[i][0] <= index < ranges[i][1]
+
+
+def to_ranges(indices: Iterable[int]) -> list[Range]:
+    """Group sorted entry indices into ranges of consecutive indices.
+
+    :param indices: A sorted iterable of entry indices.
+    :returns: A sorted list of non-overlapping ranges.
+    """
+
+    ranges: list[Range] = []
+    for i in indices:
+        if ranges and ranges[-1][1] == i:
+            ranges[-1] = (ranges[-1][0], i + 1)
+        else:
+            ranges.append((i, i + 1))
+    return ranges
+
+
+def is_line_safe(pattern: Pattern) -> bool:
+    """Check whether a pattern can be run over many lines at once.
+
+    A line-safe pattern compiled with ``re.MULTILINE`` matches a buffer of
+    newline-terminated lines starting within a line whenever the original
+    pattern matches that line by itself. The check is conservative: patterns
+    with string anchors or lookarounds other than those created by
+    ``RegexBuilder`` are considered unsafe.
+
+    :param pattern: A compiled pattern.
+    :returns: True if the pattern is line-safe.
+    """
+
+    source = pattern.pattern
+    if isinstance(source, bytes):
+        source = source.decode("latin-1")
+    for part in _LINE_SAFE:
+        source = source.replace(part, "")
+    return _LINE_UNSAFE.search(source) is None
+
+
+@lru_cache(maxsize=256)
+def to_multiline_pattern(pattern: Pattern[str]) -> Pattern[str] | None:
+    """Compile a multiline equivalent of a string pattern, which is used to
+    find the lines matching the pattern in a buffer of many lines.
+
+    :param pattern: A compiled string pattern.
+    :returns: A compiled string pattern, or ``None`` if the pattern is not
+        line-safe.
+    """
+
+    if not is_line_safe(pattern):
+        return None
+    return re.compile(pattern.pattern, pattern.flags | re.MULTILINE)
+
+
+def scan_lines(
+    buffer: str | bytes | mmap.mmap,
+    patterns: Sequence[tuple[IT, Pattern[str]]],
+    start: int,
+    end: int,
+    locate: Callable[[int], tuple[int, int]],
+    prefilter: Pattern[str] | None = None,
+    convert: Callable[[Pattern[str]], Pattern | None] = to_multiline_pattern,
+) -> LineMatches[IT] | None:
+    """Scan a buffer of newline-terminated lines for lines matching any of the
+    given patterns.
+
+    Each pattern is converted to run over the whole buffer, and is run once. A
+    hit is confirmed with the original pattern on its line before it is
+    reported, so only the lines of hits are decoded. If a prefilter is given,
+    only the prefilter is run over the buffer and each line it matches is
+    checked against every pattern.
+
+    :param buffer: A buffer of lines, which are UTF-8 encoded if the buffer is
+        not a string.
+    :param patterns: A sequence of interpretations and corresponding compiled
+        regular expression patterns.
+    :param start: The position in the buffer to start scanning at.
+    :param end: The position in the buffer to stop scanning at.
+    :param locate: A function that returns the start and end of the line
+        containing a position in the buffer.
+    :param prefilter: A pattern that matches every line matched by any of the
+        patterns.
+    :param convert: A function that converts a pattern to one that runs over
+        the buffer, or returns ``None`` if it cannot be converted.
+    :returns: A dictionary of line starts to the matches of that line, or
+        ``None`` if a pattern cannot be run over the buffer.
+    """
+
+    if prefilter is not None and len(patterns) > 1:
+        converted_prefilter = convert(prefilter)
+        if converted_prefilter is not None:
+            return _scan_prefiltered(
+                buffer, patterns, start, end, locate, converted_prefilter
+            )
+
+    converted = [convert(pattern) for _, pattern in patterns]
+    if any(pattern is None for pattern in converted):
+        return None
+
+    hits: LineMatches[IT] = {}
+    for (interp, pattern), buffer_pattern in zip(patterns, converted, strict=True):
+        assert buffer_pattern is not None
+        position = start
+        while position < end:
+            buffer_match = buffer_pattern.search(buffer, position, end)
+            if buffer_match is None or buffer_match.start() >= end:
+                break
+            line_start, line_end = locate(buffer_match.start())
+            match = pattern.search(_decode(buffer[line_start:line_end]))
+            if match:
+                hits.setdefault(line_start, []).append((interp, match))
+            position = line_end + 1
+    return hits
+
+
+def _scan_prefiltered(
+    buffer: str | bytes | mmap.mmap,
+    patterns: Sequence[tuple[IT, Pattern[str]]],
+    start: int,
+    end: int,
+    locate: Callable[[int], tuple[int, int]],
+    prefilter: Pattern,
+) -> LineMatches[IT]:
+    hits: LineMatches[IT] = {}
+    position = start
+    while position < end:
+        buffer_match = prefilter.search(buffer, position, end)
+        if buffer_match is None or buffer_match.start() >= end:
+            break
+        line_start, line_end = locate(buffer_match.start())
+        line = _decode(buffer[line_start:line_end])
+        matches = []
+        for interp, pattern in patterns:
+            match = pattern.search(line)
+            if match:
+                matches.append((interp, match))
+        if matches:
+            hits[line_start] = matches
+        position = line_end + 1
+    return hits
+
+
+def _decode(line: str | bytes) -> str:
+    return line if isinstance(line, str) else line.decode()
+
+
+def match_lines(
+    lines: Sequence[str],
+    patterns: Sequence[tuple[IT, Pattern[str]]],
+    start: int,
+    end: int,
+    prefilter: Pattern[str] | None = None,
+) -> Iterator[tuple[list[tuple[IT, Match[str]]], int]]:
+    """Match the given lines against patterns one line at a time.
+
+    :param lines: A sequence of lines.
+    :param patterns: A sequence of interpretations and corresponding compiled
+        regular expression patterns.
+    :param start: The index of the first line to match.
+    :param end: The index after the last line to match.
+    :param prefilter: A pattern that matches every line matched by any of the
+        patterns.
+    :returns: An iterator over the matches and index of each matching line.
+    """
+
+    for i in range(start, end):
+        line = lines[i]
+        if prefilter is not None and not prefilter.search(line):
+            continue
+        matches = []
+        for interp, pattern in patterns:
+            match = pattern.search(line)
+            if match:
+                matches.append((interp, match))
+        if matches:
+            yield matches, i
+
+
+class LineBuffer:
+    """Newline-terminated lines held in a single string, so that patterns can
+    be run over many lines at once instead of once for each line.
+
+    :param text: The lines, each of which ends with a newline.
+    """
+
+    def __init__(self, text: str) -> None:
+        self.text = text
+        self.starts = [0]
+        self.starts.extend(m.end() for m in re.finditer("\n", text))
+
+    @classmethod
+    def from_lines(cls, lines: Iterable[str]) -> LineBuffer:
+        """Create a buffer from lines without newlines.
+
+        :param lines: An iterable of lines.
+        :returns: A new buffer.
+        """
+
+        return cls("".join(line + "\n" for line in lines))
+
+    def __len__(self) -> int:
+        return len(self.starts) - 1
+
+    def __getitem__(self, index: int) -> str:
+        return self.text[self.starts[index] : self.starts[index + 1] - 1]
+
+    def locate(self, position: int) -> tuple[int, int]:
+        """Find the line containing a position in the buffer.
+
+        :param position: A position in the buffer.
+        :returns: The start of the line and the position of its newline.
+        """
+
+        index = bisect_right(self.starts, position) - 1
+        return self.starts[index], self.starts[index + 1] - 1
+
+    def search(
+        self,
+        patterns: Sequence[tuple[IT, Pattern[str]]],
+        start: int,
+        end: int,
+        prefilter: Pattern[str] | None = None,
+    ) -> Iterator[tuple[list[tuple[IT, Match[str]]], int]]:
+        """Find the lines matching any of the given patterns. The lines are
+        scanned all at once if the patterns are line-safe, and one at a time
+        otherwise.
+
+        :param patterns: A sequence of interpretations and corresponding
+            compiled regular expression patterns.
+        :param start: The index of the first line to search.
+        :param end: The index after the last line to search.
+        :param prefilter: A pattern that matches every line matched by any of
+            the patterns.
+        :returns: An iterator over the matches and index of each matching
+            line, in order.
+        """
+
+        hits = scan_lines(
+            self.text,
+            patterns,
+            self.starts[start],
+            self.starts[end],
+            self.locate,
+            prefilter,
+        )
+        if hits is None:
+            yield from match_lines(self, patterns, start, end, prefilter)
+            return
+        for line_start in sorted(hits):
+            yield hits[line_start], bisect_left(self.starts, line_start)
+
+
+class TextShard:
+    """The entries of a plain text dictionary file held in memory.
+
+    Each line is split into a ``DictionaryEntry`` once when the shard is
+    created, and the lines are joined into a ``LineBuffer`` so that searches
+    can run patterns over all of the lines at once. Whether the entries are
+    sorted by their Grascii strings is detected when the shard is created.
+    Empty lines and lines without a translation are skipped.
+
+    :param lines: The lines of a dictionary file.
+    """
+
+    def __init__(self, lines: Iterable[str]) -> None:
+        kept: list[str] = []
+        self.entries: list[DictionaryEntry] = []
+        self.keys: list[str] = []
+        for line in lines:
+            line = line.rstrip("\r\n")
+            fields = line.strip().split(maxsplit=1)
+            # a hand edited file may have lines the builder would not write
+            if len(fields) != 2:
+                continue
+            grascii, translation = fields
+            kept.append(line)
+            self.entries.append(DictionaryEntry(grascii, translation))
+            self.keys.append(grascii)
+        self.lines = LineBuffer.from_lines(kept)
+        self.size = estimate_size(
+            (self.entries, self.keys, self.lines.text, self.lines.starts)
+        )
+        """The estimated size in bytes of the shard in memory."""
+        self.sorted = all(a <= b for a, b in pairwise(self.keys))
+
+    @cached_property
+    def checksum(self) -> int:
+        """A CRC-32 checksum of the lines of the entries, computed on first
+        use."""
+        return zlib.crc32(self.lines.text.encode())
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __getitem__(self, index: int) -> DictionaryEntry:
+        return self.entries[index]
+
+    def __iter__(self) -> Iterator[DictionaryEntry]:
+        return iter(self.entries)
+
+    def line(self, index: int) -> str:
+        """Get the line of an entry.
+
+        :param index: The index of the entry.
+        :returns: The line of the dictionary file containing the entry.
+        """
+
+        return self.lines[index]
+
+    @cached_property
+    def trie(self) -> GrasciiTrie:
+        """A trie of the Grascii strings of the entries, built on first use."""
+        return GrasciiTrie(self.keys)
+
+    def find_ranges(
+        self, prefix_steps: Iterable[Sequence[Sequence[str]]]
+    ) -> list[Range] | None:
+        """Find the ranges of entries whose Grascii strings begin with a prefix
+        made from the given steps.
+
+        :param prefix_steps: An iterable of lists of steps as created by
+            ``RegexBuilder.get_prefix_steps``.
+        :returns: A sorted list of ranges, or ``None`` if the shard is not
+            sorted.
+        """
+
+        if not self.sorted:
+            return None
+        return find_prefix_ranges(self.keys, prefix_steps, "\U0010ffff")
+
+    def search(
+        self,
+        patterns: Iterable[tuple[IT, Pattern[str]]],
+        ranges: Iterable[Range] | None = None,
+        prefilter: Pattern[str] | None = None,
+    ) -> Iterator[ShardMatch[IT]]:
+        """Search the shard for lines matching any of the given patterns.
+
+        :param patterns: An iterable of interpretations and corresponding
+            compiled regular expression patterns.
+        :param ranges: The ranges of entries to search. All entries are
+            searched by default.
+        :param prefilter: A pattern that matches every line matched by any of
+            the patterns. Only the lines it matches are checked against each
+            pattern.
+        :returns: An iterator over the matches of each matching entry.
+        """
+
+        patterns = list(patterns)
+        if ranges is None:
+            ranges = [(0, len(self.entries))]
+        for start, end in ranges:
+            for matches, i in self.lines.search(patterns, start, end, prefilter):
+                yield matches, self.entries[i], i
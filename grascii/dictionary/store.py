@@ -0,0 +1,212 @@
+"""
+Contains a process-wide store that keeps the files of Grascii dictionaries
+loaded in memory across searches.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, NamedTuple, TypeVar
+
+from grascii.dictionary.binary import BinaryShard, is_binary_shard, read_binary_shard
+from grascii.dictionary.shards import TextShard
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from importlib.resources.abc import Traversable
+
+T = TypeVar("T")
+
+DEFAULT_MAX_SIZE = 64 * 1024 * 1024
+"""The default memory budget of a ``DictionaryStore`` in bytes."""
+
+Shard = TextShard | BinaryShard
+"""A loaded dictionary file."""
+
+
+def read_shard(path: Traversable) -> Shard:
+    """Read a dictionary file into memory. Binary dictionary files are mapped
+    into memory instead of being read.
+
+    :param path: The path to the dictionary file.
+    :returns: The loaded shard.
+    """
+
+    if is_binary_shard(path):
+        return read_binary_shard(path)
+    with path.open() as f:
+        return TextShard(f)
+
+
+class _Signature(NamedTuple):
+    mtime: int
+    size: int
+
+
+class _StoredFile(NamedTuple):
+    value: Any
+    signature: _Signature | None
+    size: int
+
+
+def _get_signature(path: Traversable) -> _Signature | None:
+    """Get the modification time and size of a file.
+
+    :param path: The path to a file.
+    :returns: A signature of the file, or ``None`` if the path does not support
+        ``stat``.
+    """
+
+    stat = getattr(path, "stat", None)
+    if stat is None:
+        return None
+    result = stat()
+    return _Signature(result.st_mtime_ns, result.st_size)
+
+
+class DictionaryStore:
+    """A thread-safe, size-bounded cache of loaded dictionary files and
+    indexes.
+
+    Once the total size of the loaded files exceeds ``max_size``, files are
+    evicted in least-recently-used order. A loaded file is reloaded when its
+    modification time or size changes.
+
+    :param max_size: The memory budget of the store in bytes. The size of a
+        loaded file is its estimated size in memory, which is usually several
+        times its size on disk for text dictionary files.
+    :type max_size: int
+    """
+
+    def __init__(self, max_size: int = DEFAULT_MAX_SIZE) -> None:
+        self._max_size = max_size
+        self._files: OrderedDict[Traversable, _StoredFile] = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    @property
+    def max_size(self) -> int:
+        """The memory budget of the store in bytes."""
+        return self._max_size
+
+    @max_size.setter
+    def max_size(self, value: int) -> None:
+        with self._lock:
+            self._max_size = value
+            self._evict()
+
+    @property
+    def size(self) -> int:
+        """The estimated size in bytes of all loaded files in memory."""
+        return self._size
+
+    def __len__(self) -> int:
+        return len(self._files)
+
+    def __contains__(self, path: Traversable) -> bool:
+        return path in self._files
+
+    def get(self, path: Traversable) -> Shard:
+        """Get the loaded contents of a dictionary file, loading it if it is
+        not in the store or has changed since it was loaded.
+
+        :param path: The path to a dictionary file.
+        :returns: The loaded shard.
+        :raises FileNotFoundError: If the file does not exist.
+        """
+
+        return self.load(path, read_shard)
+
+    def load(self, path: Traversable, loader: Callable[[Traversable], T]) -> T:
+        """Get the loaded contents of a file, loading it with the given loader
+        if it is not in the store or has changed since it was loaded.
+
+        :param path: The path to a file.
+        :param loader: A function that loads the file. The loaded value must
+            have a ``size`` attribute giving its estimated size in memory in
+            bytes.
+        :returns: The loaded value.
+        :raises FileNotFoundError: If the file does not exist.
+        """
+
+        try:
+            signature = _get_signature(path)
+        except FileNotFoundError:
+            self.discard(path)
+            raise
+
+        with self._lock:
+            stored = self._files.get(path)
+            if stored is not None and stored.signature == signature:
+                self._files.move_to_end(path)
+                return stored.value
+
+        value = loader(path)
+        size = value.size
+
+        with self._lock:
+            self._remove(path)
+            if size <= self._max_size:
+                self._files[path] = _StoredFile(value, signature, size)
+                self._size += size
+                self._evict()
+        return value
+
+    def discard(self, path: Traversable) -> None:
+        """Remove a dictionary file from the store if it is present.
+
+        :param path: The path to a dictionary file.
+        """
+
+        with self._lock:
+            self._remove(path)
+
+    def close_file(self, path: str | os.PathLike[str]) -> None:
+        """Remove a dictionary file from the store under any path that refers
+        to it and close it, so that it can be replaced. Binary dictionary files
+        are unmapped from memory, which Windows requires before a file is
+        replaced.
+
+        :param path: The path to a dictionary file.
+        """
+
+        target = os.path.realpath(path)
+        with self._lock:
+            for key in list(self._files):
+                if isinstance(key, os.PathLike) and os.path.realpath(key) == target:
+                    value = self._files[key].value
+                    self._remove(key)
+                    close = getattr(value, "close", None)
+                    if close is not None:
+                        close()
+
+    def clear(self) -> None:
+        """Remove all files from the store."""
+
+        with self._lock:
+            self._files.clear()
+            self._size = 0
+
+    def _remove(self, path: Traversable) -> None:
+        stored = self._files.pop(path, None)
+        if stored is not None:
+            self._size -= stored.size
+
+    def _evict(self) -> None:
+        while self._size > self._max_size and self._files:
+            _, stored = self._files.popitem(last=False)
+            self._size -= stored.size
+
+
+_store = DictionaryStore()
+
+
+def get_dictionary_store() -> DictionaryStore:
+    """Get the process-wide ``DictionaryStore`` used by dictionaries.
+
+    :returns: The shared ``DictionaryStore``.
+    """
+
+    return _store
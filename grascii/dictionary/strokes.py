@@ -0,0 +1,120 @@
+"""
+Contains the reader and writer for stroke files, which hold the canonical
+interpretations of the entries of a dictionary file.
+
+The stroke file of a dictionary file has the same name followed by
+``STROKES_SUFFIX``. The first line of a stroke file holds ``#`` followed by
+the checksum of the dictionary file it was written from and the checksum of
+``grammar.TOKENS``, so that it is ignored once the dictionary file changes or
+the stroke ids its interpretations are encoded with are renumbered. Each
+following line holds the canonical interpretation of the next entry encoded
+by ``encode_interpretation``, or is empty if the Grascii string of the entry
+is not valid.
+
+Stroke files only spare search results from interpreting the Grascii strings
+of their entries again. The metrics still compare the strokes matched by the
+patterns of a search.
+"""
+
+from __future__ import annotations
+
+import pathlib
+import zlib
+from typing import TYPE_CHECKING
+
+from grascii import grammar
+from grascii.dictionary.common import estimate_size
+from grascii.dictionary.store import read_shard
+from grascii.interpreter import (
+    GrasciiInterpreter,
+    decode_interpretation,
+    encode_interpretation,
+)
+
+if TYPE_CHECKING:
+    import os
+    from collections.abc import Iterable
+    from importlib.resources.abc import Traversable
+
+    from grascii.interpreter import Interpretation
+
+STROKES_SUFFIX = ".strokes"
+"""The suffix of the name of a stroke file."""
+
+# encoded interpretations never contain characters before "0"
+_HEADER = "#"
+
+TOKENS_CHECKSUM = zlib.crc32(" ".join(grammar.TOKENS).encode())
+"""The checksum of the token table stroke files are currently written with."""
+
+
+class StrokeFile:
+    """The encoded canonical interpretations of the entries of a dictionary
+    file.
+
+    :param lines: The lines of a stroke file.
+    """
+
+    def __init__(self, lines: Iterable[str]) -> None:
+        self.lines = [line.rstrip("\r\n") for line in lines]
+        self.size = estimate_size(self.lines)
+        """The estimated size in bytes of the stroke file in memory."""
+        # the checksum of the dictionary file the stroke file was written from
+        self.checksum: int | None = None
+        # the checksum of the token table the interpretations were encoded with
+        self.tokens_checksum: int | None = None
+        if self.lines and self.lines[0].startswith(_HEADER):
+            checksums = self.lines.pop(0)[len(_HEADER) :].split()
+            self.checksum = int(checksums[0])
+            if len(checksums) > 1:
+                self.tokens_checksum = int(checksums[1])
+
+    def __len__(self) -> int:
+        return len(self.lines)
+
+    def __getitem__(self, index: int) -> Interpretation | None:
+        encoded = self.lines[index]
+        return decode_interpretation(encoded) if encoded else None
+
+
+def read_stroke_file(path: Traversable) -> StrokeFile:
+    """Read a stroke file into memory.
+
+    :param path: The path to a stroke file.
+    :returns: The loaded stroke file.
+    """
+
+    with path.open() as f:
+        return StrokeFile(f)
+
+
+def write_stroke_files(output_dir: os.PathLike | str) -> None:
+    """Write the stroke files of a built dictionary.
+
+    :param output_dir: The directory containing the dictionary files.
+    """
+
+    interpreter = GrasciiInterpreter()
+    directory = pathlib.Path(output_dir)
+    for name in sorted(grammar.HARD_CHARACTERS):
+        path = directory / name
+        if not path.is_file():
+            continue
+        shard = read_shard(path)
+        with (directory / (name + STROKES_SUFFIX)).open("w") as out:
+            out.write(f"{_HEADER}{shard.checksum} {TOKENS_CHECKSUM}\n")
+            for entry in shard:
+                interpretation = interpreter.interpret(entry.grascii)
+                if interpretation is not None:
+                    out.write(encode_interpretation(interpretation))
+                out.write("\n")
+
+
+def remove_stroke_files(output_dir: os.PathLike | str) -> None:
+    """Remove the stroke files of a built dictionary if they exist.
+
+    :param output_dir: The directory containing the dictionary files.
+    """
+
+    for path in pathlib.Path(output_dir).glob("[A-Z]" + STROKES_SUFFIX):
+        path.unlink()
@@ -0,0 +1,181 @@
+"""
+Contains a trie of the Grascii strings of a dictionary file, used to find the
+entries that begin with the strokes of a search without checking every entry.
+"""
+
+from __future__ import annotations
+
+from functools import cached_property
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Sequence
+
+
+class _Node:
+    __slots__ = ("children", "start", "stop", "end")
+
+    def __init__(self, start: int) -> None:
+        self.children: dict[str, _Node] = {}
+        self.start = start
+        # the strings that end at the node come first in its run
+        self.stop = start
+        self.end = start
+
+
+class GrasciiTrie:
+    """A trie of Grascii strings.
+
+    The strings are inserted in sorted order, so the strings below any node
+    of the trie are a contiguous run of the sorted strings. Each node stores
+    the bounds of that run, and walking the trie yields whole runs of
+    entries.
+
+    :param keys: The Grascii strings of the entries of a dictionary file.
+    """
+
+    def __init__(self, keys: Iterable[str]) -> None:
+        keys = list(keys)
+        self.order = sorted(range(len(keys)), key=keys.__getitem__)
+        self.root = _Node(0)
+        for position, index in enumerate(self.order):
+            node = self.root
+            node.end = position + 1
+            for c in keys[index]:
+                child = node.children.get(c)
+                if child is None:
+                    child = node.children[c] = _Node(position)
+                child.end = position + 1
+                node = child
+            node.stop = position + 1
+
+    def _descend(self, node: _Node, text: str) -> _Node | None:
+        for c in text:
+            child = node.children.get(c)
+            if child is None:
+                return None
+            node = child
+        return node
+
+    def find(self, prefix_steps: Iterable[Sequence[Sequence[str]]]) -> list[int]:
+        """Find the entries whose Grascii strings begin with a prefix made
+        from the given steps.
+
+        Each step extends every node reached so far by each of the step's
+        alternatives, and alternatives that leave the trie are dropped along
+        with everything that would follow them.
+
+        :param prefix_steps: An iterable of lists of steps as created by
+            ``RegexBuilder.get_prefix_steps``.
+        :returns: The sorted indices of the entries.
+        """
+
+        found: set[int] = set()
+        for steps in prefix_steps:
+            frontier = {id(self.root): self.root}
+            for step in steps:
+                next_frontier = {}
+                for node in frontier.values():
+                    for option in step:
+                        child = self._descend(node, option)
+                        if child is not None:
+                            next_frontier[id(child)] = child
+                frontier = next_frontier
+                if not frontier:
+                    break
+            for node in frontier.values():
+                found.update(self.order[node.start : node.end])
+        return sorted(found)
+
+    @cached_property
+    def _entered(self) -> dict[str, list[_Node]]:
+        """The nodes of the trie entered by each character."""
+
+        entered: dict[str, list[_Node]] = {}
+        stack = [self.root]
+        while stack:
+            node = stack.pop()
+            for c, child in node.children.items():
+                entered.setdefault(c, []).append(child)
+                stack.append(child)
+        return entered
+
+    def _starts(self, option: str) -> Iterable[_Node]:
+        """Find the nodes reached by an option starting anywhere in the trie."""
+
+        if not option:
+            yield self.root
+            for nodes in self._entered.values():
+                yield from nodes
+            return
+        for node in self._entered.get(option[0], ()):
+            child = self._descend(node, option[1:])
+            if child is not None:
+                yield child
+
+    def find_within(
+        self,
+        weighted_steps: Iterable[Sequence[Sequence[tuple[str, int]]]],
+        budget: int,
+        anywhere: bool = False,
+        whole: bool = False,
+    ) -> list[int]:
+        """Find the entries whose Grascii strings begin with a string made
+        from the given steps whose alternatives cost at most a budget in
+        total.
+
+        The steps are walked like in ``find``, keeping the greatest budget
+        left at each node reached so far. Alternatives that cost more than
+        the budget left are dropped along with everything that would follow
+        them. Only the strings that end at the last nodes reached are found
+        with ``whole``, so the steps must make up the rest of each string.
+
+        :param weighted_steps: An iterable of lists of steps as created by
+            ``RegexBuilder.get_weighted_steps``.
+        :param budget: The greatest total cost of the alternatives.
+        :param anywhere: Find the entries whose Grascii strings contain a
+            string made from the steps anywhere instead of at their start.
+        :param whole: Find the entries whose Grascii strings end with a string
+            made from the steps instead of only beginning or containing one.
+        :returns: The sorted indices of the entries.
+        """
+
+        found: set[int] = set()
+        for steps in weighted_steps:
+            frontier = {id(self.root): (self.root, budget)}
+            if anywhere and steps:
+                frontier = {}
+                for option, cost in steps[0]:
+                    if cost > budget:
+                        continue
+                    for node in self._starts(option):
+                        reached = frontier.get(id(node))
+                        if reached is None or reached[1] < budget - cost:
+                            frontier[id(node)] = (node, budget - cost)
+                steps = steps[1:]
+            for step in steps:
+                # most nodes have few children, so the alternatives are looked
+                # up by their first character instead of tried in turn
+                by_first: dict[str, list[tuple[str, int]]] = {}
+                for option, cost in step:
+                    by_first.setdefault(option[:1], []).append((option[1:], cost))
+                next_frontier: dict[int, tuple[_Node, int]] = {}
+                for node, left in frontier.values():
+                    reachable = [(node, rest) for rest in by_first.get("", ())]
+                    for c, child in node.children.items():
+                        reachable += [(child, rest) for rest in by_first.get(c, ())]
+                    for start, (rest, cost) in reachable:
+                        if cost > left:
+                            continue
+                        child = self._descend(start, rest)
+                        if child is None:
+                            continue
+                        reached = next_frontier.get(id(child))
+                        if reached is None or reached[1] < left - cost:
+                            next_frontier[id(child)] = (child, left - cost)
+                frontier = next_frontier
+                if not frontier:
+                    break
+            for node, _ in frontier.values():
+                found.update(self.order[node.start : node.stop if whole else node.end])
+        return sorted(found)
@@ -90,3 +90,17 @@ tuples are ordered in the same order they must appear in a strict Grascii
 string. The tuples contain mutually exclusive annotations. Ex: ``MEDIUM_SOUND``
 and ``LONG_SOUND``
 """
+
+TOKENS: tuple[str, ...] = (
+    *_STROKES.split(),
+    *",.|~_()",
+    ASPIRATE,
+    DISJOINER,
+    BOUNDARY,
+    INTERSECTION,
+)
+"""All tokens that can appear in an interpretation. The index of a token is
+its stroke id. Adding a stroke renumbers the tokens after it, which
+invalidates stroke files written with the previous ids."""
+TOKEN_IDS: dict[str, int] = {token: i for i, token in enumerate(TOKENS)}
+"""A dictionary of tokens to their stroke ids."""
@@ -1,3 +1,187 @@
-"""Contains grammars used by grascii."""
+"""Contains grammars used by grascii.
+
+Building a Lark parser compiles its grammar, which takes much longer than
+parsing. ``get_parser`` keeps one shared parser per grammar and options, and
+``load_parser`` saves each compiled grammar in the user cache directory so
+that later processes can skip compiling it. ``get_terminal_pattern`` caches
+the pattern of a terminal, so that it can be used without importing Lark.
+"""
 
 from __future__ import annotations
+
+import hashlib
+import os
+import pickle
+import sys
+from functools import cache, lru_cache
+from importlib.metadata import version
+from importlib.resources import files
+from typing import TYPE_CHECKING, Any
+
+from platformdirs import user_cache_path
+
+from grascii import APP_NAME
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from lark import Lark
+
+CACHE_DIRECTORY = user_cache_path(APP_NAME) / "grammars"
+"""The directory containing cached compiled grammars."""
+
+CACHE_VERSION = 1
+"""The version of the format of cached compiled grammars."""
+
+CACHE_SUFFIX = ".cache"
+"""The suffix of the name of a cached compiled grammar."""
+
+PATTERN_SUFFIX = ".pattern"
+"""The suffix of the name of a cached terminal pattern."""
+
+
+@lru_cache(maxsize=1)
+def _compiled_grammar_class() -> type:
+    # lark is only imported when a parser is created
+    from lark.load_grammar import Grammar
+
+    class CompiledGrammar(Grammar):
+        """A grammar that has already been compiled."""
+
+        def __init__(self, compiled: tuple[Any, Any, Any]) -> None:
+            super().__init__([], [], [])
+            self._compiled = compiled
+
+        def compile(self, start, terminals_to_keep) -> tuple[Any, Any, Any]:
+            return self._compiled
+
+    return CompiledGrammar
+
+
+@lru_cache(maxsize=1)
+def _cache_key() -> tuple[Any, ...]:
+    """Get the parts of the cache key shared by every grammar. The text of
+    every grammar is hashed, since grammars may import each other."""
+
+    digest = hashlib.sha256()
+    for path in sorted(files(__name__).iterdir(), key=lambda p: p.name):
+        if path.name.endswith(".lark"):
+            digest.update(path.name.encode())
+            digest.update(path.read_bytes())
+    return (
+        CACHE_VERSION,
+        version("lark"),
+        sys.version_info[:2],
+        digest.hexdigest(),
+    )
+
+
+def _cache_path(name: str, key: Any, suffix: str, cache_dir: Path) -> Path:
+    digest = hashlib.sha256(repr((_cache_key(), name, key)).encode()).hexdigest()
+    return cache_dir / f"{name}.{digest[:32]}{suffix}"
+
+
+def _write_cache(path: Path, stale_pattern: str, data: bytes) -> None:
+    """Write a cache file, replacing the caches of previous versions of the
+    grammars. Errors are ignored."""
+
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        for stale in path.parent.glob(stale_pattern):
+            stale.unlink(missing_ok=True)
+        temp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        temp_path.write_bytes(data)
+        os.replace(temp_path, path)
+    except OSError:
+        pass
+
+
+def load_parser(
+    grammar_name: str, options: dict[str, Any], cache_dir: Path | None = None
+) -> Lark:
+    """Create a Lark parser for a grammar in this package. The compiled
+    grammar is read from the cache if it is there, and written to the cache
+    otherwise. A cache that cannot be read or written is ignored.
+
+    :param grammar_name: The file name of the grammar.
+    :param options: Options passed to ``Lark``.
+    :param cache_dir: The directory of the cache. Defaults to
+        ``CACHE_DIRECTORY``.
+    :returns: A new parser.
+    """
+
+    from lark import Lark
+
+    if cache_dir is None:
+        cache_dir = CACHE_DIRECTORY
+    key = sorted(options.items())
+    path = _cache_path(grammar_name, key, CACHE_SUFFIX, cache_dir)
+    try:
+        with path.open("rb") as f:
+            compiled = pickle.load(f)
+        return Lark(_compiled_grammar_class()(compiled), **options)
+    except Exception:
+        # missing, stale or corrupted
+        pass
+
+    parser = Lark.open_from_package(__name__, grammar_name, **options)
+    try:
+        data = pickle.dumps((parser.terminals, parser.rules, parser.ignore_tokens))
+    except pickle.PicklingError:
+        return parser
+    _write_cache(path, f"{grammar_name}.*{CACHE_SUFFIX}", data)
+    return parser
+
+
+def load_terminal_pattern(
+    grammar_name: str, terminal: str, cache_dir: Path | None = None
+) -> str:
+    """Get the regular expression of a terminal of a grammar in this package.
+    The pattern is read from the cache if it is there, in which case Lark is
+    not imported.
+
+    :param grammar_name: The file name of the grammar.
+    :param terminal: The name of the terminal.
+    :param cache_dir: The directory of the cache. Defaults to
+        ``CACHE_DIRECTORY``.
+    :returns: A string that can be compiled into a regular expression.
+    """
+
+    if cache_dir is None:
+        cache_dir = CACHE_DIRECTORY
+    name = f"{grammar_name}.{terminal}"
+    path = _cache_path(name, None, PATTERN_SUFFIX, cache_dir)
+    try:
+        return path.read_text(encoding="utf-8")
+    except (OSError, UnicodeDecodeError):
+        pass
+
+    pattern = get_parser(grammar_name).get_terminal(terminal).pattern.value
+    _write_cache(path, f"{name}.*{PATTERN_SUFFIX}", pattern.encode("utf-8"))
+    return pattern
+
+
+@cache
+def get_parser(grammar_name: str, **options: Any) -> Lark:
+    """Get the parser of a grammar in this package that is shared by the whole
+    process, creating it with ``load_parser`` on first use.
+
+    :param grammar_name: The file name of the grammar.
+    :param options: Options passed to ``Lark``.
+    :returns: A shared parser.
+    """
+
+    return load_parser(grammar_name, options)
+
+
+@cache
+def get_terminal_pattern(grammar_name: str, terminal: str) -> str:
+    """Get the regular expression of a terminal of a grammar in this package
+    with ``load_terminal_pattern``, once for the whole process.
+
+    :param grammar_name: The file name of the grammar.
+    :param terminal: The name of the terminal.
+    :returns: A string that can be compiled into a regular expression.
+    """
+
+    return load_terminal_pattern(grammar_name, terminal)
@@ -13,15 +13,22 @@ except ImportError as e:
         "Grascii: interactive extra dependencies are not installed"
     ) from e
 
+import heapq
 import sys
+from itertools import islice
 from typing import TYPE_CHECKING, TypeVar
 
 from grascii import metrics, regen
 from grascii.dictionary import Dictionary
 from grascii.dictionary.list import get_built_ins, get_installed
-from grascii.interpreter import Interpretation, interpretation_to_string
+from grascii.interpreter import (
+    Interpretation,
+    collect_interpretations,
+    interpretation_to_string,
+)
 from grascii.parser import InvalidGrascii
 from grascii.searchers import (
+    GrasciiQuery,
     GrasciiSearcher,
     GrasciiSearchOptions,
     SearcherOptions,
@@ -60,6 +67,7 @@ class InteractiveSearcher(GrasciiSearcher):
         """
         self._extract_search_args(**kwargs)
         self._metric = None
+        self._limit = None
         self._run_interactive()
 
     def sorted_search(
@@ -67,17 +75,36 @@ class InteractiveSearcher(GrasciiSearcher):
         metric: Callable[
             [SearchResult[Interpretation]], metrics.Comparable
         ] = metrics.grascii_standard,
+        limit: int | None = None,
         *,
         grascii: str | None = None,
         **kwargs: Unpack[GrasciiSearchOptions],
     ) -> None:
         """
+        :param limit: The maximum number of results to display for each
+            search.
         :param grascii: Ignored
         """
         self._extract_search_args(**kwargs)
         self._metric = metric
+        self._limit = limit
         self._run_interactive()
 
+    def _extract_search_args(self, **kwargs: Unpack[GrasciiSearchOptions]) -> None:
+        """Store the search arguments, which may be changed between searches."""
+
+        query = GrasciiQuery.create("", **kwargs)
+        self.uncertainty = query.uncertainty
+        self.search_mode = query.search_mode
+        self.annotation_mode = query.annotation_mode
+        self.aspirate_mode = query.aspirate_mode
+        self.disjoiner_mode = query.disjoiner_mode
+        self.fix_first = query.fix_first
+        self.interpretation_mode = query.interpretation
+        self.max_interpretations = query.max_interpretations
+        self.interpretation_time_limit = query.interpretation_time_limit
+        self.uncertainty_budget = query.uncertainty_budget
+
     def _choose_interpretation(
         self, interpretations: Sequence[Interpretation]
     ) -> int | None:
@@ -254,20 +281,28 @@ class InteractiveSearcher(GrasciiSearcher):
         index = self._choose_interpretation(interpretations)
         if index is None:
             return search
-        builder = regen.RegexBuilder(
+        query = GrasciiQuery(
+            grascii=search,
             uncertainty=self.uncertainty,
             search_mode=self.search_mode,
-            fix_first=self.fix_first,
             annotation_mode=self.annotation_mode,
             aspirate_mode=self.aspirate_mode,
             disjoiner_mode=self.disjoiner_mode,
+            fix_first=self.fix_first,
+            interpretation=self.interpretation_mode,
+            max_interpretations=self.max_interpretations,
+            interpretation_time_limit=self.interpretation_time_limit,
+            uncertainty_budget=self.uncertainty_budget,
         )
         interps = interpretations if index == 0 else interpretations[index - 1 : index]
-        patterns = builder.generate_patterns_map(interps)
-        starting_letters = builder.get_starting_letters(interps)
-        results = self.perform_search(patterns, starting_letters)
+        results = self.execute(self._plan_interpretations(query, interps))
         if self._metric:
-            results = sorted(results, key=self._metric)
+            if self._limit is not None:
+                results = heapq.nsmallest(self._limit, results, key=self._metric)
+            else:
+                results = sorted(results, key=self._metric)
+        elif self._limit is not None:
+            results = islice(results, self._limit)
         count = 0
         display_all = False
         for result in results:
@@ -308,7 +343,11 @@ class InteractiveSearcher(GrasciiSearcher):
                 continue
             search = search.upper()
             try:
-                interpretations = list(self._parser.interpret(search))
+                interpretations = collect_interpretations(
+                    self._parser.interpret(search),
+                    self.max_interpretations,
+                    self.interpretation_time_limit,
+                )
             except InvalidGrascii as e:
                 print("Invalid Grascii String", file=sys.stderr)
                 print(e.context, file=sys.stderr)
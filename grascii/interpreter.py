@@ -1,11 +1,16 @@
 from __future__ import annotations
 
 import re
+import time
 from functools import reduce
+from typing import TYPE_CHECKING
 
 from grascii import grammar
 from grascii.validator import GrasciiValidator
 
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+
 Interpretation = list[str | list[str]]
 """
 Represents an interpretation of a Grascii string. An ``Interpretation`` is
@@ -94,31 +99,101 @@ class GrasciiInterpreter:
                     tokens.append(grascii[i])
                 i += 1
 
-        return self._tokens_to_interpretation(tokens)
-
-    def _tokens_to_interpretation(
-        self,
-        tokens: list[str],
-    ) -> Interpretation:
-        interpretation: Interpretation = []
-        annotations: list[str] = []
-
-        for token in tokens:
-            if token in grammar.ANNOTATION_CHARACTERS:
-                if annotations:
-                    annotations.append(token)
-                else:
-                    annotations = [token]
+        return _tokens_to_interpretation(tokens)
+
+
+def _tokens_to_interpretation(tokens: Iterable[str]) -> Interpretation:
+    interpretation: Interpretation = []
+    annotations: list[str] = []
+
+    for token in tokens:
+        if token in grammar.ANNOTATION_CHARACTERS:
+            if annotations:
+                annotations.append(token)
             else:
-                if annotations:
-                    interpretation.append(annotations)
-                    annotations = []
-                interpretation.append(token)
+                annotations = [token]
+        else:
+            if annotations:
+                interpretation.append(annotations)
+                annotations = []
+            interpretation.append(token)
+
+    if annotations:
+        interpretation.append(annotations)
+
+    return interpretation
+
+
+def collect_interpretations(
+    interpretations: Iterable[Interpretation],
+    limit: int = 0,
+    time_limit: float = 0,
+) -> list[Interpretation]:
+    """Collect the distinct interpretations of an iterable in order, stopping
+    early when there are too many of them or finding them takes too long. The
+    first interpretation is always collected.
+
+    :param interpretations: An iterable of interpretations, such as the one
+        returned by ``GrasciiParser.interpret``.
+    :param limit: The maximum number of interpretations to collect, or 0 for
+        no limit.
+    :param time_limit: The number of seconds after which no more
+        interpretations are collected, or 0 for no limit.
+    :returns: A list of distinct interpretations.
+    """
 
-        if annotations:
-            interpretation.append(annotations)
+    deadline = time.monotonic() + time_limit if time_limit > 0 else None
+    seen: set[tuple[str | tuple[str, ...], ...]] = set()
+    collected: list[Interpretation] = []
+    iterator: Iterator[Interpretation] = iter(interpretations)
+    for interpretation in iterator:
+        key = tuple(
+            tuple(item) if isinstance(item, list) else item for item in interpretation
+        )
+        if key not in seen:
+            seen.add(key)
+            collected.append(interpretation)
+            if len(collected) == limit:
+                break
+        if deadline is not None and time.monotonic() >= deadline:
+            break
+    close = getattr(iterator, "close", None)
+    if close is not None:
+        # stop the enumeration, so that partial results can be cached
+        close()
+    return collected
+
+
+_ENCODING_OFFSET = ord("0")
+
+
+def encode_interpretation(interpretation: Interpretation) -> str:
+    """Encode an interpretation compactly as a string with one printable
+    character for the stroke id of each token. See ``grammar.TOKEN_IDS``.
+
+    :param interpretation: An Interpretation to encode.
+    :returns: The encoded interpretation.
+    """
+
+    tokens: list[str] = []
+    for item in interpretation:
+        if isinstance(item, list):
+            tokens += item
+        else:
+            tokens.append(item)
+    return "".join(chr(_ENCODING_OFFSET + grammar.TOKEN_IDS[t]) for t in tokens)
+
+
+def decode_interpretation(encoded: str) -> Interpretation:
+    """Decode an interpretation encoded by ``encode_interpretation``.
+
+    :param encoded: An encoded interpretation.
+    :returns: The decoded Interpretation.
+    """
 
-        return interpretation
+    return _tokens_to_interpretation(
+        grammar.TOKENS[ord(c) - _ENCODING_OFFSET] for c in encoded
+    )
 
 
 def interpretation_to_string(interpretation: Interpretation) -> str:
@@ -0,0 +1,301 @@
+"""Enumerates the interpretations of Grascii strings without a general parser.
+
+A Grascii string is split into roots by its disjoiners. The letters of each
+root form a lattice: a directed acyclic graph whose nodes are positions in
+the string and whose edges are the letters, with their annotations, that can
+be read between two positions. Each path through the lattice is a
+segmentation of the root into letters, so the interpretations of a string are
+found by walking its lattice, which takes time proportional to the length of
+the string for each interpretation.
+
+Interpretations are produced in the same order as ``GrasciiParser`` produces
+them from an ambiguous Earley parse of the Grascii grammar. The ways to read
+a part of a string are ranked by the priority of their best reading, in which
+blended consonants and diphthongs count for one and blends overlapping a
+following blend count for nothing, then by the order of the rules of the
+grammar, and then by the position of their last letter, latest first.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from grascii import grammar
+from grascii.interpreter import _tokens_to_interpretation
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator, Sequence
+
+    from grascii.interpreter import Interpretation
+
+_BLENDS = "TN DN TM DM NT MT ND MD DF DV TV JNT JND PND PNT MN MM DT TD DD \
+    SS XS NG NK LD"
+_DIPHTHONGS = "A&E A&' I EU AU OE"
+
+_PRIORITY_STROKES = set(_BLENDS.split()) | set(_DIPHTHONGS.split())
+"""The strokes read with a higher priority than single strokes: blended
+consonants and diphthongs."""
+
+_OVERLAPPING_BLENDS = {"NT", "MT", "ND", "MD"}
+"""Blends that lose their priority when followed by N or M, which could start
+another blend."""
+
+_STROKE_LENGTHS = sorted({len(stroke) for stroke in grammar.STROKES}, reverse=True)
+
+_SEPARATORS: tuple[str, ...] = (
+    grammar.ASPIRATE + grammar.BOUNDARY,
+    grammar.ASPIRATE + grammar.INTERSECTION,
+    grammar.ASPIRATE,
+    grammar.BOUNDARY,
+    grammar.INTERSECTION,
+    "",
+)
+"""The strings allowed between two letters, in the order of the rules of the
+grammar. A letter alone comes before all of them."""
+
+_MAX_ASPIRATES = 2
+"""The number of aspirates allowed at each end of a root."""
+
+_MAX_ROOTS = 3
+"""The number of roots allowed in a Grascii string."""
+
+_Tokens = tuple[str, ...]
+_Letter = tuple[int, _Tokens, int]
+"""The start, tokens and priority of a letter."""
+_Reading = tuple["_Node", _Tokens, _Tokens]
+"""The node of the letters of a root and the aspirates before and after it."""
+
+
+class _Node:
+    """The readings of a part of a root that ends with a letter."""
+
+    __slots__ = ("alternatives", "priority")
+
+    def __init__(self, alternatives: list[tuple[_Node | None, _Tokens]]) -> None:
+        self.alternatives = alternatives
+        """Pairs of the node before the last letter, or ``None`` if there is
+        only one letter, and the tokens after that node."""
+        self.priority = 0
+
+
+def _letters_from(grascii: str, start: int) -> Iterator[tuple[int, _Tokens, int]]:
+    """Find the letters that begin at a position.
+
+    :returns: An iterator over the end, tokens and priority of each letter.
+    """
+
+    for length in _STROKE_LENGTHS:
+        stroke = grascii[start : start + length]
+        if len(stroke) < length or stroke not in grammar.STROKES:
+            continue
+        end = start + length
+        priority = 1 if stroke in _PRIORITY_STROKES else 0
+        if stroke in _OVERLAPPING_BLENDS and grascii[end : end + 1] in ("N", "M"):
+            priority = 0
+        letters = [(end, (stroke,))]
+        for options in grammar.ANNOTATIONS.get(stroke, ()):
+            extended = []
+            for letter_end, tokens in letters:
+                annotation = grascii[letter_end : letter_end + 1]
+                if annotation and annotation in options:
+                    extended.append((letter_end + 1, (*tokens, annotation)))
+            letters += extended
+        for end, tokens in letters:
+            yield end, tokens, priority
+
+
+def _build_string(
+    grascii: str, start: int, end: int, letters: Sequence[list[_Letter]]
+) -> _Node | None:
+    """Build the lattice of the letters of a root between two positions.
+
+    :param letters: The letters ending at each position of the string.
+    :returns: The node of the readings of the whole span, or ``None`` if it
+        cannot be read.
+    """
+
+    nodes: dict[int, _Node] = {}
+    for position in range(start + 1, end + 1):
+        alternatives = []
+        for letter_start, tokens, priority in letters[position]:
+            if letter_start == start:
+                alternatives.append(((-priority, 0, -letter_start), None, tokens))
+                continue
+            for order, separator in enumerate(_SEPARATORS, 1):
+                left_end = letter_start - len(separator)
+                left = nodes.get(left_end)
+                if left is None or grascii[left_end:letter_start] != separator:
+                    continue
+                key = (-(left.priority + priority), order, -letter_start)
+                alternatives.append((key, left, (*separator, *tokens)))
+        if alternatives:
+            alternatives.sort(key=lambda alternative: alternative[0])
+            node = _Node([(left, tokens) for _, left, tokens in alternatives])
+            node.priority = -alternatives[0][0][0]
+            nodes[position] = node
+    return nodes.get(end)
+
+
+def _build_root(
+    grascii: str, start: int, end: int, letters: Sequence[list[_Letter]]
+) -> list[_Reading] | None:
+    """Build the lattice of a root between two positions.
+
+    :param letters: The letters ending at each position of the string.
+    :returns: The readings of the root in order, or ``None`` if the root
+        cannot be read.
+    """
+
+    readings = []
+    for order in range((_MAX_ASPIRATES + 1) ** 2):
+        leading, trailing = divmod(order, _MAX_ASPIRATES + 1)
+        if (
+            start + leading >= end - trailing
+            or grascii[start : start + leading] != grammar.ASPIRATE * leading
+            or grascii[end - trailing : end] != grammar.ASPIRATE * trailing
+        ):
+            continue
+        node = _build_string(grascii, start + leading, end - trailing, letters)
+        if node is not None:
+            before = (grammar.ASPIRATE,) * leading
+            after = (grammar.ASPIRATE,) * trailing
+            readings.append(((-node.priority, order), (node, before, after)))
+    if not readings:
+        return None
+    readings.sort(key=lambda reading: reading[0])
+    return [reading for _, reading in readings]
+
+
+def _derivations(node: _Node) -> Iterator[list[str]]:
+    """Iterate over the token sequences of the readings of a node in order.
+
+    The choice of alternative at each node from the last letter back to the
+    first is kept on a stack, and the choice nearest the first letter changes
+    fastest, so each reading takes time proportional to its length.
+    """
+
+    stack: list[tuple[_Node, int]] = [(node, 0)]
+    while stack:
+        left = stack[-1][0].alternatives[stack[-1][1]][0]
+        while left is not None:
+            stack.append((left, 0))
+            left = left.alternatives[0][0]
+        yield [
+            token
+            for node, choice in reversed(stack)
+            for token in node.alternatives[choice][1]
+        ]
+        while stack:
+            node, choice = stack.pop()
+            if choice + 1 < len(node.alternatives):
+                stack.append((node, choice + 1))
+                break
+
+
+def _root_derivations(readings: list[_Reading]) -> Iterator[list[str]]:
+    for node, before, after in readings:
+        for tokens in _derivations(node):
+            yield [*before, *tokens, *after]
+
+
+def _product(roots: list[list[_Reading]], index: int = 0) -> Iterator[list[str]]:
+    """Iterate over the token sequences of several roots separated by
+    disjoiners, the first root changing slowest."""
+
+    if index == len(roots) - 1:
+        yield from _root_derivations(roots[index])
+        return
+    for tokens in _root_derivations(roots[index]):
+        for rest in _product(roots, index + 1):
+            yield [*tokens, grammar.DISJOINER, *rest]
+
+
+class GrasciiLattice:
+    """The lattices of the roots of a Grascii string, from which its
+    interpretations are enumerated.
+
+    Use ``build_lattice`` to create a lattice.
+
+    :param grascii: The Grascii string.
+    :param roots: The readings of each root.
+    :param leading: Whether the string begins with a disjoiner.
+    :param trailing: Whether the string ends with a disjoiner.
+    """
+
+    def __init__(
+        self,
+        grascii: str,
+        roots: list[list[_Reading]],
+        leading: bool = False,
+        trailing: bool = False,
+    ) -> None:
+        self.grascii = grascii
+        self._roots = roots
+        self._leading = leading
+        self._trailing = trailing
+
+    def _token_sequences(self) -> Iterator[list[str]]:
+        if not self._roots:
+            # a lone aspirate
+            yield [grammar.ASPIRATE]
+            return
+        for tokens in _product(self._roots):
+            if self._leading:
+                tokens.insert(0, grammar.DISJOINER)
+            if self._trailing:
+                tokens.append(grammar.DISJOINER)
+            yield tokens
+
+    def interpretations(
+        self, preserve_boundaries: bool = False
+    ) -> Iterator[Interpretation]:
+        """Iterate over the interpretations of the Grascii string, in the same
+        order as ``GrasciiParser``.
+
+        :param preserve_boundaries: When ``False``, boundaries in the string
+            ('-') are not included in the resulting interpretations.
+        :returns: An iterator over interpretations.
+        """
+
+        for tokens in self._token_sequences():
+            if not preserve_boundaries:
+                tokens = [token for token in tokens if token != grammar.BOUNDARY]
+            yield _tokens_to_interpretation(tokens)
+
+
+def build_lattice(grascii: str) -> GrasciiLattice | None:
+    """Build the lattice of a Grascii string.
+
+    :param grascii: A Grascii string.
+    :returns: The lattice, or ``None`` if the string is not valid Grascii.
+    """
+
+    if grascii == grammar.ASPIRATE:
+        return GrasciiLattice(grascii, [])
+
+    parts = grascii.split(grammar.DISJOINER)
+    leading = len(parts) == 2 and not parts[0]
+    if leading:
+        del parts[0]
+    trailing = 1 < len(parts) < _MAX_ROOTS + 1 and not parts[-1]
+    if trailing:
+        del parts[-1]
+    if not 0 < len(parts) <= _MAX_ROOTS or not all(parts):
+        return None
+    if leading and trailing or len(parts) == _MAX_ROOTS and (leading or trailing):
+        return None
+
+    letters: list[list[_Letter]] = [[] for _ in range(len(grascii) + 1)]
+    for start in range(len(grascii)):
+        for end, tokens, priority in _letters_from(grascii, start):
+            letters[end].append((start, tokens, priority))
+
+    roots = []
+    start = 1 if leading else 0
+    for part in parts:
+        readings = _build_root(grascii, start, start + len(part), letters)
+        if readings is None:
+            return None
+        roots.append(readings)
+        start += len(part) + 1
+    return GrasciiLattice(grascii, roots, leading, trailing)
@@ -4,6 +4,8 @@ Contains metrics for comparing search queries to regular expression matches.
 
 from __future__ import annotations
 
+from functools import lru_cache
+from itertools import chain, islice
 from typing import (
     TYPE_CHECKING,
     Any,
@@ -13,14 +15,15 @@ from typing import (
 )
 
 from grascii import grammar
-from grascii.similarities import get_similar
+from grascii.similarities import get_similarity_matrix
 
 if TYPE_CHECKING:
-    from collections.abc import Callable
+    from collections.abc import Callable, Iterable, Sequence
     from re import Match
 
     from grascii.interpreter import Interpretation
     from grascii.searchers import SearchResult
+    from grascii.similarities import SimilarityMatrix
 
     class Comparable(Protocol):
         def __lt__(self, other: Any) -> bool: ...
@@ -82,96 +85,249 @@ def match_to_gsequence(match: Match[str]) -> GrasciiSequence:
     return sequence
 
 
-def gsequence_distance(seq1: GrasciiSequence, seq2: GrasciiSequence) -> int:
+BASE_COST = 4
+"""The cost of inserting or deleting a stroke, and of each step between two
+strokes in the similarity graph."""
+
+ANNOTATION_COSTS = {"~": 2, "|": 2, ".": 1, ",": 1, "(": 1, ")": 1, "_": 1}
+"""The cost of inserting or deleting each annotation."""
+
+ASPIRATE_COST = 1
+"""The cost of inserting or deleting an aspirate."""
+
+DISJOINER_COST = BASE_COST
+"""The cost of inserting or deleting a disjoiner."""
+
+MAX_STROKE_DISTANCE = 3
+"""The distance between two strokes that are not within two steps of each
+other in the similarity graph."""
+
+_ANNOTATION_BITS = {
+    annotation: 1 << i for i, annotation in enumerate(sorted(ANNOTATION_COSTS))
+}
+
+
+class _CostTables(NamedTuple):
+    """Costs of the operations of ``gsequence_distance`` indexed by the
+    stroke ids of ``grammar.TOKEN_IDS`` and by annotation masks, which have
+    one bit for each annotation in ``ANNOTATION_COSTS``."""
+
+    annotation_costs: list[int]
+    """The cost of the annotations of each annotation mask."""
+
+    ins_del_costs: list[int]
+    """The cost of inserting or deleting each token without annotations."""
+
+    sub_costs: list[list[int] | None]
+    """A row for each token, which is ``None`` if the token is not a stroke.
+    The row of a stroke holds the cost of substituting it with each token
+    without annotations, or -1 where that token is not a stroke and cannot
+    substitute it."""
+
+
+def _stroke_distance(similarity: SimilarityMatrix, stroke1: str, stroke2: str) -> int:
+    """Look up the distance between two strokes in a similarity matrix,
+    restricted to 0-3."""
+
+    distance = similarity.distance(stroke1, stroke2)
+    if distance is None:
+        return MAX_STROKE_DISTANCE
+    return min(distance, MAX_STROKE_DISTANCE)
+
+
+_MAX_CACHED_TABLES = 8
+"""The number of similarity matrices whose cost tables are kept."""
+
+
+@lru_cache(maxsize=_MAX_CACHED_TABLES)
+def _cost_tables(similarity: SimilarityMatrix) -> _CostTables:
+    annotation_costs = [
+        sum(
+            cost
+            for annotation, cost in ANNOTATION_COSTS.items()
+            if mask & _ANNOTATION_BITS[annotation]
+        )
+        for mask in range(1 << len(_ANNOTATION_BITS))
+    ]
+
+    ins_del_costs = []
+    for token in grammar.TOKENS:
+        if token in grammar.STROKES:
+            ins_del_costs.append(BASE_COST)
+        elif token == grammar.ASPIRATE:
+            ins_del_costs.append(ASPIRATE_COST)
+        elif token == grammar.DISJOINER:
+            ins_del_costs.append(DISJOINER_COST)
+        else:
+            ins_del_costs.append(0)
+
+    sub_costs: list[list[int] | None] = []
+    for token1 in grammar.TOKENS:
+        if token1 not in grammar.STROKES:
+            sub_costs.append(None)
+            continue
+        sub_costs.append(
+            [
+                _stroke_distance(similarity, token1, token2) * BASE_COST
+                if token2 in grammar.STROKES
+                else -1
+                for token2 in grammar.TOKENS
+            ]
+        )
+    return _CostTables(annotation_costs, ins_del_costs, sub_costs)
+
+
+class _EncodedSequence(NamedTuple):
+    """A ``GrasciiSequence`` as parallel lists of integers."""
+
+    ids: list[int]
+    """The stroke id of each stroke."""
+
+    masks: list[int]
+    """The annotation mask of each stroke."""
+
+    ins_del_costs: list[int]
+    """The cost of inserting or deleting each stroke with its annotations."""
+
+    stroke_count: int
+    """The number of strokes in the sequence, excluding aspirates and
+    disjoiners."""
+
+
+def _similarity_of(result: SearchResult[Any]) -> SimilarityMatrix:
+    """Get the similarity matrix a result was found with."""
+    return result.similarity or get_similarity_matrix()
+
+
+def _encode(
+    strokes: Iterable[tuple[str, Iterable[str]]], tables: _CostTables
+) -> _EncodedSequence:
+    ids = []
+    masks = []
+    ins_del_costs = []
+    stroke_count = 0
+    for stroke, stroke_annotations in strokes:
+        stroke_id = grammar.TOKEN_IDS.get(stroke)
+        assert stroke_id is not None and tables.ins_del_costs[stroke_id] > 0, stroke
+        mask = 0
+        for annotation in stroke_annotations:
+            mask |= _ANNOTATION_BITS.get(annotation, 0)
+        if tables.sub_costs[stroke_id] is not None:
+            stroke_count += 1
+        ids.append(stroke_id)
+        masks.append(mask)
+        ins_del_costs.append(
+            tables.ins_del_costs[stroke_id] + tables.annotation_costs[mask]
+        )
+    return _EncodedSequence(ids, masks, ins_del_costs, stroke_count)
+
+
+def _lower_bound(seq1: _EncodedSequence, seq2: _EncodedSequence) -> int:
+    # every stroke that is not substituted with a stroke costs at least
+    # BASE_COST, whether it is inserted, deleted or substituted with an
+    # aspirate or disjoiner
+    return abs(seq1.stroke_count - seq2.stroke_count) * BASE_COST
+
+
+def _encoded_distance(
+    seq1: _EncodedSequence,
+    seq2: _EncodedSequence,
+    tables: _CostTables,
+    cutoff: int | None = None,
+) -> int:
+    """Compute ``gsequence_distance`` on encoded sequences."""
+
+    if cutoff is not None and _lower_bound(seq1, seq2) > cutoff:
+        return cutoff + 1
+    annotation_costs = tables.annotation_costs
+    sub_costs = tables.sub_costs
+    ids2, masks2, ins_del2, _ = seq2
+
+    vec0 = [0]
+    for cost in ins_del2:
+        vec0.append(vec0[-1] + cost)
+    vec1 = [0] * len(vec0)
+
+    for id1, mask1, del_cost in zip(
+        seq1.ids, seq1.masks, seq1.ins_del_costs, strict=True
+    ):
+        row = sub_costs[id1]
+        vec1[0] = vec0[0] + del_cost
+        for j, id2 in enumerate(ids2):
+            sub_cost = row[id2] if row is not None else -1
+            if sub_cost >= 0:
+                sub_cost += annotation_costs[mask1 ^ masks2[j]]
+            elif id1 == id2:
+                sub_cost = 0
+            else:
+                sub_cost = max(del_cost, ins_del2[j])
+            vec1[j + 1] = min(
+                vec0[j + 1] + del_cost, vec1[j] + ins_del2[j], vec0[j] + sub_cost
+            )
+        vec0, vec1 = vec1, vec0
+        if cutoff is not None and min(vec0) > cutoff:
+            # the distance never decreases along a path through the table
+            return cutoff + 1
+
+    if cutoff is not None and vec0[-1] > cutoff:
+        return cutoff + 1
+    return vec0[-1]
+
+
+def gsequence_distance(
+    seq1: GrasciiSequence,
+    seq2: GrasciiSequence,
+    cutoff: int | None = None,
+    similarity: SimilarityMatrix | None = None,
+) -> int:
     """Compute a weighed Levenshtein distance between two sequences of annotated
     strokes.
 
+    The costs of operations on strokes and annotations are looked up in tables
+    that are computed once, so the distance is computed on integers.
+
+    With a cutoff, the computation stops as soon as the distance is known to
+    be greater than the cutoff. The difference between the numbers of strokes
+    of the sequences times ``BASE_COST`` is checked first, and then each row of
+    the table of distances.
+
     :param seq1: A ``GrasciiSequence``
     :param seq2: A second ``GrasciiSequence``
-    :returns: A distance between seq1 and seq2.
+    :param cutoff: The greatest distance of interest.
+    :param similarity: The similarity graph that gives the cost of
+        substituting strokes. Defaults to the graph of
+        ``similarities.get_similarity_matrix``.
+    :returns: A distance between seq1 and seq2, or ``cutoff + 1`` if the
+        distance is greater than the cutoff.
     """
 
-    BASE_COST = 4
-    COSTS = {"~": 2, "|": 2, ".": 1, ",": 1, "(": 1, ")": 1, "_": 1}
-    ASP_COST = 1
-    DIS_COST = BASE_COST
-
-    def compute_ins_del_cost(stroke: AnnotatedStroke) -> int:
-        """Compute the insertion and deletion cost of a stroke and its
-        annotations.
-
-        :param stroke: A stroke and its annotations for which to calculate its cost.
-        :returns: A cost of insertion/deletion.
-        """
-
-        cost = 0
-        if stroke.stroke in grammar.STROKES:
-            cost += BASE_COST
-        elif stroke.stroke == grammar.ASPIRATE:
-            cost += ASP_COST
-        elif stroke.stroke == grammar.DISJOINER:
-            cost += DIS_COST
-
-        assert cost > 0, stroke
-        cost += sum(COSTS.get(annotation, 0) for annotation in stroke.annotations)
-        return cost
-
-    def compute_sub_cost(stroke1: AnnotatedStroke, stroke2: AnnotatedStroke) -> int:
-        """Compute the cost of substituting an annotated stroke with another one.
-
-        :param stroke1: The stroke to replace.
-        :param stroke2: The new stroke to add.
-        :returns: A cost of substitution.
-        """
-
-        cost = 0
-        if stroke1.stroke in grammar.STROKES and stroke2.stroke in grammar.STROKES:
-            cost += get_distance(stroke1.stroke, stroke2.stroke) * BASE_COST
-            diff = stroke1.annotations ^ stroke2.annotations
-            cost += sum(COSTS.get(annotation, 0) for annotation in diff)
-            return cost
-        if stroke1.stroke == stroke2.stroke:
-            return 0
-        return max(compute_ins_del_cost(stroke1), compute_ins_del_cost(stroke2))
-
-    def get_distance(stroke1: str, stroke2: str) -> int:
-        """Calculate the distance between two strokes in a similarity graph.
-        Restricted to 0-3.
-
-        :param stroke1: A stroke
-        :param stroke2: A second stroke to compute the distance between
-        :returns: A distance.
-        """
-
-        def in_similarity_graph(distance: int) -> bool:
-            similars = get_similar(stroke1, distance)
-            similar_strokes = set()
-            for tup in similars:
-                similar_strokes |= set(tup)
-            return stroke2 in similar_strokes
-
-        for distance in range(3):
-            if in_similarity_graph(distance):
-                return distance
-        return 3
+    tables = _cost_tables(similarity or get_similarity_matrix())
+    return _encoded_distance(
+        _encode(seq1, tables), _encode(seq2, tables), tables, cutoff
+    )
 
-    vec0 = [0]
-    for stroke in seq2:
-        vec0.append(vec0[-1] + compute_ins_del_cost(stroke))
-    vec1 = [0 for _ in range(len(seq2) + 1)]
 
-    for stroke1 in seq1:
-        vec1[0] = vec0[0] + compute_ins_del_cost(stroke1)
+def gsequence_lower_bound(seq1: GrasciiSequence, seq2: GrasciiSequence) -> int:
+    """Compute a lower bound of ``gsequence_distance`` without comparing the
+    strokes of the sequences.
 
-        for j, stroke2 in enumerate(seq2):
-            del_cost = vec0[j + 1] + compute_ins_del_cost(stroke1)
-            ins_cost = vec1[j] + compute_ins_del_cost(stroke2)
-            sub_cost = vec0[j] + compute_sub_cost(stroke1, stroke2)
-            vec1[j + 1] = min(del_cost, ins_cost, sub_cost)
+    :param seq1: A ``GrasciiSequence``
+    :param seq2: A second ``GrasciiSequence``
+    :returns: A value that is at most the distance between seq1 and seq2.
+    """
 
-        vec0, vec1 = vec1, vec0
+    tables = _cost_tables(get_similarity_matrix())
+    return _lower_bound(_encode(seq1, tables), _encode(seq2, tables))
 
-    return vec0[len(seq2)]
+
+def _encode_interpretation(
+    interp: Interpretation, tables: _CostTables
+) -> _EncodedSequence:
+    return _encode(interpretation_to_gsequence(interp), tables)
+
+
+def _encode_match(match: Match[str], tables: _CostTables) -> _EncodedSequence:
+    return _encode(match_to_gsequence(match), tables)
 
 
 IT = TypeVar("IT")
@@ -192,21 +348,39 @@ def determine_shortest_distance(
     return distance
 
 
-def grascii_standard(result: SearchResult[Interpretation]) -> tuple[int, int, int, int]:
-    """Compute the standard metric for a grascii search.
+def _shortest_distance(
+    result: SearchResult[Interpretation], cutoff: int | None
+) -> int | None:
+    """Find the shortest distance between an interpretation and a match of a
+    result, skipping the matches that cannot improve on the shortest distance
+    found so far.
 
-    :param result: A ``SearchResult``
-    :returns: A comparable key representing the distance between an ``Interpretation``
-        and a ``Match``
+    :returns: The shortest distance, or ``None`` if it is greater than the
+        cutoff.
     """
 
-    def distance(interp: Interpretation, match: Match[str]) -> int:
-        seq1 = interpretation_to_gsequence(interp)
-        seq2 = match_to_gsequence(match)
-        return gsequence_distance(seq1, seq2)
-
+    tables = _cost_tables(_similarity_of(result))
+    encoded: dict[int, _EncodedSequence] = {}
+    shortest = None
+    for interp, match in result.matches:
+        if shortest is not None:
+            if shortest == 0:
+                break
+            cutoff = shortest - 1
+        # the same interpretation is often matched by several patterns
+        seq1 = encoded.get(id(interp))
+        if seq1 is None:
+            seq1 = encoded[id(interp)] = _encode_interpretation(interp, tables)
+        distance = _encoded_distance(seq1, _encode_match(match, tables), tables, cutoff)
+        if cutoff is None or distance <= cutoff:
+            shortest = distance
+    return shortest
+
+
+def _standard_key(
+    result: SearchResult[Interpretation], shortest_distance: int
+) -> tuple[int, int, int, int]:
     min_start = min(r[1].start("matched_grascii") for r in result.matches)
-    shortest_distance = determine_shortest_distance(result.matches, distance)
 
     # calculate an adjusted distance that will put "off-by-one" matches in the
     # same overall group as exact matches
@@ -217,6 +391,210 @@ def grascii_standard(result: SearchResult[Interpretation]) -> tuple[int, int, in
     return adjusted_distance, min_start, shortest_distance, len(result.entry.grascii)
 
 
+def grascii_standard(result: SearchResult[Interpretation]) -> tuple[int, int, int, int]:
+    """Compute the standard metric for a grascii search.
+
+    :param result: A ``SearchResult``
+    :returns: A comparable key representing the distance between an ``Interpretation``
+        and a ``Match``
+    """
+
+    shortest_distance = _shortest_distance(result, None)
+    assert shortest_distance is not None
+    return _standard_key(result, shortest_distance)
+
+
+def bounded_grascii_standard(
+    result: SearchResult[Interpretation], bound: tuple[int, int, int, int] | None
+) -> tuple[int, int, int, int] | None:
+    """Compute ``grascii_standard`` only if it may not be greater than a bound.
+
+    :param result: A ``SearchResult``
+    :param bound: The greatest key of interest, or ``None`` for no bound.
+    :returns: The key of ``grascii_standard``, or ``None`` if it is known to
+        be greater than the bound.
+    """
+
+    # the adjusted distance is at least the shortest distance minus one
+    cutoff = None if bound is None else bound[0] + 1
+    shortest_distance = _shortest_distance(result, cutoff)
+    if shortest_distance is None:
+        return None
+    return _standard_key(result, shortest_distance)
+
+
+_BATCH_SIZE = 4096
+"""The number of pairs of sequences compared at once by the NumPy
+implementation of ``score_many``."""
+
+_MIN_NUMPY_PAIRS = 32
+"""The number of pairs of sequences below which comparing them one at a time
+is faster than with NumPy."""
+
+
+@lru_cache(maxsize=1)
+def _numpy() -> Any:
+    """Import NumPy, which is an optional dependency.
+
+    :returns: The ``numpy`` module, or ``None`` if it is not installed.
+    """
+
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+@lru_cache(maxsize=_MAX_CACHED_TABLES)
+def _numpy_cost_tables(similarity: SimilarityMatrix) -> tuple[Any, Any]:
+    """The annotation costs and substitution costs of ``_cost_tables`` as
+    NumPy arrays. Substitutions involving a token that is not a stroke cost
+    -1."""
+
+    np = _numpy()
+    tables = _cost_tables(similarity)
+    sub_costs = np.full((len(grammar.TOKENS), len(grammar.TOKENS)), -1, np.int64)
+    for stroke_id, row in enumerate(tables.sub_costs):
+        if row is not None:
+            sub_costs[stroke_id] = row
+    return np.array(tables.annotation_costs, np.int64), sub_costs
+
+
+def _pad(np: Any, seqs: list[_EncodedSequence]) -> tuple[Any, Any, Any, Any]:
+    """Pad the ids, masks and insertion and deletion costs of sequences into
+    arrays with one row for each sequence.
+
+    :returns: The three arrays and the length of each sequence.
+    """
+
+    lengths = np.fromiter(map(len, (seq.ids for seq in seqs)), np.int64, len(seqs))
+    width = int(lengths.max(initial=0))
+    filled = np.arange(width) < lengths[:, None]
+    total = int(lengths.sum())
+    arrays = []
+    for field in (0, 1, 2):
+        values = chain.from_iterable(seq[field] for seq in seqs)
+        array = np.zeros((len(seqs), width), np.int64)
+        array[filled] = np.fromiter(values, np.int64, total)
+        arrays.append(array)
+    ids, masks, costs = arrays
+    return ids, masks, costs, lengths
+
+
+def _numpy_distances(
+    np: Any,
+    pairs: list[tuple[_EncodedSequence, _EncodedSequence]],
+    similarity: SimilarityMatrix,
+) -> list[int]:
+    """Compute ``_encoded_distance`` for a batch of pairs of sequences with
+    NumPy.
+
+    The table of distances of every pair is filled one row at a time. Each
+    row is computed for every pair at once: deletions and substitutions
+    depend only on the previous row, and a run of insertions along the row is
+    a running minimum of the row less the cumulative cost of insertions.
+    """
+
+    annotation_costs, sub_table = _numpy_cost_tables(similarity)
+    ids1, masks1, del1, lengths1 = _pad(np, [seq1 for seq1, _ in pairs])
+    ids2, masks2, ins2, lengths2 = _pad(np, [seq2 for _, seq2 in pairs])
+    rows = np.arange(len(pairs))
+
+    # the cost of inserting the first j strokes of seq2
+    inserted = np.zeros((len(pairs), ids2.shape[1] + 1), np.int64)
+    np.cumsum(ins2, axis=1, out=inserted[:, 1:])
+
+    distances = np.zeros(len(pairs), np.int64)
+    vec0 = inserted.copy()
+    done = lengths1 == 0
+    distances[done] = vec0[rows[done], lengths2[done]]
+    vec1 = np.empty_like(vec0)
+    for i in range(ids1.shape[1]):
+        id1 = ids1[:, i, None]
+        del_cost = del1[:, i, None]
+        sub_costs = sub_table[id1, ids2]
+        sub_costs = np.where(
+            sub_costs >= 0,
+            sub_costs + annotation_costs[masks1[:, i, None] ^ masks2],
+            np.where(id1 == ids2, 0, np.maximum(del_cost, ins2)),
+        )
+
+        vec1[:, 0] = vec0[:, 0] + del1[:, i]
+        np.minimum(vec0[:, 1:] + del_cost, vec0[:, :-1] + sub_costs, out=vec1[:, 1:])
+        vec1 -= inserted
+        np.minimum.accumulate(vec1, axis=1, out=vec1)
+        vec1 += inserted
+        vec0, vec1 = vec1, vec0
+
+        done = lengths1 == i + 1
+        distances[done] = vec0[rows[done], lengths2[done]]
+    return distances.tolist()
+
+
+def _batch_distances(
+    pairs: list[tuple[_EncodedSequence, _EncodedSequence]],
+    similarity: SimilarityMatrix,
+) -> list[int]:
+    """Compute ``_encoded_distance`` for each pair of sequences, with NumPy
+    if it is installed."""
+
+    np = _numpy()
+    if np is None or len(pairs) < _MIN_NUMPY_PAIRS:
+        tables = _cost_tables(similarity)
+        return [_encoded_distance(seq1, seq2, tables) for seq1, seq2 in pairs]
+    # pairs of similar lengths are batched together to reduce padding
+    order = sorted(
+        range(len(pairs)),
+        key=lambda k: (len(pairs[k][0].ids), len(pairs[k][1].ids)),
+    )
+    distances = [0] * len(pairs)
+    for start in range(0, len(order), _BATCH_SIZE):
+        batch = order[start : start + _BATCH_SIZE]
+        found = _numpy_distances(np, [pairs[k] for k in batch], similarity)
+        for k, distance in zip(batch, found, strict=True):
+            distances[k] = distance
+    return distances
+
+
+def grascii_standard_many(
+    results: Sequence[SearchResult[Interpretation]],
+) -> list[tuple[int, int, int, int]]:
+    """Compute ``grascii_standard`` for many results at once.
+
+    When NumPy is installed, the distances between the interpretations and
+    matches of all results are computed together on padded arrays of stroke
+    ids. Otherwise, each result is scored in turn.
+
+    :param results: A sequence of ``SearchResult``
+    :returns: The key of each result, identical to ``grascii_standard``.
+    """
+
+    if _numpy() is None:
+        return [grascii_standard(result) for result in results]
+
+    # the results found with each similarity graph are scored together
+    groups: dict[SimilarityMatrix, list[int]] = {}
+    for k, result in enumerate(results):
+        groups.setdefault(_similarity_of(result), []).append(k)
+    keys: list[tuple[int, int, int, int]] = [(0, 0, 0, 0)] * len(results)
+    for similarity, group in groups.items():
+        tables = _cost_tables(similarity)
+        encoded: dict[int, _EncodedSequence] = {}
+        pairs = []
+        for k in group:
+            for interp, match in results[k].matches:
+                seq1 = encoded.get(id(interp))
+                if seq1 is None:
+                    seq1 = encoded[id(interp)] = _encode_interpretation(interp, tables)
+                pairs.append((seq1, _encode_match(match, tables)))
+        distances = iter(_batch_distances(pairs, similarity))
+        for k in group:
+            distance = min(islice(distances, len(results[k].matches)))
+            keys[k] = _standard_key(results[k], distance)
+    return keys
+
+
 def translation_standard(result: SearchResult[str]) -> tuple[int, int]:
     """Compute the standard metric for a reverse search.
 
@@ -239,3 +617,36 @@ def trivial(result: SearchResult[IT]) -> int:
     :returns: 0
     """
     return 0
+
+
+BOUNDED_METRICS: dict[Callable[..., Any], Callable[..., Any]] = {
+    grascii_standard: bounded_grascii_standard,
+}
+"""Metrics and their bounded variants. A bounded variant takes a result and
+the greatest key of interest, and returns ``None`` instead of the key of the
+result if it is known to be greater. ``Searcher.sorted_search`` uses them to
+skip most of the work for results that cannot be among the best."""
+
+
+BATCH_METRICS: dict[Callable[..., Any], Callable[..., Any]] = {
+    grascii_standard: grascii_standard_many,
+}
+"""Metrics and their batch variants. A batch variant takes a sequence of
+results and returns the key of each result, as the metric would."""
+
+
+def score_many(
+    metric: Callable[[SearchResult[IT]], CT], results: Sequence[SearchResult[IT]]
+) -> list[CT]:
+    """Compute the keys of many results with a metric, using its batch
+    variant from ``BATCH_METRICS`` if it has one.
+
+    :param metric: A metric.
+    :param results: A sequence of ``SearchResult``
+    :returns: The key of each result.
+    """
+
+    batch = BATCH_METRICS.get(metric)
+    if batch is not None:
+        return batch(results)
+    return [metric(result) for result in results]
@@ -1,17 +1,28 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+import threading
+from collections import OrderedDict
+from functools import cached_property
+from typing import TYPE_CHECKING, NamedTuple
 
 from lark import Lark, Token, Transformer, Tree, UnexpectedInput
 
 from grascii import grammar
+from grascii.grammars import get_parser
 from grascii.lark_ambig_tools import Disambiguator
+from grascii.lattice import build_lattice
 
 if TYPE_CHECKING:
     from collections.abc import Iterator
 
     from grascii.interpreter import Interpretation
 
+DEFAULT_CACHE_SIZE = 4096
+"""The default number of Grascii strings kept by an ``InterpretationCache``."""
+
+FrozenInterpretation = tuple[str | tuple[str, ...], ...]
+"""An immutable ``Interpretation``, with annotation lists stored as tuples."""
+
 
 class GrasciiFlattener(Transformer):
     """A Lark Transformer that converts a parsed Grascii string into an
@@ -69,13 +80,145 @@ class InvalidGrascii(Exception):
         self.context = unexpected_input.get_context(grascii)
 
 
-class GrasciiParser:
-    """Parses and interprets Grascii strings."""
+def _freeze(interpretation: Interpretation) -> FrozenInterpretation:
+    return tuple(
+        tuple(map(str, item)) if isinstance(item, list) else str(item)
+        for item in interpretation
+    )
+
+
+def _thaw(frozen: FrozenInterpretation) -> Interpretation:
+    return [list(item) if isinstance(item, tuple) else item for item in frozen]
+
+
+class CachedInterpretations(NamedTuple):
+    """The interpretations of a Grascii string found so far."""
+
+    interpretations: tuple[FrozenInterpretation, ...]
+    """The interpretations in the order they are produced."""
+
+    complete: bool
+    """Whether every interpretation has been found."""
+
+
+class InterpretationCache:
+    """A thread-safe, size-bounded cache of the interpretations of Grascii
+    strings.
+
+    Interpretations are stored as they are produced, so a string whose first
+    interpretation has been used is cached even if its other interpretations
+    have not been found. Once more than ``max_size`` strings are cached,
+    strings are evicted in least-recently-used order.
 
-    def __init__(self) -> None:
-        self._parser: Lark = Lark.open_from_package(
-            "grascii.grammars", "grascii.lark", parser="earley", ambiguity="explicit"
+    :param max_size: The maximum number of Grascii strings to keep.
+    :type max_size: int
+    """
+
+    def __init__(self, max_size: int = DEFAULT_CACHE_SIZE) -> None:
+        self.max_size = max_size
+        self.hits = 0
+        """The number of lookups of cached Grascii strings."""
+        self.misses = 0
+        """The number of lookups of Grascii strings that were not cached."""
+        self._entries: OrderedDict[tuple[str, bool], CachedInterpretations] = (
+            OrderedDict()
         )
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(
+        self, grascii: str, preserve_boundaries: bool
+    ) -> CachedInterpretations | None:
+        """Look up the interpretations of a Grascii string, counting a hit or
+        miss.
+
+        :param grascii: A Grascii string.
+        :param preserve_boundaries: Whether the interpretations include
+            boundaries.
+        :returns: The cached interpretations, or ``None`` if the string is not
+            cached.
+        """
+
+        key = (grascii, preserve_boundaries)
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return cached
+
+    def put(
+        self, grascii: str, preserve_boundaries: bool, cached: CachedInterpretations
+    ) -> None:
+        """Store the interpretations of a Grascii string, unless more of them
+        are already stored.
+
+        :param grascii: A Grascii string.
+        :param preserve_boundaries: Whether the interpretations include
+            boundaries.
+        :param cached: The interpretations found so far.
+        """
+
+        key = (grascii, preserve_boundaries)
+        with self._lock:
+            stored = self._entries.get(key)
+            if stored is not None and (
+                stored.complete
+                or len(stored.interpretations) > len(cached.interpretations)
+            ):
+                return
+            self._entries[key] = cached
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Remove all interpretations from the cache and reset the counters."""
+
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+_cache = InterpretationCache()
+
+
+def get_interpretation_cache() -> InterpretationCache:
+    """Get the process-wide ``InterpretationCache`` used by ``GrasciiParser``
+    by default.
+
+    :returns: The shared ``InterpretationCache``.
+    """
+
+    return _cache
+
+
+class GrasciiParser:
+    """Parses and interprets Grascii strings.
+
+    Interpretations are enumerated from a ``GrasciiLattice`` of the string.
+    The Earley parser of the Grascii grammar is only built by ``parse`` and to
+    report invalid strings.
+
+    Interpretations are kept in an ``InterpretationCache``, which is shared by
+    every parser unless another cache is given. Each call to ``interpret``
+    returns new lists, so changing them does not affect the cache.
+
+    :param cache: The cache of interpretations, or ``None`` to disable
+        caching. Defaults to the process-wide cache.
+    """
+
+    def __init__(self, cache: InterpretationCache | None = _cache) -> None:
+        self.cache = cache
+
+    @cached_property
+    def _parser(self) -> Lark:
+        return get_parser("grascii.lark", parser="earley", ambiguity="explicit")
 
     def parse(self, grascii: str) -> Tree:
         """Parse the given string into a ``Tree``.
@@ -97,8 +240,67 @@ class GrasciiParser:
         :param preserve_boundaries: When ``False``, boundaries in the string ('-')
             are not included in the resulting interpretations.
         :returns: An iterator over interpretations.
+        :raises InvalidGrascii: If the string is not valid Grascii.
         """
-        tree = self.parse(grascii)
-        trees = Disambiguator().visit(tree)
+        if self.cache is None:
+            return self._enumerate(grascii, preserve_boundaries)
+        cached = self.cache.get(grascii, preserve_boundaries)
+        if cached is None:
+            # enumerate now, so that invalid strings raise immediately
+            interpretations = self._enumerate(grascii, preserve_boundaries)
+            cached = CachedInterpretations((), False)
+        else:
+            interpretations = None
+        return self._interpret_cached(
+            grascii, preserve_boundaries, cached, interpretations
+        )
+
+    def _enumerate(
+        self, grascii: str, preserve_boundaries: bool
+    ) -> Iterator[Interpretation]:
+        """Enumerate the interpretations of a Grascii string with its lattice.
+        The Earley parser is only used to report invalid strings."""
+
+        lattice = build_lattice(grascii)
+        if lattice is not None:
+            return lattice.interpretations(preserve_boundaries)
+        trees = Disambiguator().visit(self.parse(grascii))
         flattener = GrasciiFlattener(preserve_boundaries)
         return map(flattener.transform, trees)
+
+    def _interpret_cached(
+        self,
+        grascii: str,
+        preserve_boundaries: bool,
+        cached: CachedInterpretations,
+        interpretations: Iterator[Interpretation] | None,
+    ) -> Iterator[Interpretation]:
+        """Yield copies of the cached interpretations of a Grascii string,
+        then find and cache the rest of its interpretations if they are
+        requested."""
+
+        assert self.cache is not None
+        yield from map(_thaw, cached.interpretations)
+        if cached.complete:
+            return
+
+        found = list(cached.interpretations)
+        complete = False
+        try:
+            if interpretations is None:
+                interpretations = self._enumerate(grascii, preserve_boundaries)
+            # the interpretations are produced in the same order every time
+            for _ in range(len(found)):
+                next(interpretations)
+            for interpretation in interpretations:
+                frozen = _freeze(interpretation)
+                found.append(frozen)
+                yield _thaw(frozen)
+            complete = True
+        finally:
+            if complete or len(found) > len(cached.interpretations):
+                self.cache.put(
+                    grascii,
+                    preserve_boundaries,
+                    CachedInterpretations(tuple(found), complete),
+                )
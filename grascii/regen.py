@@ -11,12 +11,13 @@ from re import Pattern
 from typing import TYPE_CHECKING
 
 from grascii import grammar
-from grascii.similarities import get_similar
+from grascii.similarities import get_similarity_matrix
 
 if TYPE_CHECKING:
     from collections.abc import Iterable
 
     from grascii.interpreter import Interpretation
+    from grascii.similarities import SimilarityMatrix
 
 
 class SearchMode(Enum):
@@ -47,12 +48,15 @@ class RegexBuilder:
     :param aspirate_mode: How to handle annotations in the search.
     :param disjoiner_mode: How to handle annotations in the search.
     :param fix_first: Apply an uncertainty of 0 to the first token.
+    :param similarity: The similarity graph used to find similar strokes.
+        Defaults to the graph of ``similarities.get_similarity_matrix``.
     :type uncertainty: int: 0, 1, or 2
     :type search_mode: str: one of regen.SearchMode values
     :type annotation_mode: one of regen.Strictness values
     :type aspirate_mode: one of regen.Strictness values
     :type disjoiner_mode: one of regen.Strictness values
     :type fix_first: bool
+    :type similarity: similarities.SimilarityMatrix
     """
 
     def __init__(self, **kwargs):
@@ -62,6 +66,9 @@ class RegexBuilder:
         self.annotation_mode = kwargs.get("annotation_mode", Strictness.LOW)
         self.aspirate_mode = kwargs.get("aspirate_mode", Strictness.LOW)
         self.disjoiner_mode = kwargs.get("disjoiner_mode", Strictness.HIGH)
+        self.similarity: SimilarityMatrix = (
+            kwargs.get("similarity") or get_similarity_matrix()
+        )
 
     def make_annotation_regex(self, stroke: str, annotations: Iterable[str]) -> str:
         """Create a regular expression that matches the stroke with
@@ -124,7 +131,7 @@ class RegexBuilder:
         :returns: A regular expression.
         """
 
-        similars = get_similar(stroke, uncertainty)
+        similars = self.similarity.get_similar(stroke, uncertainty)
         flattened = []
         for group in similars:
             for token in group:
@@ -294,9 +301,9 @@ class RegexBuilder:
                 if token[0] in grammar.HARD_CHARACTERS:
                     assert not isinstance(token, list)
                     if self.fix_first:
-                        strokes = get_similar(token, 0)
+                        strokes = self.similarity.get_similar(token, 0)
                     else:
-                        strokes = get_similar(token, self.uncertainty)
+                        strokes = self.similarity.get_similar(token, self.uncertainty)
                     flattened_strokes = []
                     for tup in strokes:
                         flattened_strokes += [s for s in tup]
@@ -305,6 +312,213 @@ class RegexBuilder:
 
         return letters
 
+    def get_stroke_alternatives(
+        self, interpretation: Interpretation
+    ) -> list[list[str]]:
+        """Get the strokes that may appear in place of each stroke of an
+        interpretation factoring in uncertainty.
+
+        :param interpretation: The interpretation for which to get strokes.
+        :returns: A list of alternative strokes for each stroke.
+        """
+
+        strokes = []
+        for token in interpretation:
+            if isinstance(token, str) and token in grammar.STROKES:
+                uncertainty = self.uncertainty if strokes or not self.fix_first else 0
+                strokes.append(
+                    [
+                        stroke
+                        for group in self.similarity.get_similar(token, uncertainty)
+                        for stroke in group
+                    ]
+                )
+        return strokes
+
+    def get_annotation_variants(
+        self, stroke: str, annotations: Iterable[str] = ()
+    ) -> list[str]:
+        """Get every string of annotations that the regular expression created
+        by ``make_annotation_regex`` matches after the stroke.
+
+        :param stroke: The stroke for which to generate annotations.
+        :param annotations: A collection of annotations used in generating
+            the variants.
+        :returns: A list of annotation strings.
+        """
+
+        variants = [""]
+        for tup in grammar.ANNOTATIONS.get(stroke, list()):
+            options = [""] + list(tup)
+            if (
+                self.annotation_mode is Strictness.MEDIUM
+                or self.annotation_mode is Strictness.HIGH
+            ):
+                options = [""] if self.annotation_mode is Strictness.HIGH else options
+                for an in annotations:
+                    if an in tup:
+                        options = [an]
+                        break
+            variants = [v + option for v in variants for option in options]
+        return variants
+
+    def get_prefix_steps(self, interpretation: Interpretation) -> list[list[str]]:
+        """Get the literal strings that begin every grascii string matched by
+        the regular expression of an interpretation.
+
+        The result is a list of steps, each of which is a list of alternative
+        strings. Every match of the regular expression begins with the
+        concatenation of one alternative from each step in order. Only the
+        MATCH and START search modes anchor the matched grascii at the start
+        of the word, so no steps are produced for other search modes.
+
+        :param interpretation: The interpretation for which to generate steps.
+        :returns: A list of steps.
+        """
+
+        if self.search_mode is SearchMode.CONTAIN or self.search_mode is SearchMode.END:
+            return []
+
+        return [
+            [option for option, _ in step]
+            for step in self.get_weighted_steps(interpretation)
+        ]
+
+    def get_weighted_steps(
+        self, interpretation: Interpretation, whole: bool = False
+    ) -> list[list[tuple[str, int]]]:
+        """Get the literal strings that begin the matched grascii of every
+        match of the regular expression of an interpretation, along with the
+        similarity distance of each alternative stroke from the stroke of the
+        interpretation it replaces.
+
+        The steps are those of ``get_prefix_steps``, except that each
+        alternative is paired with a cost. Strokes cost their distance in the
+        similarity graph, and all other alternatives cost nothing. In the
+        CONTAIN and END search modes, the steps begin the matched grascii
+        wherever it starts in the word.
+
+        :param interpretation: The interpretation for which to generate steps.
+        :param whole: Also add the steps for the aspirates and disjoiner that
+            may end the word in the MATCH search mode, so that the steps make
+            up the whole matched grascii.
+        :returns: A list of steps of alternatives and their costs.
+        """
+
+        aspirate = grammar.ASPIRATE
+        disjoiner = grammar.DISJOINER
+
+        steps: list[list[tuple[str, int]]] = []
+        # the aspirates and disjoiners retained since the last stroke
+        retained: list[str] = []
+        disjoiner_count = 0
+        i = 0
+        if self.search_mode is SearchMode.MATCH or self.search_mode is SearchMode.START:
+            if self.aspirate_mode is Strictness.LOW:
+                steps.append([("", 0), (aspirate, 0), (aspirate * 2, 0)])
+            elif self.aspirate_mode is Strictness.MEDIUM:
+                while i < len(interpretation) and interpretation[i] == aspirate:
+                    i += 1
+                steps.append([(aspirate * n, 0) for n in range(i, max(i, 2) + 1)])
+                if i >= 2:
+                    retained = [aspirate] * i
+
+        found_first = False
+
+        while i < len(interpretation):
+            token = interpretation[i]
+
+            if token == aspirate:
+                if (
+                    self.aspirate_mode is Strictness.MEDIUM
+                    or self.aspirate_mode is Strictness.HIGH
+                ):
+                    steps.append([(aspirate, 0)])
+                    retained.append(aspirate)
+                i += 1
+                continue
+
+            if token == disjoiner:
+                if (
+                    self.disjoiner_mode is Strictness.MEDIUM
+                    or self.disjoiner_mode is Strictness.HIGH
+                ):
+                    steps.append([(disjoiner, 0)])
+                    retained.append(disjoiner)
+                disjoiner_count += 1
+                i += 1
+                continue
+
+            assert not isinstance(token, list)
+            uncertainty = self.uncertainty if found_first or not self.fix_first else 0
+            last_retained = retained[-1] if retained else None
+            if found_first:
+                separators = [""]
+                if self.disjoiner_mode is Strictness.LOW or (
+                    self.disjoiner_mode is Strictness.MEDIUM
+                    and last_retained != disjoiner
+                ):
+                    separators = ["", disjoiner]
+                if self.aspirate_mode is Strictness.LOW or (
+                    self.aspirate_mode is Strictness.MEDIUM
+                    and last_retained != aspirate
+                ):
+                    separators = [s + a for s in separators for a in ("", aspirate)]
+                if len(separators) > 1:
+                    steps.append([(separator, 0) for separator in separators])
+            found_first = True
+
+            annotations: Iterable[str] = ()
+            if (
+                token in grammar.ANNOTATIONS
+                and i + 1 < len(interpretation)
+                and isinstance(interpretation[i + 1], list)
+            ):
+                annotations = interpretation[i + 1]
+                i += 1
+
+            alternatives = []
+            for stroke, cost in self._weighted_similar(token, uncertainty):
+                alternatives += [
+                    (stroke + variant, cost)
+                    for variant in self.get_annotation_variants(stroke, annotations)
+                ]
+            steps.append(alternatives)
+            retained = []
+            i += 1
+
+        if whole and self.search_mode is SearchMode.MATCH:
+            last_retained = retained[-1] if retained else None
+            if (
+                self.aspirate_mode is Strictness.LOW
+                or self.aspirate_mode is Strictness.MEDIUM
+            ):
+                if last_retained != aspirate:
+                    steps.append([("", 0), (aspirate, 0), (aspirate * 2, 0)])
+                elif retained[-2:-1] != [aspirate]:
+                    steps.append([("", 0), (aspirate, 0)])
+            if self.disjoiner_mode is Strictness.LOW or (
+                self.disjoiner_mode is Strictness.MEDIUM
+                and disjoiner_count < 3
+                and last_retained != disjoiner
+            ):
+                steps.append([("", 0), (disjoiner, 0)])
+
+        return steps
+
+    def _weighted_similar(self, stroke: str, uncertainty: int) -> list[tuple[str, int]]:
+        """Get the strokes within an uncertainty of a stroke and their
+        distances from it, nearest first and then in alphabetical order.
+        """
+
+        weighted = []
+        for group in self.similarity.get_similar(stroke, uncertainty):
+            for similar in group:
+                distance = self.similarity.distance(stroke, similar)
+                if distance is not None:
+                    weighted.append((similar, distance))
+        return sorted(weighted, key=lambda item: (item[1], item[0]))
+
     def generate_patterns_map(
         self, interpretations: list[Interpretation]
     ) -> list[tuple[Interpretation, Pattern]]:
@@ -322,3 +536,42 @@ class RegexBuilder:
             regex = self.build_regex(interp)
             patterns.append((interp, re.compile(regex)))
         return patterns
+
+    def generate_combined_pattern(
+        self, interpretations: list[Interpretation]
+    ) -> Pattern:
+        """Generate a single compiled regular expression that matches a line if
+        the pattern of any of the interpretations matches it. See
+        ``combine_regexes``.
+
+        :param interpretations: A list of interpretations to generate a
+            pattern for.
+        :returns: A compiled Pattern.
+        """
+
+        return re.compile(
+            combine_regexes(self.build_regex(interp) for interp in interpretations)
+        )
+
+
+def combine_regexes(regexes: Iterable[str]) -> str:
+    """Combine regular expressions created by ``RegexBuilder.build_regex`` into
+    one that matches a line if any of them does, so that a line can be checked
+    against all of them in one scan.
+
+    The groups of the combined regular expression do not correspond to those of
+    the given regular expressions, so lines it matches must be matched again
+    with the original patterns to compute metrics. Combined regular
+    expressions can be combined again.
+
+    :param regexes: An iterable of regular expressions.
+    :returns: A regular expression.
+    """
+
+    alternatives = []
+    for regex in regexes:
+        # every regex is anchored to the start of the line
+        assert regex.startswith("^")
+        body = regex[1:].replace("(?P<matched_grascii>", "(")
+        alternatives.append("(?:" + body + ")")
+    return "^(?:" + "|".join(alternatives) + ")"
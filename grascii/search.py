@@ -9,6 +9,7 @@ from __future__ import annotations
 
 import argparse
 import sys
+from itertools import islice
 from typing import TYPE_CHECKING, overload
 
 from grascii import regen
@@ -23,6 +24,7 @@ from grascii.searchers import (
     SearcherOptions,
     SearchResult,
 )
+from grascii.similarities import get_similarity_matrix
 
 if TYPE_CHECKING:
     from collections.abc import Iterable
@@ -67,6 +69,11 @@ def build_argparser(argparser: argparse.ArgumentParser) -> None:
         choices=range(3),
         help="the uncertainty of the search term",
     )
+    argparser.add_argument(
+        "--uncertainty-budget",
+        type=_uncertainty_budget,
+        help="the greatest total uncertainty of the strokes of the search term",
+    )
     argparser.add_argument(
         "-s",
         "--search-mode",
@@ -97,6 +104,16 @@ def build_argparser(argparser: argparse.ArgumentParser) -> None:
         choices=["best", "all"],
         help="how to handle ambiguous grascii strings",
     )
+    argparser.add_argument(
+        "--max-interpretations",
+        type=_non_negative_int,
+        help="search for at most the given number of interpretations",
+    )
+    argparser.add_argument(
+        "--interpretation-time-limit",
+        type=_non_negative_float,
+        help="the number of seconds to spend finding interpretations",
+    )
     argparser.add_argument(
         "-f",
         "--fix-first",
@@ -120,6 +137,34 @@ def build_argparser(argparser: argparse.ArgumentParser) -> None:
         action="store_true",
         help="do not sort the search results",
     )
+    argparser.add_argument(
+        "-l",
+        "--limit",
+        type=_non_negative_int,
+        help="show at most the given number of the best search results",
+    )
+
+
+def _non_negative_int(value: str) -> int:
+    number = int(value)
+    if number < 0:
+        raise argparse.ArgumentTypeError(f"{value} is negative")
+    return number
+
+
+def _uncertainty_budget(value: str) -> int:
+    number = _non_negative_int(value)
+    max_distance = get_similarity_matrix().max_distance
+    if number > max_distance:
+        raise argparse.ArgumentTypeError(f"{value} is greater than {max_distance}")
+    return number
+
+
+def _non_negative_float(value: str) -> float:
+    number = float(value)
+    if not number >= 0:
+        raise argparse.ArgumentTypeError(f"{value} is not a non-negative number")
+    return number
 
 
 class GrasciiSearchOptionsCombined(GrasciiSearchOptions, SearcherOptions):
@@ -152,6 +197,8 @@ def search(**kwargs) -> Iterable[SearchResult] | None:
     :param interactive: A flag enabling an interactive search.
     :param reverse: A word to search for in the dictionary.
     :param regexp: A regular expression to use in a search.
+    :param limit: The maximum number of results to return. When the results
+        are sorted, only the best results are returned.
 
     :returns: An iterable of search results, or ``None`` if run in interactive mode
     """
@@ -169,7 +216,11 @@ def search(**kwargs) -> Iterable[SearchResult] | None:
     else:
         searcher = RegexSearcher(**kwargs)
     if kwargs.get("no_sort"):
-        return searcher.search(**kwargs)
+        results = searcher.search(**kwargs)
+        limit = kwargs.get("limit")
+        if results is not None and limit is not None:
+            return islice(results, limit)
+        return results
     return searcher.sorted_search(**kwargs)
 
 
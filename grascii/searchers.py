@@ -5,35 +5,80 @@ implementations of it.
 
 from __future__ import annotations
 
+import asyncio
+import heapq
+import multiprocessing
+import os
 import re
+import threading
 from abc import ABC, abstractmethod
+from bisect import insort
+from collections import deque
+from concurrent.futures import (
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+)
+from enum import Enum
+from functools import cached_property, partial
+from operator import methodcaller
 from re import Match, Pattern
 from typing import (
     TYPE_CHECKING,
     Any,
     Generic,
     Literal,
+    NamedTuple,
     TypedDict,
     TypeVar,
 )
 
 from grascii import defaults, grammar, metrics, regen
 from grascii.dictionary import Dictionary, DictionaryEntry
-from grascii.interpreter import Interpretation
-from grascii.parser import GrasciiParser
+from grascii.dictionary.shards import in_ranges, merge_ranges, to_ranges
+from grascii.dictionary.trie import GrasciiTrie
+from grascii.interpreter import (
+    GrasciiInterpreter,
+    Interpretation,
+    collect_interpretations,
+)
+from grascii.similarities import get_similarity_matrix
+
+IT = TypeVar("IT")
 
 if TYPE_CHECKING:
     import sys
-    from collections.abc import Callable, Iterable, Sequence
+    from collections.abc import (
+        AsyncIterator,
+        Callable,
+        Iterable,
+        Iterator,
+        Sequence,
+    )
 
     if sys.version_info >= (3, 11):
         from typing import Unpack
     else:
         from typing_extensions import Unpack
 
+    from grascii.dictionary.index import NgramIndex, WordIndex
+    from grascii.dictionary.shards import Range, ShardMatch
+    from grascii.dictionary.store import Shard
     from grascii.metrics import Comparable
+    from grascii.parser import GrasciiParser
+    from grascii.similarities import SimilarityMatrix
 
-IT = TypeVar("IT")
+    RangeFinder = Callable[[Dictionary, str, Shard], list[Range] | None]
+    Index = TypeVar("Index", NgramIndex, WordIndex)
+
+
+_interpreter = GrasciiInterpreter()
+
+_PARSER_SPLITS = {"PNT", "PND", "JNT", "JND"}
+"""Strokes that ``GrasciiParser`` may read as P or J followed by NT or ND
+when they follow another letter, where ``GrasciiInterpreter`` reads them
+whole."""
 
 
 class SearchResult(Generic[IT]):
@@ -42,10 +87,42 @@ class SearchResult(Generic[IT]):
         matches: list[tuple[IT, Match[str]]],
         entry: DictionaryEntry,
         dictionary: Dictionary,
+        location: tuple[str, int] | None = None,
+        similarity: SimilarityMatrix | None = None,
     ) -> None:
         self.matches = matches
         self.entry = entry
         self.dictionary = dictionary
+        self.location = location
+        """The name of the dictionary file containing the entry and the index
+        of the entry in the file, if known."""
+        self.similarity = similarity
+        """The similarity graph the entry was found with, which metrics rank
+        the result with, or ``None`` for the graph of
+        ``similarities.get_similarity_matrix``."""
+
+    @cached_property
+    def interpretation(self) -> Interpretation | None:
+        """The canonical interpretation of the Grascii string of the entry, or
+        ``None`` if the string is not valid Grascii. The interpretation is read
+        from the stroke file of the dictionary if it has one and is only
+        computed otherwise."""
+
+        if self.location is not None:
+            name, index = self.location
+            strokes = self.dictionary.load_strokes(name)
+            if strokes is not None:
+                return strokes[index]
+        return _interpreter.interpret(self.entry.grascii)
+
+
+class SearchExecutor(Enum):
+    """An enum representing the ways a Searcher can scan the files of the
+    dictionaries it searches."""
+
+    SERIAL = "serial"
+    THREAD = "thread"
+    PROCESS = "process"
 
 
 class SearcherOptions(TypedDict, total=False):
@@ -54,20 +131,366 @@ class SearcherOptions(TypedDict, total=False):
     dictionaries: list[str]
     """The dictionaries to search"""
 
+    executor: SearchExecutor
+    """How to scan the files of the dictionaries"""
+
+    workers: int
+    """The number of threads or processes that scan files in parallel, or 0
+    to use the number of processors"""
+
+
+class SearchEngine(Enum):
+    """An enum representing the ways a GrasciiSearcher can find the entries
+    that begin with the searched strokes."""
+
+    REGEX = "regex"
+    TRIE = "trie"
+
+
+class GrasciiSearcherOptions(SearcherOptions, total=False):
+    """Options for GrasciiSearchers"""
+
+    engine: SearchEngine
+    """How to find the entries that begin with the searched strokes in match
+    and start searches"""
+
+    use_interpreter: bool
+    """Find the best interpretation of Grascii strings with
+    ``GrasciiInterpreter`` instead of ``GrasciiParser``"""
+
+    similarity: SimilarityMatrix
+    """The similarity graph used to find similar strokes and to rank results.
+    Defaults to the graph of the configured edition."""
+
+
+class _Smallest(Generic[IT]):
+    """The best results seen so far, which can be added to in several
+    batches. The key of each result is computed once. If the metric has a
+    bounded variant in ``metrics.BOUNDED_METRICS``, the key of each result is
+    only computed in full if it may be among the best keys found so far.
+
+    :param limit: The number of results to keep.
+    :param metric: The metric to sort by.
+    """
+
+    def __init__(
+        self, limit: int, metric: Callable[[SearchResult[IT]], Comparable]
+    ) -> None:
+        self.limit = limit
+        self.metric = metric
+        self._bounded = metrics.BOUNDED_METRICS.get(metric)
+        # the key and position of each result break ties by the order the
+        # results were added in
+        self._best: list[tuple[Comparable, int, SearchResult[IT]]] = []
+        self._count = 0
+
+    def add(self, results: Iterable[SearchResult[IT]]) -> None:
+        """Add results after all the results added before.
+
+        :param results: The results to choose from.
+        """
+
+        if self.limit <= 0:
+            return
+        best = self._best
+        for result in results:
+            index = self._count
+            self._count += 1
+            bound = best[-1][0] if len(best) == self.limit else None
+            if self._bounded is None:
+                key = self.metric(result)
+            else:
+                key = self._bounded(result, bound)
+                if key is None:
+                    continue
+            if bound is not None and not key < bound:
+                continue
+            insort(best, (key, index, result))
+            if len(best) > self.limit:
+                best.pop()
+
+    @property
+    def results(self) -> list[SearchResult[IT]]:
+        """The best results, sorted by the metric. Results with equal keys
+        keep their order."""
+        return [result for _, _, result in self._best]
+
+
+def _smallest(
+    limit: int,
+    results: Iterable[SearchResult[IT]],
+    metric: Callable[[SearchResult[IT]], Comparable],
+) -> list[SearchResult[IT]]:
+    """Find the best results like ``heapq.nsmallest``. See ``_Smallest``.
+
+    :param limit: The number of results to keep.
+    :param results: The results to choose from.
+    :param metric: The metric to sort by.
+    :returns: The best results, sorted by the metric. Results with equal keys
+        keep their order.
+    """
+
+    if metrics.BOUNDED_METRICS.get(metric) is None:
+        return heapq.nsmallest(limit, results, key=metric)
+    smallest = _Smallest(limit, metric)
+    smallest.add(results)
+    return smallest.results
+
+
+def _sorted(
+    results: Iterable[SearchResult[IT]],
+    metric: Callable[[SearchResult[IT]], Comparable],
+) -> list[SearchResult[IT]]:
+    """Sort results by a metric, computing the keys of all results at once
+    with ``metrics.score_many``.
+
+    :param results: The results to sort.
+    :param metric: The metric to sort by.
+    :returns: The sorted results. Results with equal keys keep their order.
+    """
+
+    results = list(results)
+    keys = metrics.score_many(metric, results)
+    order = sorted(range(len(results)), key=keys.__getitem__)
+    return [results[index] for index in order]
+
+
+_pools: dict[tuple[SearchExecutor, int], Executor] = {}
+_pools_lock = threading.Lock()
+
+
+def _get_pool(executor: SearchExecutor, workers: int) -> Executor:
+    """Get a pool of workers shared by all searchers with the same executor
+    and number of workers.
+
+    :param executor: A parallel SearchExecutor.
+    :param workers: The number of workers in the pool.
+    :returns: A thread or process pool.
+    """
+
+    with _pools_lock:
+        pool = _pools.get((executor, workers))
+        if pool is None:
+            if executor is SearchExecutor.PROCESS:
+                # workers are started the same way on every platform, rather
+                # than forked from a process that may be running threads
+                pool = ProcessPoolExecutor(
+                    workers, mp_context=multiprocessing.get_context("spawn")
+                )
+            else:
+                pool = ThreadPoolExecutor(workers)
+            _pools[(executor, workers)] = pool
+        return pool
+
+
+def _scan_file(
+    dictionary: Dictionary,
+    name: str,
+    patterns: Sequence[tuple[IT, Pattern[str]]],
+    find_ranges: RangeFinder | None,
+    prefilter: Pattern[str] | None,
+) -> Iterable[ShardMatch[IT]]:
+    """Search a file of a dictionary.
+
+    :returns: An iterable over the matches of each matching entry.
+    """
+
+    try:
+        shard = dictionary.load(name)
+    except FileNotFoundError:
+        return []
+    ranges = None
+    if find_ranges is not None:
+        ranges = find_ranges(dictionary, name, shard)
+    return shard.search(patterns, ranges, prefilter)
+
+
+def _scan_file_in_process(
+    dictionary: Dictionary,
+    name: str,
+    patterns: Sequence[Pattern[str]],
+    find_ranges: RangeFinder | None,
+    prefilter: Pattern[str] | None,
+) -> list[tuple[int, str, DictionaryEntry, list[int]]]:
+    """Search a file of a dictionary in a worker process. Matches cannot be
+    sent between processes, so the matched line is returned for the matches
+    to be recreated.
+
+    :returns: A list of the index, line and entry of each matching entry and
+        the indices of the patterns that matched it.
+    """
+
+    scan = _scan_file(
+        dictionary, name, list(enumerate(patterns)), find_ranges, prefilter
+    )
+    return [
+        (index, dictionary.load(name).line(index), entry, [i for i, _ in matches])
+        for matches, entry, index in scan
+    ]
+
+
+def _scan_results(
+    dictionary: Dictionary,
+    name: str,
+    patterns: Sequence[tuple[IT, Pattern[str]]],
+    find_ranges: RangeFinder | None,
+    prefilter: Pattern[str] | None,
+) -> list[SearchResult[IT]]:
+    """Search a file of a dictionary.
+
+    :returns: A list of search results.
+    """
+
+    scan = _scan_file(dictionary, name, patterns, find_ranges, prefilter)
+    return [
+        SearchResult(matches, entry, dictionary, (name, index))
+        for matches, entry, index in scan
+    ]
+
+
+def _recreate_results(
+    dictionary: Dictionary,
+    name: str,
+    patterns: Sequence[tuple[IT, Pattern[str]]],
+    remote_scan: list[tuple[int, str, DictionaryEntry, list[int]]],
+) -> list[SearchResult[IT]]:
+    """Recreate the search results of a file searched in a worker process.
+
+    :param remote_scan: The return value of ``_scan_file_in_process``.
+    :returns: A list of search results.
+    """
+
+    results = []
+    for index, line, entry, matched in remote_scan:
+        matches = []
+        for i in matched:
+            interp, pattern = patterns[i]
+            match = pattern.search(line)
+            assert match is not None
+            matches.append((interp, match))
+        results.append(SearchResult(matches, entry, dictionary, (name, index)))
+    return results
+
+
+def _with_similarity(
+    results: Iterable[SearchResult[IT]], similarity: SimilarityMatrix | None
+) -> Iterator[SearchResult[IT]]:
+    """Record the similarity graph results were found with."""
+
+    for result in results:
+        result.similarity = similarity
+        yield result
+
+
+def _search_files(
+    dictionaries: Iterable[Dictionary],
+    patterns: Sequence[tuple[IT, Pattern[str]]],
+    starting_letters: Iterable[str],
+    find_ranges: RangeFinder | None,
+    prefilter: Pattern[str] | None,
+) -> Iterator[SearchResult[IT]]:
+    """Search the files of dictionaries one after another.
+
+    :returns: An iterator over the search results.
+    """
+
+    names = sorted(starting_letters)
+    for dictionary in dictionaries:
+        for name in names:
+            scan = _scan_file(dictionary, name, patterns, find_ranges, prefilter)
+            for matches, entry, index in scan:
+                yield SearchResult(matches, entry, dictionary, (name, index))
+
+
+class SearchPlan(Generic[IT]):
+    """A search prepared ahead of time, which can be executed repeatedly
+    against any dictionaries without preparing it again. Plans can be pickled
+    to execute them in other processes.
+
+    :param patterns: An iterable of interpretations and corresponding compiled
+        regular expression patterns.
+    :param starting_letters: The letters used to index the search in a Grascii
+        Dictionary.
+    :param find_ranges: A function that narrows the search of a dictionary
+        file to ranges of its entries, or returns ``None`` to search the whole
+        file.
+    :param prefilter: A pattern that matches every line matched by any of the
+        patterns.
+    :param query: The query the plan was prepared from, if any.
+    :param similarity: The similarity graph the patterns were made with,
+        which is recorded in the results to rank them, if any.
+    """
+
+    def __init__(
+        self,
+        patterns: Iterable[tuple[IT, Pattern[str]]],
+        starting_letters: Iterable[str],
+        find_ranges: RangeFinder | None = None,
+        prefilter: Pattern[str] | None = None,
+        query: GrasciiQuery | None = None,
+        similarity: SimilarityMatrix | None = None,
+    ) -> None:
+        self.patterns = list(patterns)
+        self.starting_letters = frozenset(starting_letters)
+        self.find_ranges = find_ranges
+        # a single pattern needs no prefilter, but it is kept so that the
+        # plan can be combined with others in a batch search
+        self.prefilter = prefilter
+        self.query = query
+        self.similarity = similarity
+
+    @property
+    def interpretations(self) -> list[IT]:
+        """The interpretations searched for."""
+        return [interp for interp, _ in self.patterns]
+
+    def execute(self, dictionaries: Iterable[Dictionary]) -> Iterator[SearchResult[IT]]:
+        """Execute the plan, searching the files of the dictionaries one after
+        another.
+
+        :param dictionaries: The dictionaries to search.
+        :returns: An iterator over the search results.
+        """
+
+        prefilter = self.prefilter if len(self.patterns) > 1 else None
+        results = _search_files(
+            dictionaries,
+            self.patterns,
+            self.starting_letters,
+            self.find_ranges,
+            prefilter,
+        )
+        return _with_similarity(results, self.similarity)
+
 
 class Searcher(ABC, Generic[IT]):
-    """An abstract base class for objects that search Grascii dictionaries."""
+    """An abstract base class for objects that search Grascii dictionaries.
+
+    The files of the dictionaries are scanned one after another by default.
+    With the thread or process executor, they are scanned in parallel by a
+    pool of workers, and the results are returned in the same order.
+    """
 
     def __init__(self, **kwargs: Unpack[SearcherOptions]) -> None:
         dictionaries = kwargs.get("dictionaries")
         if not dictionaries:
             dictionaries = defaults.SEARCH["Dictionary"].split()
         self.dictionaries = [Dictionary.new(name) for name in dictionaries]
+        try:
+            self.executor = SearchExecutor(
+                kwargs.get("executor", defaults.SEARCH["Executor"])
+            )
+        except ValueError:
+            self.executor = SearchExecutor(defaults.DEFAULTS["Search"]["Executor"])
+        workers = kwargs.get("workers", defaults.SEARCH.getint("Workers"))
+        self.workers = workers if workers > 0 else os.cpu_count() or 1
 
     def perform_search(
         self,
         patterns: Iterable[tuple[IT, Pattern[str]]],
         starting_letters: set[str],
+        find_ranges: RangeFinder | None = None,
+        prefilter: Pattern[str] | None = None,
     ) -> Iterable[SearchResult[IT]]:
         """Perform a search of a Grascii Dictionary.
 
@@ -75,25 +498,297 @@ class Searcher(ABC, Generic[IT]):
             regular expression patterns.
         :param starting_letters: A set of letters used to index the search in
             a Grascii Dictionary.
+        :param find_ranges: A function that narrows the search of a dictionary
+            file to ranges of its entries, or returns ``None`` to search the
+            whole file.
+        :param prefilter: A pattern that matches every line matched by any of
+            the patterns, such as one created by
+            ``RegexBuilder.generate_combined_pattern``. Only the lines it
+            matches are checked against each pattern.
         :returns: An iterable of search results
         """
+        patterns = list(patterns)
+        files = [
+            (dictionary, name)
+            for dictionary in self.dictionaries
+            for name in sorted(starting_letters)
+        ]
+
+        if self.executor is SearchExecutor.SERIAL:
+            yield from _search_files(
+                self.dictionaries, patterns, starting_letters, find_ranges, prefilter
+            )
+            return
+
+        pool = _get_pool(self.executor, self.workers)
+        remote_patterns = [pattern for _, pattern in patterns]
+
+        def submit(dictionary: Dictionary, name: str) -> Future:
+            if self.executor is SearchExecutor.PROCESS:
+                return pool.submit(
+                    _scan_file_in_process,
+                    dictionary,
+                    name,
+                    remote_patterns,
+                    find_ranges,
+                    prefilter,
+                )
+            return pool.submit(
+                _scan_results, dictionary, name, patterns, find_ranges, prefilter
+            )
+
+        # at most one file per worker is submitted ahead of the results being
+        # read, so files are not scanned for a search that is abandoned
+        remaining = iter(files)
+        pending: deque[tuple[Dictionary, str, Future]] = deque()
+        try:
+            while True:
+                while len(pending) < self.workers:
+                    file = next(remaining, None)
+                    if file is None:
+                        break
+                    pending.append((*file, submit(*file)))
+                if not pending:
+                    return
+                dictionary, name, future = pending.popleft()
+                scan = future.result()
+                if self.executor is SearchExecutor.PROCESS:
+                    scan = _recreate_results(dictionary, name, patterns, scan)
+                yield from scan
+        finally:
+            for _, _, future in pending:
+                future.cancel()
+
+    async def _ascan(
+        self,
+        patterns: Sequence[tuple[IT, Pattern[str]]],
+        starting_letters: set[str] | frozenset[str],
+        find_ranges: RangeFinder | None,
+        prefilter: Pattern[str] | None,
+    ) -> AsyncIterator[list[SearchResult[IT]]]:
+        """Search the files of the dictionaries in an executor without blocking
+        the event loop. Files are scanned one at a time with the serial
+        executor and up to ``workers`` at a time otherwise. When the iterator
+        is closed or its task is cancelled, files that have not been scanned
+        yet are never scanned.
+
+        :returns: An async iterator over the search results of each file in
+            the same order as ``perform_search``.
+        """
+
+        loop = asyncio.get_running_loop()
+        files = iter(
+            [
+                (dictionary, name)
+                for dictionary in self.dictionaries
+                for name in sorted(starting_letters)
+            ]
+        )
+        pool = None
+        window = 1
+        if self.executor is not SearchExecutor.SERIAL:
+            pool = _get_pool(self.executor, self.workers)
+            window = self.workers
+        remote_patterns = [pattern for _, pattern in patterns]
+
+        def submit(dictionary: Dictionary, name: str) -> asyncio.Future:
+            if self.executor is SearchExecutor.PROCESS:
+                return loop.run_in_executor(
+                    pool,
+                    _scan_file_in_process,
+                    dictionary,
+                    name,
+                    remote_patterns,
+                    find_ranges,
+                    prefilter,
+                )
+            return loop.run_in_executor(
+                pool, _scan_results, dictionary, name, patterns, find_ranges, prefilter
+            )
+
+        pending: deque[tuple[Dictionary, str, asyncio.Future]] = deque()
+        try:
+            while True:
+                while len(pending) < window:
+                    file = next(files, None)
+                    if file is None:
+                        break
+                    pending.append((*file, submit(*file)))
+                if not pending:
+                    return
+                dictionary, name, future = pending.popleft()
+                scan = await future
+                if self.executor is SearchExecutor.PROCESS:
+                    scan = _recreate_results(dictionary, name, patterns, scan)
+                yield scan
+        finally:
+            for _, _, future in pending:
+                future.cancel()
+
+    def execute(self, plan: SearchPlan[IT]) -> Iterable[SearchResult[IT]]:
+        """Execute a search plan against the dictionaries of the searcher.
+
+        :param plan: The plan to execute.
+        :returns: An iterable of search results.
+        """
+
+        prefilter = plan.prefilter if len(plan.patterns) > 1 else None
+        results = self.perform_search(
+            plan.patterns, plan.starting_letters, plan.find_ranges, prefilter
+        )
+        return _with_similarity(results, plan.similarity)
+
+    def plan(self, **kwargs: Any) -> SearchPlan[IT]:
+        """Prepare a search with the given search options.
+
+        :returns: A search plan.
+        :raises NotImplementedError: If the searcher cannot prepare searches.
+        """
+        raise NotImplementedError
+
+    async def asearch(self, **kwargs: Any) -> AsyncIterator[SearchResult[IT]]:
+        """Run a search with the given search options without blocking the
+        event loop. The search is prepared and the dictionary files are
+        scanned in an executor.
+
+        The search stops scanning files when the iterator is closed or the
+        task iterating it is cancelled.
+
+        :returns: An async iterator over the search results, in the same order
+            as the results of ``search``.
+        """
+
+        loop = asyncio.get_running_loop()
+        plan = await loop.run_in_executor(None, partial(self.plan, **kwargs))
+        prefilter = plan.prefilter if len(plan.patterns) > 1 else None
+        scans = self._ascan(
+            plan.patterns, plan.starting_letters, plan.find_ranges, prefilter
+        )
+        try:
+            async for scan in scans:
+                for result in scan:
+                    result.similarity = plan.similarity
+                    yield result
+        finally:
+            await scans.aclose()
+
+    async def asorted_search(
+        self,
+        metric: Callable[[SearchResult[IT]], Comparable] = metrics.trivial,
+        limit: int | None = None,
+        **kwargs: Any,
+    ) -> list[SearchResult[IT]]:
+        """Run a search with the given search options without blocking the
+        event loop, and sort the search results by the given metric.
+
+        :param limit: The maximum number of results to return. Only the best
+            results are kept while searching.
+        """
+
+        loop = asyncio.get_running_loop()
+        plan = await loop.run_in_executor(None, partial(self.plan, **kwargs))
+        prefilter = plan.prefilter if len(plan.patterns) > 1 else None
+        scans = self._ascan(
+            plan.patterns, plan.starting_letters, plan.find_ranges, prefilter
+        )
+        results: list[SearchResult[IT]] = []
+        # the best results are kept across files, so the key of each result
+        # is computed at most once
+        smallest = _Smallest(limit, metric) if limit is not None else None
+        try:
+            async for scan in scans:
+                for result in scan:
+                    result.similarity = plan.similarity
+                if smallest is not None:
+                    smallest.add(scan)
+                else:
+                    results += scan
+        finally:
+            await scans.aclose()
+        if smallest is not None:
+            return smallest.results
+        return _sorted(results, metric)
+
+    def perform_batch_search(
+        self,
+        plans: Sequence[SearchPlan[IT]],
+    ) -> Iterator[tuple[int, SearchResult[IT]]]:
+        """Perform several searches of a Grascii Dictionary at once. Each
+        dictionary file is loaded and scanned once, testing the patterns of
+        every plan whose starting letters include the file.
+
+        The results of each plan are the same and in the same order as if
+        the plan was passed to ``execute``. The files are scanned one after
+        another in the calling thread, whatever the executor of the searcher.
+
+        :param plans: A sequence of search plans. If every plan has a
+            prefilter created by ``RegexBuilder.generate_combined_pattern``,
+            the prefilters are combined so that each line is scanned once for
+            all plans.
+        :returns: An iterator over the index of the plan that produced each
+            result and the result.
+        """
+        tagged = [
+            [((i, interp), pattern) for interp, pattern in plan.patterns]
+            for i, plan in enumerate(plans)
+        ]
+        letters = set().union(*(plan.starting_letters for plan in plans))
+        prefilters: dict[tuple[int, ...], Pattern[str] | None] = {}
         for dictionary in self.dictionaries:
-            for item in sorted(starting_letters):
+            for item in sorted(letters):
+                relevant = [
+                    i for i, plan in enumerate(plans) if item in plan.starting_letters
+                ]
+                if not relevant:
+                    continue
                 try:
-                    dict_file = dictionary.open(item)
+                    shard = dictionary.load(item)
                 except FileNotFoundError:
                     continue
-                with dict_file:
-                    for line in dict_file:
-                        matches = []
-                        for interp, pattern in patterns:
-                            match = pattern.search(line)
-                            if match:
-                                matches.append((interp, match))
-                        if matches:
-                            grascii, translation = line.strip().split(maxsplit=1)
-                            entry = DictionaryEntry(grascii, translation)
-                            yield SearchResult(matches, entry, dictionary)
+                # the union of the ranges of all queries is searched, and the
+                # matches of each query are kept only within its own ranges
+                plan_ranges: dict[int, list[Range] | None] = {}
+                for i in relevant:
+                    find_ranges = plans[i].find_ranges
+                    found = (
+                        find_ranges(dictionary, item, shard)
+                        if find_ranges is not None
+                        else None
+                    )
+                    plan_ranges[i] = merge_ranges(found) if found is not None else None
+                ranges = None
+                if all(found is not None for found in plan_ranges.values()):
+                    ranges = merge_ranges(
+                        r for found in plan_ranges.values() if found for r in found
+                    )
+                patterns = [p for i in relevant for p in tagged[i]]
+                key = tuple(relevant)
+                if key not in prefilters:
+                    parts = [plans[i].prefilter for i in relevant]
+                    prefilters[key] = (
+                        re.compile(regen.combine_regexes(p.pattern for p in parts))
+                        if len(patterns) > 1 and all(parts)
+                        else None
+                    )
+                for matches, entry, index in shard.search(
+                    patterns, ranges, prefilters[key]
+                ):
+                    by_query: dict[int, list[tuple[IT, Match[str]]]] = {}
+                    for (i, interp), match in matches:
+                        found = plan_ranges[i]
+                        if found is None or in_ranges(found, index):
+                            by_query.setdefault(i, []).append((interp, match))
+                    for i, query_matches in by_query.items():
+                        yield (
+                            i,
+                            SearchResult(
+                                query_matches,
+                                entry,
+                                dictionary,
+                                (item, index),
+                                plans[i].similarity,
+                            ),
+                        )
 
     @abstractmethod
     def search(self, **kwargs) -> Iterable[SearchResult[IT]] | None:
@@ -104,15 +799,22 @@ class Searcher(ABC, Generic[IT]):
     def sorted_search(
         self,
         metric: Callable[[SearchResult[IT]], Comparable] = metrics.trivial,
+        limit: int | None = None,
         **kwargs: Any,
     ) -> Sequence[SearchResult[IT]] | None:
         """Run a search with the given args and sort the search results by the
         given metric.
+
+        :param limit: The maximum number of results to return. Only the best
+            results are kept while searching, so results that would be
+            discarded are never collected.
         """
 
         search_results = self.search(**kwargs)
         if search_results:
-            return sorted(search_results, key=lambda r: metric(r))
+            if limit is not None:
+                return _smallest(limit, search_results, metric)
+            return _sorted(search_results, metric)
         return []
 
 
@@ -140,57 +842,321 @@ class GrasciiSearchOptions(TypedDict, total=False):
     interpretation: Literal["best", "all"]
     """How to handle ambiguous grascii strings."""
 
+    max_interpretations: int
+    """The maximum number of interpretations to search for when searching for
+    all of them, or 0 for no limit."""
 
-class GrasciiSearcher(Searcher[Interpretation]):
-    """A subclass of Searcher that performs a search given a Grascii string."""
+    interpretation_time_limit: float
+    """The number of seconds to spend finding the interpretations to search
+    for when searching for all of them, or 0 for no limit."""
 
-    def __init__(self, **kwargs: Unpack[SearcherOptions]) -> None:
-        super().__init__(**kwargs)
-        self._parser = GrasciiParser()
+    uncertainty_budget: int | None
+    """The greatest total similarity distance of the strokes that replace
+    the strokes of the grascii string, at most the greatest distance in the
+    similarity graph, or ``None`` to apply the uncertainty to each stroke
+    instead."""
 
-    def _extract_search_args(self, **kwargs: Unpack[GrasciiSearchOptions]) -> None:
-        """Get the relevant arguments for search."""
 
-        self.uncertainty = kwargs.get(
-            "uncertainty", defaults.SEARCH.getint("Uncertainty")
-        )
+class GrasciiQuery(NamedTuple):
+    """An immutable search for a Grascii string with all of its options
+    resolved. A query holds all of the state of a search, so a single
+    ``GrasciiSearcher`` can run several queries at the same time."""
+
+    grascii: str
+    """The grascii string to use in the search."""
+
+    uncertainty: int
+    """The uncertainty of the grascii string."""
+
+    search_mode: regen.SearchMode
+    """The search mode to use."""
+
+    annotation_mode: regen.Strictness
+    """How to handle annotations in the search."""
+
+    aspirate_mode: regen.Strictness
+    """How to handle aspirates in the search."""
+
+    disjoiner_mode: regen.Strictness
+    """How to handle disjoiners in the search."""
+
+    fix_first: bool
+    """Apply an uncertainty of 0 to the first token."""
+
+    interpretation: str
+    """How to handle ambiguous grascii strings."""
+
+    max_interpretations: int = 0
+    """The maximum number of interpretations to search for when searching for
+    all of them, or 0 for no limit."""
+
+    interpretation_time_limit: float = 0
+    """The number of seconds to spend finding the interpretations to search
+    for when searching for all of them, or 0 for no limit."""
+
+    uncertainty_budget: int | None = None
+    """The greatest total similarity distance of the strokes that replace
+    the strokes of the grascii string, at most the greatest distance in the
+    similarity graph, or ``None`` to apply the uncertainty to each stroke
+    instead."""
+
+    @classmethod
+    def create(
+        cls, grascii: str, **kwargs: Unpack[GrasciiSearchOptions]
+    ) -> GrasciiQuery:
+        """Create a query, filling in missing options from the configuration.
+
+        :param grascii: The grascii string to use in the search.
+        :returns: A new query.
+        :raises ValueError: If the uncertainty budget is negative or greater
+            than the greatest distance in the similarity graph.
+        """
+
+        budget = kwargs.get("uncertainty_budget")
+        if budget is not None:
+            if budget < 0:
+                raise ValueError(f"uncertainty budget {budget} is negative")
+            max_distance = get_similarity_matrix().max_distance
+            if budget > max_distance:
+                raise ValueError(
+                    f"uncertainty budget {budget} is greater than the greatest"
+                    f" distance in the similarity graph, {max_distance}"
+                )
+        uncertainty = kwargs.get("uncertainty", defaults.SEARCH.getint("Uncertainty"))
         # handle enum conversion error?
         try:
-            self.search_mode = regen.SearchMode(
+            search_mode = regen.SearchMode(
                 kwargs.get("search_mode", defaults.SEARCH["SearchMode"])
             )
         except ValueError:
-            self.search_mode = regen.SearchMode(
-                defaults.DEFAULTS["Search"]["SearchMode"]
-            )
+            search_mode = regen.SearchMode(defaults.DEFAULTS["Search"]["SearchMode"])
         try:
-            self.annotation_mode = regen.Strictness(
+            annotation_mode = regen.Strictness(
                 kwargs.get("annotation_mode", defaults.SEARCH["AnnotationMode"])
             )
         except ValueError:
-            self.annotation_mode = regen.Strictness(
+            annotation_mode = regen.Strictness(
                 defaults.DEFAULTS["Search"]["AnnotationMode"]
             )
         try:
-            self.aspirate_mode = regen.Strictness(
+            aspirate_mode = regen.Strictness(
                 kwargs.get("aspirate_mode", defaults.SEARCH["AspirateMode"])
             )
         except ValueError:
-            self.aspirate_mode = regen.Strictness(
+            aspirate_mode = regen.Strictness(
                 defaults.DEFAULTS["Search"]["AspirateMode"]
             )
         try:
-            self.disjoiner_mode = regen.Strictness(
+            disjoiner_mode = regen.Strictness(
                 kwargs.get("disjoiner_mode", defaults.SEARCH["DisjoinerMode"])
             )
         except ValueError:
-            self.disjoiner_mode = regen.Strictness(
+            disjoiner_mode = regen.Strictness(
                 defaults.DEFAULTS["Search"]["DisjoinerMode"]
             )
-        self.fix_first = kwargs.get("fix_first", False)
-        self.interpretation_mode = kwargs.get(
-            "interpretation", defaults.SEARCH["Interpretation"]
+        return cls(
+            grascii=grascii.upper(),
+            uncertainty=uncertainty,
+            search_mode=search_mode,
+            annotation_mode=annotation_mode,
+            aspirate_mode=aspirate_mode,
+            disjoiner_mode=disjoiner_mode,
+            fix_first=kwargs.get("fix_first", False),
+            interpretation=kwargs.get(
+                "interpretation", defaults.SEARCH["Interpretation"]
+            ),
+            max_interpretations=kwargs.get(
+                "max_interpretations", defaults.SEARCH.getint("MaxInterpretations")
+            ),
+            interpretation_time_limit=kwargs.get(
+                "interpretation_time_limit",
+                defaults.SEARCH.getfloat("InterpretationTimeLimit"),
+            ),
+            uncertainty_budget=budget,
+        )
+
+
+class _PrefixRangeFinder:
+    """Narrows the search of sorted dictionary files to the entries that begin
+    with a prefix made from the given steps.
+
+    :param prefix_steps: A list of steps for each interpretation, as created
+        by ``RegexBuilder.get_prefix_steps``.
+    """
+
+    def __init__(self, prefix_steps: Sequence[Sequence[Sequence[str]]]) -> None:
+        self.prefix_steps = prefix_steps
+
+    def __call__(
+        self, dictionary: Dictionary, name: str, shard: Shard
+    ) -> list[Range] | None:
+        return shard.find_ranges(self.prefix_steps)
+
+
+class _TrieRangeFinder:
+    """Narrows the search of dictionary files to the entries found by walking
+    a trie of each file with the given steps.
+
+    :param prefix_steps: A list of steps for each interpretation, as created
+        by ``RegexBuilder.get_prefix_steps``.
+    """
+
+    def __init__(self, prefix_steps: Sequence[Sequence[Sequence[str]]]) -> None:
+        self.prefix_steps = prefix_steps
+
+    def __call__(
+        self, dictionary: Dictionary, name: str, shard: Shard
+    ) -> list[Range] | None:
+        return to_ranges(shard.trie.find(self.prefix_steps))
+
+
+class _BudgetRangeFinder:
+    """Narrows the search of dictionary files to the entries found by walking
+    a trie of each file with weighted steps within an uncertainty budget.
+
+    :param weighted_steps: A list of steps for each interpretation, as created
+        by ``RegexBuilder.get_weighted_steps``.
+    :param budget: The greatest total cost of the alternatives of the steps.
+    :param anywhere: Whether the steps may begin anywhere in a Grascii string
+        instead of at its start.
+    :param whole: Whether the steps must end at the end of a Grascii string.
+    :param prefilter: A pattern that matches every line within the budget.
+        When the steps may begin anywhere, it finds the candidates, and only
+        a trie of the candidates is walked.
+    """
+
+    def __init__(
+        self,
+        weighted_steps: Sequence[Sequence[Sequence[tuple[str, int]]]],
+        budget: int,
+        anywhere: bool,
+        whole: bool,
+        prefilter: Pattern[str],
+    ) -> None:
+        self.weighted_steps = weighted_steps
+        self.budget = budget
+        self.anywhere = anywhere
+        self.whole = whole
+        self.prefilter = prefilter
+
+    def __call__(
+        self, dictionary: Dictionary, name: str, shard: Shard
+    ) -> list[Range] | None:
+        if not self.anywhere:
+            return to_ranges(
+                shard.trie.find_within(
+                    self.weighted_steps, self.budget, whole=self.whole
+                )
+            )
+        # walking the steps from every node of the whole trie is slower than
+        # scanning the file for the candidates
+        candidates = [i for _, _, i in shard.search([(None, self.prefilter)])]
+        trie = GrasciiTrie(shard.keys[i] for i in candidates)
+        found = trie.find_within(
+            self.weighted_steps, self.budget, anywhere=True, whole=self.whole
         )
+        return to_ranges(candidates[i] for i in found)
+
+
+class _IndexRangeFinder:
+    """Narrows the search of dictionary files to the candidates found in an
+    index of each dictionary. The candidates are found once for each
+    dictionary, and may be looked up by several threads at once.
+
+    :param load_index: A function that loads the index of a dictionary.
+    :param find_candidates: A function that finds the candidates of a search
+        in an index.
+    """
+
+    def __init__(
+        self,
+        load_index: Callable[[Dictionary], Index | None],
+        find_candidates: Callable[[Index], dict[str, list[int]] | None],
+    ) -> None:
+        self.load_index = load_index
+        self.find_candidates = find_candidates
+        self._candidates: dict[
+            Dictionary, tuple[Index, dict[str, list[int]]] | None
+        ] = {}
+        self._lock = threading.Lock()
+
+    def __call__(
+        self, dictionary: Dictionary, name: str, shard: Shard
+    ) -> list[Range] | None:
+        with self._lock:
+            found_before = dictionary in self._candidates
+            cached = self._candidates.get(dictionary)
+        if not found_before:
+            # the index is searched without holding the lock, so threads
+            # scanning different dictionaries do not wait for each other
+            index = self.load_index(dictionary)
+            found = self.find_candidates(index) if index is not None else None
+            with self._lock:
+                cached = self._candidates.setdefault(
+                    dictionary, (index, found) if found is not None else None
+                )
+        if cached is None or not cached[0].is_current(name, shard):
+            return None
+        return to_ranges(cached[1].get(name, []))
+
+    def __getstate__(self) -> dict[str, Any]:
+        # the found candidates are not sent to other processes, and locks
+        # cannot be pickled
+        state = {**self.__dict__, "_candidates": {}}
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+
+class GrasciiSearcher(Searcher[Interpretation]):
+    """A subclass of Searcher that performs a search given a Grascii string.
+
+    With the regex engine, every entry of the files that may contain matches
+    is checked against the search patterns unless the files are sorted. With
+    the trie engine, match and start searches walk a trie of each file and
+    only check the entries that begin with the searched strokes.
+
+    With an ``uncertainty_budget``, a stroke may be replaced by any stroke
+    within the budget in the similarity graph, as long as the distances of
+    all replaced strokes add up to at most the budget. Every search mode then
+    walks a trie of each file, pruning the walk once the budget is spent, and
+    only checks the entries it finds.
+
+    With ``use_interpreter``, searches for the best interpretation use
+    ``GrasciiInterpreter``, which is faster than ``GrasciiParser`` and does not
+    import Lark. The interpreter reads ``PNT``, ``PND``, ``JNT`` and ``JND``
+    after another letter whole, where the parser may read ``P`` or ``J``
+    followed by ``NT`` or ``ND``, so strings with those strokes after their
+    first letter are interpreted with the parser to keep the results the
+    same. The parser is also used to find all interpretations and to describe
+    invalid Grascii strings.
+
+    A searcher keeps no state between searches. All of the options of a
+    search are held in a ``GrasciiQuery``, so one searcher may be shared by
+    several threads or tasks.
+    """
+
+    def __init__(self, **kwargs: Unpack[GrasciiSearcherOptions]) -> None:
+        super().__init__(**kwargs)
+        self.engine = SearchEngine(kwargs.get("engine", SearchEngine.REGEX))
+        self.use_interpreter = kwargs.get("use_interpreter", False)
+        self.similarity = kwargs.get("similarity") or get_similarity_matrix()
+        self._lazy_parser: GrasciiParser | None = None
+        self._parser_lock = threading.Lock()
+
+    @property
+    def _parser(self) -> GrasciiParser:
+        # lark is only imported when the parser is needed, and the parser is
+        # created once even if several threads search at the same time
+        with self._parser_lock:
+            if self._lazy_parser is None:
+                from grascii.parser import GrasciiParser
+
+                self._lazy_parser = GrasciiParser()
+            return self._lazy_parser
 
     def search(
         self, *, grascii: str, **kwargs: Unpack[GrasciiSearchOptions]
@@ -200,40 +1166,162 @@ class GrasciiSearcher(Searcher[Interpretation]):
         :returns: An iterable of search results.
         """
 
-        grascii = grascii.upper()
-        self._extract_search_args(**kwargs)
+        return self.search_query(GrasciiQuery.create(grascii, **kwargs))
 
-        interpretations = self._parser.interpret(grascii)
+    def search_query(
+        self, query: GrasciiQuery
+    ) -> Iterable[SearchResult[Interpretation]]:
+        """Search for a Grascii string using the options of a query.
 
-        builder = regen.RegexBuilder(
-            uncertainty=self.uncertainty,
-            search_mode=self.search_mode,
-            aspirate_mode=self.aspirate_mode,
-            annotation_mode=self.annotation_mode,
-            disjoiner_mode=self.disjoiner_mode,
-            fix_first=self.fix_first,
-        )
+        :param query: The query to search for.
+        :returns: An iterable of search results.
+        :raises InvalidGrascii: If the grascii string of the query is invalid.
+        """
+
+        return self.execute(self.plan_query(query))
+
+    def plan(
+        self, *, grascii: str, **kwargs: Unpack[GrasciiSearchOptions]
+    ) -> SearchPlan[Interpretation]:
+        """Prepare a search for a Grascii string. The plan can be executed
+        repeatedly with ``execute`` or ``SearchPlan.execute``.
+
+        :param grascii: The grascii string to use in the search.
+        :returns: A search plan.
+        :raises InvalidGrascii: If the grascii string is invalid.
+        """
+
+        return self.plan_query(GrasciiQuery.create(grascii, **kwargs))
+
+    def search_many(
+        self, queries: Iterable[str], **kwargs: Unpack[GrasciiSearchOptions]
+    ) -> Iterator[tuple[str, SearchResult[Interpretation]]]:
+        """Search for several Grascii strings with the same options at once.
+        Each dictionary file is scanned once for all of the strings instead of
+        once per string. Like ``perform_batch_search``, the files are scanned
+        one after another, whatever the executor of the searcher.
+
+        :param queries: The grascii strings to use in the search.
+        :returns: An iterator over the searched grascii string that produced
+            each result and the result. The results of each grascii string are
+            in the same order as the results of ``search``.
+        :raises InvalidGrascii: If any of the grascii strings is invalid.
+        """
+
+        queries = list(queries)
+        plans = [self.plan(grascii=grascii, **kwargs) for grascii in queries]
+        return ((queries[i], result) for i, result in self.perform_batch_search(plans))
+
+    def plan_query(self, query: GrasciiQuery) -> SearchPlan[Interpretation]:
+        """Prepare a search using the options of a query.
+
+        :param query: The query to prepare.
+        :returns: A search plan.
+        :raises InvalidGrascii: If the grascii string of the query is invalid.
+        """
+
+        if query.interpretation == "best" and self.use_interpreter:
+            interpretation = _interpreter.interpret(query.grascii)
+            if interpretation is None or any(
+                isinstance(token, str) and token in _PARSER_SPLITS
+                for token in interpretation[1:]
+            ):
+                # the parser explains why the string is invalid, and reads
+                # the strings the interpreter may read differently
+                interps = [next(self._parser.interpret(query.grascii))]
+            else:
+                interps = [interpretation]
+        elif query.interpretation == "best":
+            interps = [next(self._parser.interpret(query.grascii))]
+        else:
+            interps = collect_interpretations(
+                self._parser.interpret(query.grascii),
+                query.max_interpretations,
+                query.interpretation_time_limit,
+            )
+        return self._plan_interpretations(query, interps)
+
+    def _plan_interpretations(
+        self, query: GrasciiQuery, interps: list[Interpretation]
+    ) -> SearchPlan[Interpretation]:
+        """Prepare a search for the given interpretations of the grascii
+        string of a query using the options of the query.
+
+        :param query: The query to prepare.
+        :param interps: The interpretations to search for.
+        :returns: A search plan.
+        """
 
-        interps = (
-            [next(interpretations)]
-            if self.interpretation_mode == "best"
-            else list(interpretations)
+        budget = query.uncertainty_budget
+        builder = regen.RegexBuilder(
+            # with a budget, a single stroke may use all of it
+            uncertainty=query.uncertainty if budget is None else budget,
+            search_mode=query.search_mode,
+            aspirate_mode=query.aspirate_mode,
+            annotation_mode=query.annotation_mode,
+            disjoiner_mode=query.disjoiner_mode,
+            fix_first=query.fix_first,
+            similarity=self.similarity,
         )
         patterns = builder.generate_patterns_map(interps)
         starting_letters = builder.get_starting_letters(interps)
+        prefilter = builder.generate_combined_pattern(interps)
+        find_ranges: RangeFinder
+        if budget is not None:
+            # the regular expressions allow the whole budget for each stroke,
+            # so only the entries the walk finds within the budget are checked
+            anywhere = (
+                query.search_mode is regen.SearchMode.CONTAIN
+                or query.search_mode is regen.SearchMode.END
+            )
+            whole = (
+                query.search_mode is regen.SearchMode.MATCH
+                or query.search_mode is regen.SearchMode.END
+            )
+            steps = [builder.get_weighted_steps(interp, whole) for interp in interps]
+            find_ranges = _BudgetRangeFinder(steps, budget, anywhere, whole, prefilter)
+        elif (
+            query.search_mode is regen.SearchMode.MATCH
+            or query.search_mode is regen.SearchMode.START
+        ):
+            prefix_steps = [builder.get_prefix_steps(interp) for interp in interps]
+            if self.engine is SearchEngine.TRIE:
+                find_ranges = _TrieRangeFinder(prefix_steps)
+            else:
+                find_ranges = _PrefixRangeFinder(prefix_steps)
+        else:
+            strokes = [builder.get_stroke_alternatives(interp) for interp in interps]
+            find_ranges = _IndexRangeFinder(
+                Dictionary.load_ngram_index, methodcaller("find_candidates", strokes)
+            )
 
-        return self.perform_search(patterns, starting_letters)
+        return SearchPlan(
+            patterns, starting_letters, find_ranges, prefilter, query, self.similarity
+        )
 
     def sorted_search(
         self,
         metric: Callable[
             [SearchResult[Interpretation]], Comparable
         ] = metrics.grascii_standard,
+        limit: int | None = None,
         *,
         grascii: str,
         **kwargs: Unpack[GrasciiSearchOptions],
     ) -> Sequence[SearchResult[Interpretation]] | None:
-        return super().sorted_search(metric, grascii=grascii, **kwargs)
+        return super().sorted_search(metric, limit, grascii=grascii, **kwargs)
+
+    async def asorted_search(
+        self,
+        metric: Callable[
+            [SearchResult[Interpretation]], Comparable
+        ] = metrics.grascii_standard,
+        limit: int | None = None,
+        *,
+        grascii: str,
+        **kwargs: Unpack[GrasciiSearchOptions],
+    ) -> list[SearchResult[Interpretation]]:
+        return await super().asorted_search(metric, limit, grascii=grascii, **kwargs)
 
 
 class RegexSearcher(Searcher[str]):
@@ -250,11 +1338,19 @@ class RegexSearcher(Searcher[str]):
         :returns: An iterable of search results.
         """
 
+        return self.execute(self.plan(regexp=regexp))
+
+    def plan(self, *, regexp: str, **kwargs: Any) -> SearchPlan[str]:
+        """
+        :param regexp: A regular expression to use in a search.
+        :returns: A search plan.
+        """
+
         pattern = re.compile(regexp)
         patterns = [(pattern.pattern, pattern)]
 
         starting_letters = grammar.HARD_CHARACTERS
-        return self.perform_search(patterns, starting_letters)
+        return SearchPlan(patterns, starting_letters)
 
 
 class ReverseSearcher(RegexSearcher):
@@ -271,21 +1367,50 @@ class ReverseSearcher(RegexSearcher):
         :returns: An iterable of search results.
         """
 
+        return self.execute(self.plan(reverse=reverse))
+
+    def plan(self, *, reverse: str, **kwargs: Any) -> SearchPlan[str]:
+        """
+        :param reverse: A word to search for.
+        :returns: A search plan.
+        """
+
         escaped_word = re.escape(reverse)
         regexp = (
             r"(?i)(?P<grascii>.+?\s+)"
             + rf"(?P<translation>(.*(\s|-))?(?P<word>{escaped_word}).*)(\s|\Z)"
         )
 
-        return super().search(regexp=regexp, **kwargs)
+        pattern = re.compile(regexp)
+        patterns = [(pattern.pattern, pattern)]
+
+        # the word index narrows the search to entries with a translation
+        # containing a word that begins with the searched word
+        find_ranges = _IndexRangeFinder(
+            Dictionary.load_word_index, methodcaller("find_candidates", reverse)
+        )
+        return SearchPlan(patterns, grammar.HARD_CHARACTERS, find_ranges)
 
     def sorted_search(
         self,
         metric: Callable[
             [SearchResult[str]], Comparable
         ] = metrics.translation_standard,
+        limit: int | None = None,
         *,
         reverse: str,
         **kwargs: Any,
     ) -> Sequence[SearchResult[str]]:
-        return super().sorted_search(metric, reverse=reverse, **kwargs)
+        return super().sorted_search(metric, limit, reverse=reverse, **kwargs)
+
+    async def asorted_search(
+        self,
+        metric: Callable[
+            [SearchResult[str]], Comparable
+        ] = metrics.translation_standard,
+        limit: int | None = None,
+        *,
+        reverse: str,
+        **kwargs: Any,
+    ) -> list[SearchResult[str]]:
+        return await super().asorted_search(metric, limit, reverse=reverse, **kwargs)
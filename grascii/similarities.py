@@ -3,14 +3,21 @@
 from __future__ import annotations
 
 from functools import lru_cache
-from typing import TYPE_CHECKING, cast
+from typing import TYPE_CHECKING
+from xml.etree import ElementTree
 
-from grascii import grammar
+from grascii import defaults, grammar
+from grascii.config import ConfigPreset
 
 if TYPE_CHECKING:
-    from collections.abc import Hashable, Iterable
+    import os
+    from collections.abc import Iterable, Sequence
+    from xml.etree.ElementTree import Element
 
-_equiv_nodes: dict[str, tuple[str, ...]] = {
+Node = tuple[str, ...]
+"""A node of a similarity graph, which is a group of equivalent strokes."""
+
+_equiv_nodes: dict[str, Node] = {
     "S": ("S", "Z"),
     "Z": ("S", "Z"),
     "TD": ("TD", "DT", "DD"),
@@ -36,12 +43,12 @@ _equiv_nodes: dict[str, tuple[str, ...]] = {
 }
 
 
-def get_node(stroke: str) -> tuple[str, ...]:
+def get_node(stroke: str) -> Node:
     """Get a tuple of all strokes equivalent to the given stroke."""
     return _equiv_nodes.get(stroke, (stroke,))
 
 
-_disconnected_nodes: list[Hashable] = [
+_disconnected_nodes: list[Node] = [
     ("O",),
     ("U",),
     ("OE",),
@@ -93,93 +100,255 @@ _edges: list[tuple[str, str]] = [
     ("TH", "NT"),
 ]
 
-_trans_edges: list[tuple[Hashable, Hashable]] = [
+_trans_edges: list[tuple[Node, Node]] = [
     (get_node(edge[0]), get_node(edge[1])) for edge in _edges
 ]
 
 
-class _SimilarityGraph:
-    """Implements a basic graph with the capability of doing an n-layered
-    breadth-first search."""
+class InvalidSimilarityGraph(Exception):
+    """Exception raised when a similarity graph cannot be loaded."""
 
-    def __init__(self):
-        self.nodes = {}
 
-    def add_node(self, node: Hashable) -> None:
-        """Add a node to the graph.
+class SimilarityMatrix:
+    """The distances between every pair of nodes of a similarity graph.
 
-        :param node: An object that can be used as a dict key.
-        """
+    Each node of the graph is a group of equivalent strokes. Distances are
+    computed once, with a breadth-first search from each node, so looking up
+    the distance between two strokes or the strokes within a distance of a
+    stroke does not search the graph.
 
-        if node not in self.nodes:
-            self.nodes[node] = set()
+    Use ``SimilarityMatrix.from_edges`` or ``load_graphml`` to create a
+    matrix.
 
-    def add_edge(self, edge: tuple[Hashable, Hashable]) -> None:
-        """Add an edge to the graph. If either node does not exist
-        in the graph, it is added.
+    :param nodes: The groups of equivalent strokes.
+    :param distances: The distance between each pair of nodes, or ``None`` if
+        there is no path between them.
+    """
 
-        :param edge: Two objects that can be used as a dict key.
+    def __init__(
+        self,
+        nodes: Sequence[Node],
+        distances: Sequence[Sequence[int | None]],
+    ) -> None:
+        self.nodes = tuple(nodes)
+        self._node_indices = {
+            stroke: index for index, node in enumerate(self.nodes) for stroke in node
+        }
+        self._distances = [list(row) for row in distances]
+        self.max_distance = max(
+            (d for row in self._distances for d in row if d is not None), default=0
+        )
+        """The greatest distance between two connected nodes. Strokes within a
+        greater distance of a stroke are the same as within this distance."""
+        # distances are capped at max_distance, so there is at most one entry
+        # for each node and each distance up to it
+        self._similar: dict[tuple[int, int], set[Node]] = {}
+
+    @classmethod
+    def from_edges(
+        cls,
+        edges: Iterable[tuple[Node, Node]],
+        nodes: Iterable[Node] = (),
+    ) -> SimilarityMatrix:
+        """Compile an undirected similarity graph into a matrix.
+
+        :param edges: Pairs of groups of equivalent strokes.
+        :param nodes: Groups of equivalent strokes that may not be part of
+            any edge.
+        :returns: A new ``SimilarityMatrix``.
         """
 
-        assert len(edge) > 1
-        self.add_node(edge[0])
-        self.nodes[edge[0]].add(edge[1])
-        self.add_node(edge[1])
-        self.nodes[edge[1]].add(edge[0])
+        neighbors: dict[Node, set[Node]] = {}
+        for node1, node2 in edges:
+            neighbors.setdefault(node1, set()).add(node2)
+            neighbors.setdefault(node2, set()).add(node1)
+        for node in nodes:
+            neighbors.setdefault(node, set())
+
+        ordered = list(neighbors)
+        indices = {node: index for index, node in enumerate(ordered)}
+        distances: list[list[int | None]] = []
+        for source in ordered:
+            row: list[int | None] = [None] * len(ordered)
+            row[indices[source]] = 0
+            layer = [source]
+            distance = 0
+            while layer:
+                distance += 1
+                next_layer = []
+                for node in layer:
+                    for neighbor in neighbors[node]:
+                        if row[indices[neighbor]] is None:
+                            row[indices[neighbor]] = distance
+                            next_layer.append(neighbor)
+                layer = next_layer
+            distances.append(row)
+        return cls(ordered, distances)
+
+    def get_node(self, stroke: str) -> Node:
+        """Get a tuple of all strokes equivalent to the given stroke.
+
+        :param stroke: A stroke.
+        :returns: The node of the stroke, or a tuple of the stroke alone if it
+            is not in the graph.
+        """
 
-    def add_nodes(self, nodes: Iterable[Hashable]) -> None:
-        """Add a collection of nodes to the graph.
+        index = self._node_indices.get(stroke)
+        return (stroke,) if index is None else self.nodes[index]
 
-        :param nodes: A collection of objects that can be used as a dict key.
+    def distance(self, stroke1: str, stroke2: str) -> int | None:
+        """Get the distance between two strokes.
+
+        :param stroke1: A stroke.
+        :param stroke2: A second stroke.
+        :returns: The number of edges between the nodes of the strokes, or
+            ``None`` if there is no path between them.
         """
 
-        for node in nodes:
-            self.add_node(node)
+        index1 = self._node_indices.get(stroke1)
+        index2 = self._node_indices.get(stroke2)
+        if index1 is None or index2 is None:
+            return 0 if stroke1 == stroke2 else None
+        return self._distances[index1][index2]
 
-    def add_edges(self, edges: Iterable[tuple[Hashable, Hashable]]) -> None:
-        """Add a collection of edges to the graph.
+    def get_similar(self, stroke: str, distance: int) -> set[Node]:
+        """Get a set of all strokes within a distance of the given stroke.
 
-        :param nodes: A collection of edges.
+        :param stroke: The stroke to get similars for.
+        :param distance: The maximum distance of similar strokes.
+        :returns: A set of strokes grouped by equivalency. The set is shared
+            by every call with the same arguments and must not be changed.
         """
 
-        for edge in edges:
-            self.add_edge(edge)
+        index = self._node_indices.get(stroke)
+        if index is None:
+            return {(stroke,)}
+        distance = min(distance, self.max_distance)
+        similar = self._similar.get((index, distance))
+        if similar is None:
+            similar = {
+                node
+                for node, node_distance in zip(
+                    self.nodes, self._distances[index], strict=True
+                )
+                # unreachable nodes are never similar, whatever the distance
+                if node_distance is not None and node_distance <= distance
+            }
+            self._similar[(index, distance)] = similar
+        return similar
+
+
+_GRAPHML = "{http://graphml.graphdrawing.org/xmlns}"
+
+
+def _graphml_label(node: Element, label_keys: set[str | None]) -> str | None:
+    for element in node.iter():
+        if element.tag.endswith("}NodeLabel"):
+            # a node drawn with yEd
+            return "".join(element.itertext())
+        if element.tag == _GRAPHML + "data" and element.get("key") in label_keys:
+            return element.text
+    return None
+
+
+def load_graphml(path: str | os.PathLike[str]) -> SimilarityMatrix:
+    """Load a similarity graph from a GraphML file and compile it into a
+    matrix.
+
+    The label of each node of the graph lists its equivalent strokes,
+    separated by commas. Labels are read from yEd node labels or from data
+    named "label" or "name", and the id of a node is used if it has no label.
+    Edges are undirected.
+
+    :param path: The path to a GraphML file.
+    :returns: A new ``SimilarityMatrix``.
+    :raises InvalidSimilarityGraph: If the file is not a GraphML graph of
+        strokes.
+    """
 
-    def get_similar(self, node: Hashable, similarity: int) -> set[Hashable]:
-        """Get a set of all nodes within a distance of similarity to the
-        given node.
+    try:
+        root = ElementTree.parse(path).getroot()
+    except ElementTree.ParseError as e:
+        raise InvalidSimilarityGraph(f"Invalid GraphML file: {e}") from e
+    graph = root.find(_GRAPHML + "graph")
+    if graph is None:
+        raise InvalidSimilarityGraph("No graph in GraphML file")
+
+    label_keys = {
+        key.get("id")
+        for key in root.iter(_GRAPHML + "key")
+        if (key.get("attr.name") or "").lower() in ("label", "name")
+    }
+    nodes: dict[str | None, Node] = {}
+    seen: set[str] = set()
+    for element in graph.iter(_GRAPHML + "node"):
+        label = _graphml_label(element, label_keys) or element.get("id") or ""
+        node = tuple(stroke.strip() for stroke in label.split(","))
+        for stroke in node:
+            if stroke not in grammar.STROKES:
+                raise InvalidSimilarityGraph(f"Not a stroke: {stroke!r}")
+            if stroke in seen:
+                raise InvalidSimilarityGraph(f"Stroke in several nodes: {stroke}")
+            seen.add(stroke)
+        nodes[element.get("id")] = node
+
+    edges = []
+    for element in graph.iter(_GRAPHML + "edge"):
+        source = nodes.get(element.get("source"))
+        target = nodes.get(element.get("target"))
+        if source is None or target is None:
+            raise InvalidSimilarityGraph("Edge between unknown nodes")
+        edges.append((source, target))
+    return SimilarityMatrix.from_edges(edges, nodes.values())
+
+
+_PRESET_GRAPHS: dict[ConfigPreset, tuple[list[tuple[Node, Node]], list[Node]]] = {
+    ConfigPreset.PREANNIVERSARY: (_trans_edges, _disconnected_nodes),
+    ConfigPreset.ANNIVERSARY: (_trans_edges, _disconnected_nodes),
+}
+"""The edges and disconnected nodes of the similarity graph of each
+edition of Gregg Shorthand. The editions currently share one graph, which
+was drawn for the pre-anniversary edition; an edition only needs its own
+entry here to be searched and ranked with a graph of its own."""
 
-        :param node: The node to get similars for.
-        :param similarity: A distance
-        :returns: A set of nodes
-        """
 
-        similars = set()
-        similars.add(node)
-        while similarity > 0:
-            new = []
-            for node in similars:
-                new += self.nodes.get(node, list())
-            similars |= set(new)
-            similarity -= 1
+def get_configured_preset() -> ConfigPreset:
+    """Get the edition of Gregg Shorthand set by the ``Preset`` setting of the
+    ``Search`` configuration.
+
+    :returns: The configured preset, or the default preset if the setting is
+        not a valid preset.
+    """
+
+    try:
+        return ConfigPreset(defaults.SEARCH["Preset"])
+    except ValueError:
+        return ConfigPreset(defaults.DEFAULTS["Search"]["Preset"])
 
-        return similars
 
+@lru_cache
+def _preset_matrix(preset: ConfigPreset) -> SimilarityMatrix:
+    edges, nodes = _PRESET_GRAPHS[preset]
+    return SimilarityMatrix.from_edges(edges, nodes)
+
+
+def get_similarity_matrix(preset: ConfigPreset | None = None) -> SimilarityMatrix:
+    """Get the compiled similarity graph of an edition of Gregg Shorthand.
+
+    :param preset: The edition, or ``None`` for the configured edition.
+    :returns: A shared ``SimilarityMatrix``.
+    """
 
-_sg = _SimilarityGraph()
-_sg.add_edges(_trans_edges)
-_sg.add_nodes(_disconnected_nodes)
+    return _preset_matrix(preset or get_configured_preset())
 
 
-# cache # of strokes * the number of uncertainty values
-@lru_cache(maxsize=len(grammar.STROKES) * 3)
 def get_similar(stroke: str, distance: int) -> set[tuple]:
     """Get a set of all strokes within a distance to the
-    given node.
+    given node in the similarity graph of the configured edition.
 
     :param stroke: The stroke to get similars for.
     :param distance: The maximum distance of similar strokes.
     :returns: A set of strokes grouped by equivalency.
     """
 
-    return cast("set[tuple]", _sg.get_similar(get_node(stroke), distance))
+    return get_similarity_matrix().get_similar(stroke, distance)
@@ -3,7 +3,7 @@ from __future__ import annotations
 import re
 from functools import lru_cache
 
-from lark import Lark
+from grascii.grammars import get_terminal_pattern
 
 
 @lru_cache(maxsize=1)
@@ -11,8 +11,7 @@ def get_grascii_regex_str() -> str:
     """Get a string that can be compiled into a regular expression that matches
     Grascii strings.
     """
-    parser = Lark.open_from_package("grascii.grammars", "grascii_regex.lark")
-    return parser.get_terminal("GRASCII").pattern.value
+    return get_terminal_pattern("grascii_regex.lark", "GRASCII")
 
 
 class GrasciiValidator:
@@ -52,8 +52,10 @@ def test_get_preset_config():
         preanniversary_parser["Search"]["Dictionary"]
         == ":preanniversary :preanniversary-phrases"
     )
+    assert preanniversary_parser["Search"]["Preset"] == "preanniversary"
 
     anniversary_config = get_preset_config(ConfigPreset.ANNIVERSARY)
     anniversary_parser = ConfigParser()
     anniversary_parser.read_string(anniversary_config)
     assert anniversary_parser["Search"]["Dictionary"] == ":anniversary"
+    assert anniversary_parser["Search"]["Preset"] == "anniversary"
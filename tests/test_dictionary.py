@@ -1,15 +1,23 @@
 from __future__ import annotations
 
 import logging
+import re
 import unittest
 from pathlib import Path
 
 import pytest
 
-from grascii.dictionary import Dictionary
+from grascii.dictionary import Dictionary, DictionaryEntry
+from grascii.dictionary.binary import (
+    MAGIC,
+    BinaryShard,
+    InvalidDictionaryFile,
+    write_binary_shard,
+)
 from grascii.dictionary.build import (
     DEFAULT_PIPELINE,
     DictionaryBuilder,
+    DictionaryFormat,
     DictionaryOutputOptions,
 )
 from grascii.dictionary.common import (
@@ -18,10 +26,24 @@ from grascii.dictionary.common import (
     get_dictionary_installed_name,
     get_dictionary_path_name,
 )
+from grascii.dictionary.index import (
+    NGRAM_INDEX,
+    WORD_INDEX,
+    WordIndex,
+    fold_word,
+    skeleton,
+    split_words,
+)
 from grascii.dictionary.install import install_dictionary
 from grascii.dictionary.list import get_built_ins, get_installed
 from grascii.dictionary.pipeline import create_grascii_check, create_spell_check
+from grascii.dictionary.shards import LineBuffer, is_line_safe
+from grascii.dictionary.store import DictionaryStore, get_dictionary_store
+from grascii.dictionary.strokes import STROKES_SUFFIX
+from grascii.dictionary.trie import GrasciiTrie
 from grascii.dictionary.uninstall import uninstall_dictionary
+from grascii.interpreter import GrasciiInterpreter
+from grascii.regen import RegexBuilder, SearchMode
 
 
 class TestDictionaryBuildWarnings(unittest.TestCase):
@@ -256,6 +278,410 @@ class TestDictionaryDump:
         assert len(entries) > 17000
 
 
+class TestDictionaryStore:
+    @pytest.fixture
+    def build_path(self, tmp_path):
+        builder = DictionaryBuilder()
+        builder.build(
+            infiles=[Path("tests/dictionaries/search.txt")],
+            output=DictionaryOutputOptions(tmp_path),
+        )
+        return tmp_path
+
+    def test_loads_once(self, build_path):
+        store = DictionaryStore()
+        shard = store.get(build_path / "A")
+        assert store.get(build_path / "A") is shard
+        assert len(store) == 1
+        assert store.size == shard.size
+
+    def test_size_in_memory(self, build_path):
+        store = DictionaryStore()
+        shard = store.get(build_path / "A")
+        # the entries and line offsets are counted along with the text
+        assert shard.size > 2 * (build_path / "A").stat().st_size
+
+    def test_entries(self, build_path):
+        store = DictionaryStore()
+        shard = store.get(build_path / "S")
+        with (build_path / "S").open() as f:
+            lines = f.readlines()
+        assert len(shard) == len(lines)
+        for entry, line in zip(shard, lines, strict=True):
+            grascii, translation = line.strip().split(maxsplit=1)
+            assert entry == (grascii, translation)
+
+    def test_reload_on_change(self, build_path):
+        store = DictionaryStore()
+        shard = store.get(build_path / "A")
+        with (build_path / "A").open("a") as f:
+            f.write("AB About\n")
+        reloaded = store.get(build_path / "A")
+        assert reloaded is not shard
+        assert len(reloaded) == len(shard) + 1
+        assert reloaded[-1] == ("AB", "About")
+
+    def test_missing_file(self, build_path):
+        store = DictionaryStore()
+        store.get(build_path / "A")
+        (build_path / "A").unlink()
+        with pytest.raises(FileNotFoundError):
+            store.get(build_path / "A")
+        assert len(store) == 0
+        assert store.size == 0
+
+    def test_eviction(self, build_path):
+        size_a = DictionaryStore().get(build_path / "A").size
+        size_s = DictionaryStore().get(build_path / "S").size
+        store = DictionaryStore(max_size=size_a + size_s)
+        store.get(build_path / "A")
+        store.get(build_path / "S")
+        assert len(store) == 2
+        store.get(build_path / "A")
+        store.get(build_path / "N")
+        assert build_path / "A" in store
+        assert build_path / "S" not in store
+        assert store.size <= store.max_size
+
+    def test_shrink(self, build_path):
+        store = DictionaryStore()
+        store.get(build_path / "A")
+        store.get(build_path / "S")
+        store.max_size = 0
+        assert len(store) == 0
+        assert store.size == 0
+
+    def test_too_large(self, build_path):
+        store = DictionaryStore(max_size=0)
+        shard = store.get(build_path / "A")
+        assert len(shard) > 0
+        assert len(store) == 0
+
+    def test_dump(self, build_path):
+        dictionary = Dictionary.new(build_path)
+        count = 0
+        for shard in build_path.iterdir():
+            with shard.open() as f:
+                count += len(f.readlines())
+        assert len(dictionary.dump()) == count
+
+
+class TestBinaryFormat:
+    @pytest.fixture
+    def build_paths(self, tmp_path):
+        builder = DictionaryBuilder()
+        paths = {}
+        for output_format in DictionaryFormat:
+            paths[output_format] = tmp_path / output_format.value
+            builder.build(
+                infiles=[Path("tests/dictionaries/search.txt")],
+                output=DictionaryOutputOptions(
+                    paths[output_format], format=output_format
+                ),
+            )
+        return paths
+
+    def test_magic(self, build_paths):
+        for shard in build_paths[DictionaryFormat.BINARY].iterdir():
+            assert shard.read_bytes().startswith(MAGIC)
+
+    def test_same_files(self, build_paths):
+        text_files = {p.name for p in build_paths[DictionaryFormat.TEXT].iterdir()}
+        binary_files = {p.name for p in build_paths[DictionaryFormat.BINARY].iterdir()}
+        assert text_files == binary_files
+
+    def test_dump(self, build_paths):
+        text = Dictionary.new(build_paths[DictionaryFormat.TEXT])
+        binary = Dictionary.new(build_paths[DictionaryFormat.BINARY])
+        assert binary.dump() == text.dump()
+
+    def test_entries(self, tmp_path):
+        entries = [("ABT", "About"), ("A~B", "Ébène"), ("AB", "A B C")]
+        write_binary_shard(tmp_path / "A", entries)
+        shard = BinaryShard((tmp_path / "A").read_bytes())
+        assert len(shard) == 3
+        assert list(shard) == entries
+        assert shard[-1] == entries[-1]
+        assert shard.line(1) == "A~B Ébène"
+        with pytest.raises(IndexError):
+            shard[3]
+
+    def test_empty(self, tmp_path):
+        write_binary_shard(tmp_path / "A", [])
+        shard = BinaryShard((tmp_path / "A").read_bytes())
+        assert len(shard) == 0
+        assert list(shard.search([])) == []
+
+    def test_rebuild_mapped(self, build_paths):
+        path = build_paths[DictionaryFormat.BINARY]
+        store = get_dictionary_store()
+        shard = store.get(path / "A")
+        DictionaryBuilder().build(
+            infiles=[Path("tests/dictionaries/search.txt")],
+            output=DictionaryOutputOptions(path, format=DictionaryFormat.BINARY),
+        )
+        # the mapped file is closed before it is replaced
+        assert path / "A" not in store
+        with pytest.raises(ValueError):
+            shard[0]
+        assert list(store.get(path / "A")) == list(
+            BinaryShard((path / "A").read_bytes())
+        )
+
+    def test_invalid(self, tmp_path):
+        write_binary_shard(tmp_path / "A", [("ABT", "About")])
+        data = (tmp_path / "A").read_bytes()
+        with pytest.raises(InvalidDictionaryFile):
+            BinaryShard(b"ABT About\n")
+        with pytest.raises(InvalidDictionaryFile):
+            BinaryShard(data[:-1])
+
+
+class TestLineScanning:
+    entries = [
+        ("ABT", "About"),
+        ("'ABT", "Habit"),
+        ("A~B", "Ébène"),
+        ("KF", "Café au lait"),
+        ("ABTL", "Abuttal"),
+        ("AB", "A B C"),
+    ]
+    regexps = [
+        r"^A",
+        r"^'?AB\S*\s",
+        r"bit\Z",
+        r"(?<!\S)A",
+        r"C$",
+        r"Caf. au",
+        r"(?i)^\S+ .*\bab",
+        r"^AB(?:\Z|\s)",
+        r"\s",
+    ]
+
+    def shards(self, tmp_path):
+        write_binary_shard(tmp_path / "A", self.entries)
+        (tmp_path / "T").write_text(
+            "".join(
+                f"{grascii} {translation}\n" for grascii, translation in self.entries
+            )
+        )
+        store = DictionaryStore()
+        return [store.get(tmp_path / "A"), store.get(tmp_path / "T")]
+
+    def expected(self, pattern):
+        return [
+            i
+            for i, (grascii, translation) in enumerate(self.entries)
+            if pattern.search(f"{grascii} {translation}")
+        ]
+
+    def test_is_line_safe(self):
+        builder = RegexBuilder(search_mode=SearchMode.MATCH)
+        assert is_line_safe(builder.generate_patterns_map([["S", "T"]])[0][1])
+        assert is_line_safe(re.compile(r"^A\s"))
+        assert not is_line_safe(re.compile(r"A\Z"))
+        assert not is_line_safe(re.compile(r"\AA"))
+        assert not is_line_safe(re.compile(r"(?<!\s)A"))
+        assert not is_line_safe(re.compile(r"A(?=\s)"))
+
+    def test_search(self, tmp_path):
+        for shard in self.shards(tmp_path):
+            for regexp in self.regexps:
+                pattern = re.compile(regexp)
+                found = [i for _, _, i in shard.search([(regexp, pattern)])]
+                assert found == self.expected(pattern), regexp
+
+    def test_search_ranges(self, tmp_path):
+        pattern = re.compile(r"^A")
+        for shard in self.shards(tmp_path):
+            found = [i for _, _, i in shard.search([("", pattern)], [(1, 3), (4, 5)])]
+            assert found == [2, 4]
+
+    def test_non_ascii(self, tmp_path):
+        binary, text = self.shards(tmp_path)
+        assert not binary.is_ascii
+        pattern = re.compile(r"^KF Caf. au")
+        for shard in [binary, text]:
+            assert [entry for _, entry, _ in shard.search([("", pattern)])] == [
+                ("KF", "Café au lait")
+            ]
+
+    def test_malformed_lines(self, tmp_path):
+        (tmp_path / "A").write_text("ABT About\nABC\n   \n\nAB A B C\n")
+        shard = DictionaryStore().get(tmp_path / "A")
+        assert list(shard) == [("ABT", "About"), ("AB", "A B C")]
+        pattern = re.compile(r"^AB")
+        assert [i for _, _, i in shard.search([("", pattern)])] == [0, 1]
+
+    def test_line_buffer(self):
+        lines = LineBuffer.from_lines(["ABT About", "", "AB A B C"])
+        assert len(lines) == 3
+        assert lines[1] == ""
+        assert lines[2] == "AB A B C"
+        assert lines.locate(lines.text.index("C")) == (11, 19)
+
+
+class TestNgramIndex:
+    @pytest.fixture
+    def build_path(self, tmp_path):
+        builder = DictionaryBuilder()
+        builder.build(
+            infiles=[Path("tests/dictionaries/search.txt")],
+            output=DictionaryOutputOptions(tmp_path, index=True),
+        )
+        return tmp_path
+
+    def test_skeleton(self):
+        assert skeleton("A|^GA'T") == "AGAT"
+        assert skeleton("'A~,B(T-N\\") == "ABTN"
+        assert skeleton("A&'T") == "A&T"
+
+    def test_counts(self, build_path):
+        dictionary = Dictionary.new(build_path)
+        index = dictionary.load_ngram_index()
+        assert index is not None
+        for name, count in index.counts.items():
+            assert index.is_current(name, dictionary.load(name))
+            assert count == len(dictionary.load(name))
+
+    def test_find_candidates(self, build_path):
+        dictionary = Dictionary.new(build_path)
+        index = dictionary.load_ngram_index()
+        candidates = index.find_candidates([[["A"], ["B"], ["T"]]])
+        found = {
+            dictionary.load(name)[i].grascii
+            for name, indices in candidates.items()
+            for i in indices
+        }
+        expected = {
+            entry.grascii
+            for entry in dictionary.dump()
+            if "ABT" in skeleton(entry.grascii)
+        }
+        assert found == expected
+        assert index.find_candidates([[["A"], ["B"], ["X"]]]) == {}
+        assert index.find_candidates([[]]) is None
+
+    def test_removed_without_index(self, build_path):
+        assert (build_path / NGRAM_INDEX).exists()
+        DictionaryBuilder().build(
+            infiles=[Path("tests/dictionaries/search.txt")],
+            output=DictionaryOutputOptions(build_path),
+        )
+        assert not (build_path / NGRAM_INDEX).exists()
+        assert Dictionary.new(build_path).load_ngram_index() is None
+
+    def test_invalid(self, build_path):
+        (build_path / NGRAM_INDEX).write_text("{}")
+        assert Dictionary.new(build_path).load_ngram_index() is None
+
+    def test_install(self, tmp_dict_path, build_path):
+        install_dictionary(build_path, tmp_dict_path, name="indexed")
+        assert (tmp_dict_path / "indexed" / NGRAM_INDEX).exists()
+        assert (tmp_dict_path / "indexed" / WORD_INDEX).exists()
+
+
+class TestWordIndex:
+    def test_split_words(self):
+        assert split_words("Son-in-law") == ["son", "in", "law"]
+        assert split_words("A  Habit Time") == ["a", "habit", "time"]
+        assert split_words("İstanbul") == ["istanbul"]
+
+    def test_fold_word(self):
+        assert fold_word("ſtem") == "stem"
+        assert fold_word("Iron") == "iron"
+
+    def test_find_candidates(self):
+        entries = [
+            DictionaryEntry("ABT", "Habit"),
+            DictionaryEntry("ABTSH", "Habitation"),
+            DictionaryEntry("SNLO", "Son-in-law"),
+            DictionaryEntry("ABT", "A Habit"),
+        ]
+        index = WordIndex.from_entries({"A": entries})
+        assert index.find_candidates("habit") == {"A": [0, 1, 3]}
+        assert index.find_candidates("HABITA") == {"A": [1]}
+        assert index.find_candidates("law") == {"A": [2]}
+        assert index.find_candidates("a habit") == {"A": [3]}
+        assert index.find_candidates("abit") == {}
+        assert index.find_candidates("-law") is None
+        assert index.find_candidates("é") is None
+
+    def test_load(self, tmp_path):
+        DictionaryBuilder().build(
+            infiles=[Path("tests/dictionaries/search.txt")],
+            output=DictionaryOutputOptions(tmp_path, index=True),
+        )
+        dictionary = Dictionary.new(tmp_path)
+        index = dictionary.load_word_index()
+        assert index is not None
+        assert "habit" in index.words
+        (tmp_path / WORD_INDEX).unlink()
+        assert dictionary.load_word_index() is None
+
+
+class TestStrokeFiles:
+    @pytest.fixture
+    def build_path(self, tmp_path):
+        builder = DictionaryBuilder()
+        builder.build(
+            infiles=[Path("tests/dictionaries/search.txt")],
+            output=DictionaryOutputOptions(tmp_path, strokes=True),
+        )
+        return tmp_path
+
+    def test_strokes(self, build_path):
+        interpreter = GrasciiInterpreter()
+        dictionary = Dictionary.new(build_path)
+        strokes = dictionary.load_strokes("A")
+        assert strokes is not None
+        shard = dictionary.load("A")
+        assert len(strokes) == len(shard)
+        for i, entry in enumerate(shard):
+            assert strokes[i] == interpreter.interpret(entry.grascii)
+
+    def test_removed_without_strokes(self, build_path):
+        assert (build_path / ("A" + STROKES_SUFFIX)).exists()
+        DictionaryBuilder().build(
+            infiles=[Path("tests/dictionaries/search.txt")],
+            output=DictionaryOutputOptions(build_path),
+        )
+        assert not (build_path / ("A" + STROKES_SUFFIX)).exists()
+        assert Dictionary.new(build_path).load_strokes("A") is None
+
+    def test_install(self, tmp_dict_path, build_path):
+        install_dictionary(build_path, tmp_dict_path, name="stroked")
+        assert (tmp_dict_path / "stroked" / ("A" + STROKES_SUFFIX)).exists()
+
+
+class TestGrasciiTrie:
+    def test_find(self):
+        keys = ["ABT", "SABT", "AB", "A~BT", "'ABT", "ABTL"]
+        trie = GrasciiTrie(keys)
+        assert trie.find([[["A"], ["B"], ["T"]]]) == [0, 5]
+        assert trie.find([[["A"], ["B"]]]) == [0, 2, 5]
+        assert trie.find([[["", "'"], ["A", "A~"], ["B"]]]) == [0, 2, 3, 4, 5]
+        assert trie.find([[["A"], ["X"]]]) == []
+        assert trie.find([[]]) == list(range(len(keys)))
+
+    def test_find_within(self):
+        keys = ["ABT", "SABT", "AB", "APT", "ADT", "ABD"]
+        trie = GrasciiTrie(keys)
+        steps = [[("A", 0)], [("B", 0), ("P", 1), ("D", 2)], [("T", 0), ("D", 1)]]
+        assert trie.find_within([steps], 0) == [0]
+        assert trie.find_within([steps], 1) == [0, 3, 5]
+        assert trie.find_within([steps], 2) == [0, 3, 4, 5]
+        assert trie.find_within([steps], 2, anywhere=True) == [0, 1, 3, 4, 5]
+        assert trie.find_within([[[("X", 0)]]], 2, anywhere=True) == []
+        assert trie.find_within([steps[:2]], 0, whole=True) == [2]
+        assert trie.find_within([steps], 0, anywhere=True, whole=True) == [0, 1]
+        assert trie.find_within([steps[:2]], 2, anywhere=True, whole=True) == [2]
+
+    def test_empty(self):
+        assert GrasciiTrie([]).find([[["A"]]]) == []
+        assert GrasciiTrie([]).find_within([[[("A", 0)]]], 1, anywhere=True) == []
+
+
 class TestList:
     def test_list_no_installed(self, tmp_dict_path):
         assert len(get_installed()) == 0
@@ -1,9 +1,16 @@
 from __future__ import annotations
 
 import unittest
+from pathlib import Path
+from shutil import rmtree
+from unittest import mock
 
 import pytest
 
+from grascii.dictionary.build import DictionaryBuilder, DictionaryOutputOptions
+from grascii.parser import GrasciiParser
+from grascii.searchers import GrasciiSearcher
+
 try:
     import pexpect
 except ImportError:
@@ -11,7 +18,7 @@ except ImportError:
 
 SUPPORTS_INTERACTIVE = False
 try:
-    import grascii.interactive  # noqa: F401
+    from grascii.interactive import InteractiveSearcher
 
     SUPPORTS_INTERACTIVE = True
 except ImportError:
@@ -364,3 +371,53 @@ class TestCancel(InteractiveTester):
         self.c.sendline()
         self.cancel()
         self.assert_on_settings()
+
+
+@unittest.skipUnless(SUPPORTS_INTERACTIVE, "interactive extra is not installed")
+class TestUncertaintyBudget(unittest.TestCase):
+    output_dir = "tests/dictionaries/interactive"
+
+    @classmethod
+    def setUpClass(cls):
+        rmtree(cls.output_dir, ignore_errors=True)
+        DictionaryBuilder().build(
+            infiles=[Path("tests/dictionaries/search.txt")],
+            output=DictionaryOutputOptions(cls.output_dir),
+        )
+
+    @classmethod
+    def tearDownClass(cls):
+        rmtree(cls.output_dir, ignore_errors=True)
+
+    def test_budget(self):
+        kwargs = {"search_mode": "contain", "uncertainty_budget": 1}
+        searcher = InteractiveSearcher(dictionaries=[self.output_dir])
+        searcher._extract_search_args(**kwargs)
+        searcher._metric = None
+        searcher._limit = None
+        self.assertEqual(searcher.uncertainty_budget, 1)
+        interpretations = [next(GrasciiParser().interpret("ABT"))]
+        plans = []
+
+        def execute(plan):
+            plans.append(plan)
+            return iter(())
+
+        with (
+            mock.patch.object(
+                searcher,
+                "_get_grascii_search",
+                return_value=("ABT", interpretations),
+            ),
+            mock.patch.object(searcher, "execute", side_effect=execute),
+        ):
+            searcher._interactive_search()
+        expected = GrasciiSearcher(dictionaries=[self.output_dir]).plan(
+            grascii="ABT", **kwargs
+        )
+        (plan,) = plans
+        self.assertEqual(plan.query.uncertainty_budget, 1)
+        self.assertListEqual(
+            [pattern.pattern for _, pattern in plan.patterns],
+            [pattern.pattern for _, pattern in expected.patterns],
+        )
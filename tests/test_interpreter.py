@@ -1,8 +1,15 @@
 from __future__ import annotations
 
+import time
+
 import pytest
 
-from grascii.interpreter import GrasciiInterpreter
+from grascii.interpreter import (
+    GrasciiInterpreter,
+    collect_interpretations,
+    decode_interpretation,
+    encode_interpretation,
+)
 from grascii.parser import GrasciiParser, InvalidGrascii
 
 
@@ -97,3 +104,61 @@ class TestGrasciiInterpreter:
     #
     #     print(failures)
     #     assert not failures
+
+
+class TestCollectInterpretations:
+    def test_all(self):
+        interpretations = [["A"], ["A", [","]], ["A"], ["A", [","]], ["E"]]
+        assert collect_interpretations(interpretations) == [
+            ["A"],
+            ["A", [","]],
+            ["E"],
+        ]
+
+    def test_limit(self):
+        interpretations = [["A"], ["A"], ["E"], ["O"]]
+        assert collect_interpretations(interpretations, 2) == [["A"], ["E"]]
+
+    def test_time_limit(self):
+        def slow():
+            for stroke in "AEO":
+                time.sleep(0.01)
+                yield [stroke]
+
+        assert collect_interpretations(slow(), time_limit=0.001) == [["A"]]
+
+    def test_closes(self):
+        closed = []
+
+        def interpretations():
+            try:
+                yield ["A"]
+                yield ["E"]
+            finally:
+                closed.append(True)
+
+        assert collect_interpretations(interpretations(), 1) == [["A"]]
+        assert closed == [True]
+
+
+class TestInterpretationEncoding:
+    @pytest.mark.parametrize(
+        "interpretation",
+        [
+            [],
+            ["A", "B", "T"],
+            ["S", [")"], "S"],
+            ["JNT", "M"],
+            ["A", ["~", "|", ","], "B", "^", "F"],
+            ["'", "A", "B", "-", "L", [","], "\\", "T"],
+        ],
+    )
+    def test_roundtrip(self, interpretation):
+        encoded = encode_interpretation(interpretation)
+        assert decode_interpretation(encoded) == interpretation
+        assert encoded.isprintable()
+        assert "\n" not in encoded
+
+    def test_one_character_per_token(self):
+        assert len(encode_interpretation(["S", [")"], "S"])) == 3
+        assert encode_interpretation(["S"]) != encode_interpretation(["Z"])
@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import itertools
+import random
+
+import pytest
+
+from grascii import grammar
+from grascii.lark_ambig_tools import Disambiguator
+from grascii.lattice import build_lattice
+from grascii.parser import GrasciiFlattener, GrasciiParser, InvalidGrascii
+
+
+def earley_interpretations(parser, grascii, preserve_boundaries):
+    try:
+        tree = parser.parse(grascii)
+    except InvalidGrascii:
+        return None
+    flattener = GrasciiFlattener(preserve_boundaries)
+    return [flattener.transform(t) for t in Disambiguator().visit(tree)]
+
+
+def lattice_interpretations(grascii, preserve_boundaries):
+    lattice = build_lattice(grascii)
+    if lattice is None:
+        return None
+    return list(lattice.interpretations(preserve_boundaries))
+
+
+def random_strings(count, seed=0):
+    pieces = [
+        *sorted(grammar.STROKES),
+        *",.|~_()",
+        grammar.ASPIRATE,
+        grammar.BOUNDARY,
+        grammar.INTERSECTION,
+        grammar.DISJOINER,
+        # favor strings with many overlapping blends
+        *"NTMDS" * 3,
+    ]
+    rng = random.Random(seed)
+    for _ in range(count):
+        yield "".join(rng.choice(pieces) for _ in range(rng.randint(1, 6)))
+
+
+class TestLattice:
+    @pytest.fixture(scope="class")
+    def parser(self):
+        return GrasciiParser(None)
+
+    @pytest.mark.parametrize(
+        "grascii",
+        [
+            "NTN",
+            "NTNT",
+            "TNTN",
+            "PNTN",
+            "MDMD",
+            "JNTM",
+            "SSS",
+            "DDT",
+            "SS),",
+            "A~|E.",
+            "A&''",
+            "''A''",
+            "'",
+            "A^",
+            "^A",
+            "A^B^",
+            "TN^NTN^SS",
+            "TN-TN",
+            "TN'TN",
+            "TN\\TN",
+            "T'-N",
+            "T'\\N",
+            "NT-N",
+            "ABT^^",
+            "A^B^C^",
+            "^A^",
+            "-A",
+            "A''B",
+            "a",
+            "",
+        ],
+    )
+    def test_earley(self, parser, grascii):
+        for preserve_boundaries in (False, True):
+            assert lattice_interpretations(
+                grascii, preserve_boundaries
+            ) == earley_interpretations(parser, grascii, preserve_boundaries)
+
+    def test_earley_random(self, parser):
+        for grascii in random_strings(100):
+            for preserve_boundaries in (False, True):
+                expected = earley_interpretations(parser, grascii, preserve_boundaries)
+                found = lattice_interpretations(grascii, preserve_boundaries)
+                assert found == expected, grascii
+
+    def test_earley_exhaustive(self, parser):
+        for grascii in map("".join, itertools.product("NTMA'-^", repeat=3)):
+            expected = earley_interpretations(parser, grascii, True)
+            assert lattice_interpretations(grascii, True) == expected, grascii
+
+    def test_lazy(self):
+        interpretations = build_lattice("NT" * 200).interpretations()
+        assert next(interpretations) == ["N", *["TN"] * 199, "T"]
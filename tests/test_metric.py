@@ -1,8 +1,19 @@
 from __future__ import annotations
 
+import random
 import unittest
+from unittest import mock
 
-from grascii.metrics import gsequence_distance, interpretation_to_gsequence
+from grascii import grammar, metrics
+from grascii.metrics import (
+    ANNOTATION_COSTS,
+    BASE_COST,
+    AnnotatedStroke,
+    gsequence_distance,
+    gsequence_lower_bound,
+    interpretation_to_gsequence,
+)
+from grascii.similarities import get_similar, get_similarity_matrix
 
 
 class TestStandard(unittest.TestCase):
@@ -170,3 +181,154 @@ class TestStandard(unittest.TestCase):
         self.assertEqual(
             gsequence_distance(left, base), gsequence_distance(right, base)
         )
+
+
+def reference_distance(seq1, seq2):
+    """gsequence_distance computed directly from the similarity graph."""
+
+    def stroke_distance(stroke1, stroke2):
+        for distance in range(3):
+            if any(stroke2 in node for node in get_similar(stroke1, distance)):
+                return distance
+        return 3
+
+    def ins_del_cost(stroke):
+        cost = {"'": 1, "^": 4}.get(stroke.stroke, 4)
+        return cost + sum(ANNOTATION_COSTS[a] for a in stroke.annotations)
+
+    def sub_cost(stroke1, stroke2):
+        if stroke1.stroke in grammar.STROKES and stroke2.stroke in grammar.STROKES:
+            diff = stroke1.annotations ^ stroke2.annotations
+            return stroke_distance(stroke1.stroke, stroke2.stroke) * 4 + sum(
+                ANNOTATION_COSTS[a] for a in diff
+            )
+        if stroke1.stroke == stroke2.stroke:
+            return 0
+        return max(ins_del_cost(stroke1), ins_del_cost(stroke2))
+
+    previous = [0]
+    for stroke2 in seq2:
+        previous.append(previous[-1] + ins_del_cost(stroke2))
+    for stroke1 in seq1:
+        current = [previous[0] + ins_del_cost(stroke1)]
+        for j, stroke2 in enumerate(seq2):
+            current.append(
+                min(
+                    previous[j + 1] + ins_del_cost(stroke1),
+                    current[j] + ins_del_cost(stroke2),
+                    previous[j] + sub_cost(stroke1, stroke2),
+                )
+            )
+        previous = current
+    return previous[-1]
+
+
+class TestCostTables(unittest.TestCase):
+    def test_stroke_pairs(self):
+        strokes = sorted(grammar.STROKES)
+        for stroke1 in strokes:
+            for stroke2 in strokes:
+                seq1 = [AnnotatedStroke(stroke1, set())]
+                seq2 = [AnnotatedStroke(stroke2, set())]
+                self.assertEqual(
+                    gsequence_distance(seq1, seq2), reference_distance(seq1, seq2)
+                )
+
+    def test_random_sequences(self):
+        rng = random.Random(0)
+        tokens = [*sorted(grammar.STROKES), grammar.ASPIRATE, grammar.DISJOINER]
+        annotations = sorted(ANNOTATION_COSTS)
+
+        def random_sequence():
+            return [
+                AnnotatedStroke(
+                    rng.choice(tokens),
+                    set(rng.sample(annotations, rng.choice([0, 0, 0, 1, 2]))),
+                )
+                for _ in range(rng.randint(0, 7))
+            ]
+
+        for _ in range(500):
+            seq1 = random_sequence()
+            seq2 = random_sequence()
+            with self.subTest(seq1=seq1, seq2=seq2):
+                self.assertEqual(
+                    gsequence_distance(seq1, seq2), reference_distance(seq1, seq2)
+                )
+
+    def test_cutoff(self):
+        rng = random.Random(1)
+        tokens = [*sorted(grammar.STROKES), grammar.ASPIRATE, grammar.DISJOINER]
+
+        def random_sequence():
+            return [
+                AnnotatedStroke(rng.choice(tokens), set())
+                for _ in range(rng.randint(0, 7))
+            ]
+
+        for _ in range(300):
+            seq1 = random_sequence()
+            seq2 = random_sequence()
+            distance = gsequence_distance(seq1, seq2)
+            self.assertLessEqual(gsequence_lower_bound(seq1, seq2), distance)
+            for cutoff in [0, 3, 4, 9, 16]:
+                with self.subTest(seq1=seq1, seq2=seq2, cutoff=cutoff):
+                    bounded = gsequence_distance(seq1, seq2, cutoff)
+                    if distance <= cutoff:
+                        self.assertEqual(bounded, distance)
+                    else:
+                        self.assertEqual(bounded, cutoff + 1)
+
+    def test_lower_bound(self):
+        # aspirates and disjoiners do not count as strokes
+        seq1 = interpretation_to_gsequence(["A", "B"])
+        seq2 = interpretation_to_gsequence(["'", "A", "B", "^", "K", "D"])
+        self.assertEqual(gsequence_lower_bound(seq1, seq2), 2 * BASE_COST)
+        self.assertEqual(gsequence_distance(seq1, seq2, 8), 9)
+
+    def test_invalid_stroke(self):
+        with self.assertRaises(AssertionError):
+            gsequence_distance([AnnotatedStroke("Q", set())], [])
+
+
+class TestScoreMany(unittest.TestCase):
+    def setUp(self):
+        rng = random.Random(2)
+        tokens = [*sorted(grammar.STROKES), grammar.ASPIRATE, grammar.DISJOINER]
+        annotations = sorted(ANNOTATION_COSTS)
+
+        def random_sequence():
+            return [
+                AnnotatedStroke(
+                    token,
+                    set(rng.sample(annotations, rng.choice([0, 0, 1, 2])))
+                    if token in grammar.STROKES
+                    else set(),
+                )
+                for token in rng.choices(tokens, k=rng.randint(0, 9))
+            ]
+
+        self.pairs = [(random_sequence(), random_sequence()) for _ in range(600)]
+        self.expected = [gsequence_distance(seq1, seq2) for seq1, seq2 in self.pairs]
+
+    def batch_distances(self):
+        similarity = get_similarity_matrix()
+        tables = metrics._cost_tables(similarity)
+        encoded = [
+            (metrics._encode(seq1, tables), metrics._encode(seq2, tables))
+            for seq1, seq2 in self.pairs
+        ]
+        return metrics._batch_distances(encoded, similarity)
+
+    @unittest.skipIf(metrics._numpy() is None, "NumPy is not installed")
+    def test_numpy(self):
+        self.assertListEqual(self.batch_distances(), self.expected)
+        with mock.patch.object(metrics, "_BATCH_SIZE", 50):
+            self.assertListEqual(self.batch_distances(), self.expected)
+
+    def test_without_numpy(self):
+        with mock.patch.object(metrics, "_numpy", return_value=None):
+            self.assertListEqual(self.batch_distances(), self.expected)
+
+    def test_scalar_metric(self):
+        self.assertListEqual(metrics.score_many(metrics.trivial, [None] * 3), [0] * 3)
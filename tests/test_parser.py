@@ -1,8 +1,23 @@
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
+
 import pytest
 
-from grascii.parser import GrasciiParser
+from grascii.grammars import (
+    CACHE_SUFFIX,
+    PATTERN_SUFFIX,
+    get_parser,
+    load_parser,
+    load_terminal_pattern,
+)
+from grascii.parser import (
+    GrasciiParser,
+    InterpretationCache,
+    InvalidGrascii,
+    get_interpretation_cache,
+)
+from grascii.validator import get_grascii_regex_str
 
 
 class TestGrasciiParser:
@@ -26,3 +41,120 @@ class TestGrasciiParser:
     def test_intepretations(self, parser, grascii, expected):
         intepretations = list(parser.interpret(grascii))
         assert intepretations == expected
+
+
+class TestGrammarCache:
+    options = {"parser": "earley", "ambiguity": "explicit"}
+
+    def test_cache(self, tmp_path):
+        built = load_parser("grascii.lark", self.options, tmp_path)
+        caches = list(tmp_path.glob("grascii.lark.*" + CACHE_SUFFIX))
+        assert len(caches) == 1
+        loaded = load_parser("grascii.lark", self.options, tmp_path)
+        assert loaded is not built
+        for grascii in ["ABT", "NTN", "A|^GAT", "SSTN", "FTH)"]:
+            assert loaded.parse(grascii) == built.parse(grascii)
+
+    def test_options_key(self, tmp_path):
+        load_parser("grascii.lark", self.options, tmp_path)
+        load_parser("grascii.lark", {"parser": "earley"}, tmp_path)
+        # the cache of the grammar with other options replaces the first
+        assert len(list(tmp_path.glob("grascii.lark.*" + CACHE_SUFFIX))) == 1
+        load_parser("grascii_regex.lark", {}, tmp_path)
+        assert len(list(tmp_path.iterdir())) == 2
+
+    def test_corrupted_cache(self, tmp_path):
+        load_parser("grascii.lark", self.options, tmp_path)
+        (cache,) = tmp_path.glob("grascii.lark.*" + CACHE_SUFFIX)
+        cache.write_bytes(b"not a pickle")
+        parser = load_parser("grascii.lark", self.options, tmp_path)
+        assert parser.parse("ABT") == GrasciiParser().parse("ABT")
+        assert cache.read_bytes() != b"not a pickle"
+
+    def test_unwritable_cache(self, tmp_path):
+        not_a_directory = tmp_path / "file"
+        not_a_directory.write_text("")
+        parser = load_parser("grascii.lark", self.options, not_a_directory)
+        assert parser.parse("ABT") == GrasciiParser().parse("ABT")
+
+    def test_shared_parser(self):
+        assert get_parser("grascii.lark", **self.options) is get_parser(
+            "grascii.lark", **self.options
+        )
+        assert GrasciiParser()._parser is GrasciiParser()._parser
+
+    def test_terminal_pattern(self, tmp_path):
+        pattern = load_terminal_pattern("grascii_regex.lark", "GRASCII", tmp_path)
+        assert list(tmp_path.glob("*" + PATTERN_SUFFIX))
+        assert load_terminal_pattern("grascii_regex.lark", "GRASCII", tmp_path) == (
+            pattern
+        )
+        assert pattern == get_grascii_regex_str()
+
+
+class TestInterpretationCache:
+    def test_hits_and_misses(self):
+        cache = InterpretationCache()
+        parser = GrasciiParser(cache)
+        expected = list(GrasciiParser(None).interpret("NTN"))
+        assert list(parser.interpret("NTN")) == expected
+        assert (cache.hits, cache.misses) == (0, 1)
+        assert list(parser.interpret("NTN")) == expected
+        assert (cache.hits, cache.misses) == (1, 1)
+        cache.clear()
+        assert (len(cache), cache.hits, cache.misses) == (0, 0, 0)
+
+    def test_preserve_boundaries(self):
+        parser = GrasciiParser(InterpretationCache())
+        assert next(parser.interpret("M-ND")) == ["M", "ND"]
+        assert next(parser.interpret("M-ND", True)) == ["M", "-", "ND"]
+        assert next(parser.interpret("M-ND")) == ["M", "ND"]
+
+    def test_copies(self):
+        parser = GrasciiParser(InterpretationCache())
+        first = next(parser.interpret("A~|E"))
+        first[1].append("X")
+        first.append("X")
+        assert next(parser.interpret("A~|E")) == ["A", ["~", "|"], "E"]
+
+    def test_partial(self):
+        cache = InterpretationCache()
+        parser = GrasciiParser(cache)
+        expected = list(GrasciiParser(None).interpret("NTNT"))
+        assert len(expected) > 2
+        interpretations = parser.interpret("NTNT")
+        assert next(interpretations) == expected[0]
+        interpretations.close()
+        assert not cache.get("NTNT", False).complete
+        assert list(parser.interpret("NTNT")) == expected
+        cached = cache.get("NTNT", False)
+        assert cached.complete
+        assert len(cached.interpretations) == len(expected)
+
+    def test_max_size(self):
+        cache = InterpretationCache(max_size=2)
+        parser = GrasciiParser(cache)
+        for grascii in ["ABT", "NTN", "ABT", "SSTN"]:
+            list(parser.interpret(grascii))
+        assert len(cache) == 2
+        assert cache.get("ABT", False) is not None
+        assert cache.get("NTN", False) is None
+
+    def test_invalid(self):
+        parser = GrasciiParser(InterpretationCache())
+        for _ in range(2):
+            with pytest.raises(InvalidGrascii):
+                parser.interpret("ABT^^")
+
+    def test_threads(self):
+        cache = InterpretationCache(max_size=3)
+        parser = GrasciiParser(cache)
+        queries = ["ABT", "NTN", "NTNT", "A|^GAT", "SSTN", "MDM"] * 20
+        expected = {q: list(GrasciiParser(None).interpret(q)) for q in set(queries)}
+        with ThreadPoolExecutor(4) as pool:
+            found = list(pool.map(lambda q: list(parser.interpret(q)), queries))
+        assert found == [expected[q] for q in queries]
+        assert cache.hits + cache.misses == len(queries)
+
+    def test_shared_cache(self):
+        assert GrasciiParser().cache is get_interpretation_cache()
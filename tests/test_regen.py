@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import itertools
 import re
 import unittest
 
@@ -1507,5 +1508,173 @@ class TestNegativeLookaheads(RegexBuilderTester):
         self.run_tests(builder, tests)
 
 
+class TestPrefixSteps(unittest.TestCase):
+    def assertPrefixesCover(self, builder, interp, texts):
+        regex = builder.build_regex(interp)
+        prefixes = [
+            "".join(p) for p in itertools.product(*builder.get_prefix_steps(interp))
+        ]
+        for text in texts:
+            with self.subTest(interpretation=interp, text=text):
+                if re.search(regex, text):
+                    self.assertTrue(any(text.startswith(p) for p in prefixes))
+
+    def test_steps(self):
+        builder = regen.RegexBuilder(
+            aspirate_mode=regen.Strictness.HIGH,
+            annotation_mode=regen.Strictness.HIGH,
+        )
+        self.assertListEqual(
+            builder.get_prefix_steps(["'", "A", ["|"], "B"]),
+            [["'"], ["A|"], ["B"]],
+        )
+
+    def test_no_steps(self):
+        for search_mode in [regen.SearchMode.CONTAIN, regen.SearchMode.END]:
+            builder = regen.RegexBuilder(search_mode=search_mode)
+            self.assertListEqual(builder.get_prefix_steps(["A", "B"]), [])
+
+    def test_weighted_steps(self):
+        for search_mode in regen.SearchMode:
+            builder = regen.RegexBuilder(uncertainty=1, search_mode=search_mode)
+            weighted = builder.get_weighted_steps(["A", "T"])
+            self.assertListEqual(weighted[-1], [("T", 0), ("D", 1)])
+            self.assertIn(("A|", 0), weighted[-3])
+            self.assertIn(("E|", 1), weighted[-3])
+            anchored = search_mode in [regen.SearchMode.MATCH, regen.SearchMode.START]
+            self.assertEqual(len(weighted), 4 if anchored else 3)
+            if anchored:
+                self.assertListEqual(
+                    [[option for option, _ in step] for step in weighted],
+                    builder.get_prefix_steps(["A", "T"]),
+                )
+
+    def test_whole_weighted_steps(self):
+        texts = [
+            "AT",
+            "AT'",
+            "AT''",
+            "AT^",
+            "AT'^",
+            "AT^'",
+            "'AT",
+            "A'T",
+            "ATS",
+            "AT'''",
+        ]
+        interps = [
+            ["A", "T"],
+            ["A", "T", "'"],
+            ["A", "T", "^"],
+            ["A", "'", "T"],
+            ["A", "T", "'", "'"],
+        ]
+        strictness = list(regen.Strictness)
+        for modes in itertools.product(strictness, repeat=2):
+            builder = regen.RegexBuilder(
+                aspirate_mode=modes[0], disjoiner_mode=modes[1]
+            )
+            for interp in interps:
+                regex = builder.build_regex(interp)
+                steps = builder.get_weighted_steps(interp, whole=True)
+                strings = {
+                    "".join(option for option, _ in p)
+                    for p in itertools.product(*steps)
+                }
+                for text in texts:
+                    with self.subTest(modes=modes, interpretation=interp, text=text):
+                        self.assertEqual(
+                            re.match(regex, text) is not None, text in strings
+                        )
+
+    def test_cover_matches(self):
+        texts = [
+            "AB",
+            "'AB",
+            "''A|B",
+            "A~|.B",
+            "A^B",
+            "A'B",
+            "A^'B",
+            "EB",
+            "ABT",
+            "A&EB",
+            "'AB^",
+            "I'B",
+        ]
+        interps = [
+            ["A", "B"],
+            ["'", "A", ["|"], "B"],
+            ["A", "^", "B"],
+            ["A", "'", "B"],
+            ["A", ["~", "|", "."], "^", "'", "B"],
+        ]
+        strictness = list(regen.Strictness)
+        for search_mode in [regen.SearchMode.MATCH, regen.SearchMode.START]:
+            for uncertainty in range(3):
+                for modes in itertools.product(strictness, repeat=3):
+                    builder = regen.RegexBuilder(
+                        search_mode=search_mode,
+                        uncertainty=uncertainty,
+                        annotation_mode=modes[0],
+                        aspirate_mode=modes[1],
+                        disjoiner_mode=modes[2],
+                    )
+                    for interp in interps:
+                        self.assertPrefixesCover(builder, interp, texts)
+
+
+class TestCombinedPattern(unittest.TestCase):
+    texts = [
+        "AB About",
+        "'AB Habit",
+        "A~|.B Text",
+        "A^B Text",
+        "SSTN Text",
+        "S)STN Text",
+        "XSTN Text",
+        "NABT Text",
+        "ABT-N Text",
+        "B Text",
+    ]
+    interps = [
+        ["A", "B"],
+        ["'", "A", ["|"], "B"],
+        ["A", "^", "B"],
+        ["SS", "TN"],
+        ["S", "S", "TN"],
+        ["S", [")"], "S", "T", "N"],
+    ]
+
+    def test_matches_any(self):
+        for search_mode in regen.SearchMode:
+            for uncertainty in range(3):
+                builder = regen.RegexBuilder(
+                    search_mode=search_mode, uncertainty=uncertainty
+                )
+                patterns = builder.generate_patterns_map(self.interps)
+                combined = builder.generate_combined_pattern(self.interps)
+                for text in self.texts:
+                    with self.subTest(
+                        search_mode=search_mode, uncertainty=uncertainty, text=text
+                    ):
+                        self.assertEqual(
+                            bool(combined.search(text)),
+                            any(p.search(text) for _, p in patterns),
+                        )
+
+    def test_combine_combined(self):
+        builder = regen.RegexBuilder(uncertainty=1)
+        first = builder.generate_combined_pattern(self.interps[:3])
+        second = builder.generate_combined_pattern(self.interps[3:])
+        combined = re.compile(regen.combine_regexes([first.pattern, second.pattern]))
+        expected = builder.generate_combined_pattern(self.interps)
+        for text in self.texts:
+            with self.subTest(text=text):
+                self.assertEqual(
+                    bool(combined.search(text)), bool(expected.search(text))
+                )
+
+
 if __name__ == "__main__":
     unittest.main()
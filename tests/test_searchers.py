@@ -1,33 +1,122 @@
 from __future__ import annotations
 
+import asyncio
+import pickle
+import re
+import subprocess
+import sys
+import tempfile
+import threading
 import unittest
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from shutil import rmtree
 
-from grascii.dictionary import DictionaryNotFound
-from grascii.dictionary.build import DictionaryBuilder, DictionaryOutputOptions
-from grascii.parser import InvalidGrascii
-from grascii.searchers import GrasciiSearcher, RegexSearcher, ReverseSearcher
+from grascii import metrics
+from grascii.dictionary import Dictionary, DictionaryNotFound
+from grascii.dictionary.binary import BinaryShard
+from grascii.dictionary.build import (
+    DictionaryBuilder,
+    DictionaryFormat,
+    DictionaryOutputOptions,
+)
+from grascii.dictionary.strokes import STROKES_SUFFIX, TOKENS_CHECKSUM
+from grascii.interpreter import GrasciiInterpreter
+from grascii.parser import GrasciiParser, InvalidGrascii
+from grascii.regen import RegexBuilder, SearchMode, Strictness
+from grascii.searchers import (
+    GrasciiQuery,
+    GrasciiSearcher,
+    RegexSearcher,
+    ReverseSearcher,
+    SearchEngine,
+    SearchExecutor,
+    SearchPlan,
+    _get_pool,
+)
+from grascii.similarities import SimilarityMatrix, get_similarity_matrix
 
 output_dir = "tests/dictionaries/tosearch"
 sorted_output_dir = "test/dictionaries/sorted"
+binary_output_dir = "tests/dictionaries/binary"
+sorted_text_output_dir = "tests/dictionaries/sorted_text"
+sorted_binary_output_dir = "tests/dictionaries/sorted_binary"
+indexed_text_output_dir = "tests/dictionaries/indexed_text"
+indexed_binary_output_dir = "tests/dictionaries/indexed_binary"
+strokes_text_output_dir = "tests/dictionaries/strokes_text"
+strokes_binary_output_dir = "tests/dictionaries/strokes_binary"
 
 
-def build_dictionary(src, dest):
+def build_dictionary(
+    src,
+    dest,
+    output_format=DictionaryFormat.TEXT,
+    sort=False,
+    index=False,
+    strokes=False,
+):
     rmtree(dest, ignore_errors=True)
     infiles = [Path(src)]
     builder = DictionaryBuilder()
-    builder.build(infiles=infiles, output=DictionaryOutputOptions(dest))
+    builder.build(
+        infiles=infiles,
+        output=DictionaryOutputOptions(
+            dest, format=output_format, sort=sort, index=index, strokes=strokes
+        ),
+    )
 
 
 def setUpModule():
     build_dictionary("tests/dictionaries/search.txt", output_dir)
     build_dictionary("tests/dictionaries/sort.txt", sorted_output_dir)
+    build_dictionary(
+        "tests/dictionaries/search.txt", binary_output_dir, DictionaryFormat.BINARY
+    )
+    build_dictionary("tests/dictionaries/search.txt", sorted_text_output_dir, sort=True)
+    build_dictionary(
+        "tests/dictionaries/search.txt",
+        sorted_binary_output_dir,
+        DictionaryFormat.BINARY,
+        sort=True,
+    )
+    build_dictionary(
+        "tests/dictionaries/search.txt", indexed_text_output_dir, index=True
+    )
+    build_dictionary(
+        "tests/dictionaries/search.txt",
+        indexed_binary_output_dir,
+        DictionaryFormat.BINARY,
+        index=True,
+    )
+    build_dictionary(
+        "tests/dictionaries/search.txt", strokes_text_output_dir, strokes=True
+    )
+    build_dictionary(
+        "tests/dictionaries/search.txt",
+        strokes_binary_output_dir,
+        DictionaryFormat.BINARY,
+        sort=True,
+        strokes=True,
+    )
 
 
 def tearDownModule():
     rmtree(output_dir, ignore_errors=True)
     rmtree(sorted_output_dir, ignore_errors=True)
+    rmtree(binary_output_dir, ignore_errors=True)
+    rmtree(sorted_text_output_dir, ignore_errors=True)
+    rmtree(sorted_binary_output_dir, ignore_errors=True)
+    rmtree(indexed_text_output_dir, ignore_errors=True)
+    rmtree(indexed_binary_output_dir, ignore_errors=True)
+    rmtree(strokes_text_output_dir, ignore_errors=True)
+    rmtree(strokes_binary_output_dir, ignore_errors=True)
+
+
+def result_keys(results):
+    return [
+        (r.entry, [(interp, match.group(0)) for interp, match in r.matches])
+        for r in results
+    ]
 
 
 class TestGrasciiSearcher(unittest.TestCase):
@@ -65,6 +154,82 @@ class TestGrasciiSearcher(unittest.TestCase):
         )
         self.assertGreater(all_interpretation_count, best_interpretation_count)
 
+    def test_limit(self):
+        searcher = GrasciiSearcher(dictionaries=[output_dir])
+        expected = searcher.sorted_search(grascii="ABT", search_mode="contain")
+        self.assertGreater(len(expected), 5)
+        for limit in [0, 1, 5, len(expected) + 1]:
+            with self.subTest(limit=limit):
+                results = searcher.sorted_search(
+                    grascii="ABT", search_mode="contain", limit=limit
+                )
+                self.assertListEqual(
+                    result_keys(results), result_keys(expected[:limit])
+                )
+
+    def test_limit_uncertainty(self):
+        searcher = GrasciiSearcher(dictionaries=[output_dir])
+        for grascii in ["SSTN", "A|^GAT", "FTH)"]:
+            kwargs = {"grascii": grascii, "interpretation": "all", "uncertainty": 2}
+            expected = searcher.sorted_search(**kwargs)
+            for limit in [1, 4, 20]:
+                with self.subTest(grascii=grascii, limit=limit):
+                    results = searcher.sorted_search(limit=limit, **kwargs)
+                    self.assertListEqual(
+                        result_keys(results), result_keys(expected[:limit])
+                    )
+
+    def test_limit_bound(self):
+        searcher = GrasciiSearcher(dictionaries=[output_dir])
+        kwargs = {"grascii": "SSTN", "search_mode": "contain", "uncertainty": 2}
+        (best,) = searcher.sorted_search(limit=1, **kwargs)
+        bound = metrics.grascii_standard(best)
+        results = list(searcher.search(**kwargs))
+        # the keys of results that cannot beat the best result are not computed
+        skipped = [
+            r for r in results if metrics.bounded_grascii_standard(r, bound) is None
+        ]
+        self.assertGreater(len(skipped), 0)
+        for result in skipped:
+            self.assertGreater(metrics.grascii_standard(result), bound)
+
+    def test_similarity(self):
+        matrix = SimilarityMatrix.from_edges([(("F",), ("V",))])
+        searcher = GrasciiSearcher(dictionaries=[output_dir], similarity=matrix)
+        self.assertIs(
+            GrasciiSearcher(dictionaries=[output_dir]).similarity,
+            get_similarity_matrix(),
+        )
+        results = searcher.sorted_search(grascii="FTH", uncertainty=1)
+        default = GrasciiSearcher(dictionaries=[output_dir]).sorted_search(
+            grascii="FTH", uncertainty=1
+        )
+        self.assertGreater(len(results), 0)
+        self.assertLess(len(results), len(default))
+        for result in results:
+            self.assertIs(result.similarity, matrix)
+        # T and D are only similar in the default graph
+        result = next(r for r in default if "TH" not in r.matches[0][1].group(0))
+        distance = metrics.grascii_standard(result)
+        result.similarity = matrix
+        self.assertGreater(metrics.grascii_standard(result), distance)
+
+    def test_score_many(self):
+        searcher = GrasciiSearcher(dictionaries=[output_dir])
+        results = list(
+            searcher.search(grascii="SSTN", interpretation="all", uncertainty=2)
+        )
+        self.assertListEqual(
+            metrics.score_many(metrics.grascii_standard, results),
+            [metrics.grascii_standard(result) for result in results],
+        )
+
+    def test_reverse_limit(self):
+        searcher = ReverseSearcher(dictionaries=[output_dir])
+        expected = searcher.sorted_search(reverse="a")
+        results = searcher.sorted_search(reverse="a", limit=3)
+        self.assertListEqual(result_keys(results), result_keys(expected[:3]))
+
     def test_search_mode(self):
         searcher = GrasciiSearcher(dictionaries=[output_dir])
         match_count = len(searcher.sorted_search(grascii="ABT", search_mode="match"))
@@ -92,6 +257,1005 @@ class TestGrasciiSearcher(unittest.TestCase):
             GrasciiSearcher(dictionaries=[":should-not-exist"])
 
 
+def candidate_count(plan, path, name):
+    dictionary = Dictionary.new(path)
+    ranges = plan.find_ranges(dictionary, name, dictionary.load(name))
+    return None if ranges is None else sum(end - start for start, end in ranges)
+
+
+class SameResultsMixin:
+    """Compares searches of other dictionaries or with other options with the
+    same searches of ``reference``."""
+
+    reference = [output_dir]
+    variants: list[dict] = []
+    """The options of the searchers compared with the reference."""
+    ordered = True
+
+    def assertSameResults(self, searcher_class, **kwargs):
+        expected = searcher_class(dictionaries=self.reference).search(**kwargs)
+        expected = result_keys(expected)
+        if not self.ordered:
+            expected.sort(key=repr)
+        for options in self.variants:
+            with self.subTest(**options):
+                results = result_keys(searcher_class(**options).search(**kwargs))
+                if not self.ordered:
+                    results.sort(key=repr)
+                self.assertListEqual(results, expected)
+
+    def assertNarrowed(self, searcher, path, name, **kwargs):
+        """Check that a search of a dictionary file only scans some of its
+        entries, and that they include every result in the file."""
+
+        count = candidate_count(searcher.plan(**kwargs), path, name)
+        results = [r for r in searcher.search(**kwargs) if r.location[0] == name]
+        self.assertIsNotNone(count)
+        self.assertGreater(len(results), 0)
+        self.assertLessEqual(len(results), count)
+        self.assertLess(count, len(Dictionary.new(path).load(name)))
+
+
+class TestBinaryDictionary(SameResultsMixin, unittest.TestCase):
+    variants = [{"dictionaries": [binary_output_dir]}]
+
+    def test_binary(self):
+        shard = Dictionary.new(binary_output_dir).load("A")
+        self.assertIsInstance(shard, BinaryShard)
+        self.assertTrue(shard.is_ascii)
+
+    def test_grascii_search(self):
+        for search_mode in ["match", "start", "contain", "end"]:
+            for uncertainty in range(3):
+                with self.subTest(search_mode=search_mode, uncertainty=uncertainty):
+                    self.assertSameResults(
+                        GrasciiSearcher,
+                        grascii="ABT",
+                        search_mode=search_mode,
+                        uncertainty=uncertainty,
+                    )
+
+    def test_all_interpretations(self):
+        self.assertSameResults(
+            GrasciiSearcher, grascii="SSTN", interpretation="all", uncertainty=2
+        )
+
+    def test_reverse_search(self):
+        self.assertSameResults(ReverseSearcher, reverse="habit")
+        self.assertSameResults(ReverseSearcher, reverse="law")
+
+    def test_regex_search(self):
+        self.assertSameResults(RegexSearcher, regexp=r"B\S* ")
+        self.assertSameResults(RegexSearcher, regexp="Ré")
+
+
+class TestSortedDictionary(SameResultsMixin, unittest.TestCase):
+    variants = [
+        {"dictionaries": [sorted_text_output_dir]},
+        {"dictionaries": [sorted_binary_output_dir]},
+    ]
+    ordered = False
+
+    def test_sorted(self):
+        for dictionary in [sorted_text_output_dir, sorted_binary_output_dir]:
+            shard = Dictionary.new(dictionary).load("A")
+            self.assertTrue(shard.sorted)
+            keys = [entry.grascii for entry in shard]
+            self.assertListEqual(keys, sorted(keys))
+
+    def test_find_ranges(self):
+        builder = RegexBuilder(aspirate_mode=Strictness.HIGH)
+        steps = [builder.get_prefix_steps(["A", "B", "T"])]
+        for dictionary in [sorted_text_output_dir, sorted_binary_output_dir]:
+            shard = Dictionary.new(dictionary).load("A")
+            ranges = shard.find_ranges(steps)
+            entries = [
+                shard[i].grascii for start, end in ranges for i in range(start, end)
+            ]
+            self.assertListEqual(entries, ["ABTL", "ABTM"])
+            self.assertListEqual(shard.find_ranges([[["ABTX"]]]), [])
+
+    def test_narrowed(self):
+        for dictionary in [sorted_text_output_dir, sorted_binary_output_dir]:
+            searcher = GrasciiSearcher(dictionaries=[dictionary])
+            for grascii in ["ABT", "ABTM", "A|^GAT"]:
+                with self.subTest(dictionary=dictionary, grascii=grascii):
+                    self.assertNarrowed(
+                        searcher, dictionary, "A", grascii=grascii, search_mode="start"
+                    )
+        # unsorted files are searched whole
+        plan = GrasciiSearcher(dictionaries=[output_dir]).plan(
+            grascii="ABT", search_mode="start"
+        )
+        self.assertIsNone(candidate_count(plan, output_dir, "A"))
+
+    def test_grascii_search(self):
+        queries = ["ABT", "'ABT", "EN'ABT", "A|^GAT", "OBVA^'T", "STN", "FTH)"]
+        for grascii in queries:
+            for search_mode in ["match", "start"]:
+                for uncertainty in range(3):
+                    with self.subTest(
+                        grascii=grascii,
+                        search_mode=search_mode,
+                        uncertainty=uncertainty,
+                    ):
+                        self.assertSameResults(
+                            GrasciiSearcher,
+                            grascii=grascii,
+                            search_mode=search_mode,
+                            uncertainty=uncertainty,
+                        )
+
+    def test_strictness(self):
+        for mode in ["discard", "retain", "strict"]:
+            for grascii in ["'ABT", "A|^GAT", "OBVA^'T"]:
+                with self.subTest(grascii=grascii, mode=mode):
+                    self.assertSameResults(
+                        GrasciiSearcher,
+                        grascii=grascii,
+                        annotation_mode=mode,
+                        aspirate_mode=mode,
+                        disjoiner_mode=mode,
+                        uncertainty=1,
+                    )
+
+    def test_all_interpretations(self):
+        self.assertSameResults(
+            GrasciiSearcher, grascii="SSTN", interpretation="all", uncertainty=2
+        )
+
+    def test_fix_first(self):
+        self.assertSameResults(
+            GrasciiSearcher, grascii="ABT", fix_first=True, uncertainty=2
+        )
+
+
+class TestTrieEngine(SameResultsMixin, unittest.TestCase):
+    variants = [
+        {"dictionaries": [output_dir], "engine": "trie"},
+        {"dictionaries": [binary_output_dir], "engine": "trie"},
+    ]
+
+    def assertSameResults(self, **kwargs):
+        super().assertSameResults(GrasciiSearcher, **kwargs)
+
+    def test_grascii_search(self):
+        queries = ["ABT", "'ABT", "EN'ABT", "A|^GAT", "OBVA^'T", "STN", "FTH)", "T"]
+        for grascii in queries:
+            for search_mode in ["match", "start"]:
+                for uncertainty in range(3):
+                    with self.subTest(
+                        grascii=grascii,
+                        search_mode=search_mode,
+                        uncertainty=uncertainty,
+                    ):
+                        self.assertSameResults(
+                            grascii=grascii,
+                            search_mode=search_mode,
+                            uncertainty=uncertainty,
+                        )
+
+    def test_strictness(self):
+        for mode in ["discard", "retain", "strict"]:
+            for grascii in ["'ABT", "A|^GAT", "OBVA^'T"]:
+                with self.subTest(grascii=grascii, mode=mode):
+                    self.assertSameResults(
+                        grascii=grascii,
+                        annotation_mode=mode,
+                        aspirate_mode=mode,
+                        disjoiner_mode=mode,
+                        uncertainty=1,
+                    )
+
+    def test_all_interpretations(self):
+        self.assertSameResults(grascii="SSTN", interpretation="all", uncertainty=2)
+
+    def test_fix_first(self):
+        self.assertSameResults(grascii="ABT", fix_first=True, uncertainty=2)
+
+    def test_contain(self):
+        self.assertSameResults(grascii="ABT", search_mode="contain", uncertainty=1)
+
+    def test_default_engine(self):
+        searcher = GrasciiSearcher(dictionaries=[output_dir])
+        self.assertIs(searcher.engine, SearchEngine.REGEX)
+
+    def test_narrowed(self):
+        # the trie narrows unsorted files too
+        searcher = GrasciiSearcher(dictionaries=[output_dir], engine="trie")
+        self.assertIs(searcher.engine, SearchEngine.TRIE)
+        for search_mode in ["match", "start"]:
+            with self.subTest(search_mode=search_mode):
+                self.assertNarrowed(
+                    searcher, output_dir, "A", grascii="ABTM", search_mode=search_mode
+                )
+
+
+class TestUncertaintyBudget(unittest.TestCase):
+    def keys(self, **kwargs):
+        searcher = GrasciiSearcher(dictionaries=[output_dir])
+        return {r.entry for r in searcher.search(**kwargs)}
+
+    def grascii_keys(self, dictionary, **kwargs):
+        searcher = GrasciiSearcher(dictionaries=[dictionary])
+        return {r.entry.grascii for r in searcher.search(**kwargs)}
+
+    def test_over_budget(self):
+        with tempfile.TemporaryDirectory() as directory:
+            src = Path(directory, "src.txt")
+            src.write_text("MMN Mmn\nMM Mm\nNMN Nmn\nNN Nn\nMN Mn\n")
+            dictionary = Path(directory, "out")
+            build_dictionary(src, dictionary)
+            # MMN can only be read as M MN, which costs 2
+            for search_mode in ["match", "end"]:
+                with self.subTest(search_mode=search_mode):
+                    self.assertSetEqual(
+                        self.grascii_keys(
+                            dictionary,
+                            grascii="NM",
+                            uncertainty_budget=1,
+                            search_mode=search_mode,
+                        ),
+                        {"MM", "NMN", "NN"},
+                    )
+            self.assertIn(
+                "MMN",
+                self.grascii_keys(dictionary, grascii="NM", uncertainty_budget=2),
+            )
+
+    def test_budget_zero(self):
+        for grascii in ["ABT", "FTH"]:
+            for search_mode in ["match", "start", "contain", "end"]:
+                with self.subTest(grascii=grascii, search_mode=search_mode):
+                    kwargs = {"grascii": grascii, "search_mode": search_mode}
+                    self.assertSetEqual(
+                        self.keys(uncertainty_budget=0, **kwargs),
+                        self.keys(uncertainty=0, **kwargs),
+                    )
+
+    def test_within_uncertainty(self):
+        for grascii in ["ABT", "FTH", "A|^GAT"]:
+            for search_mode in ["match", "start", "contain", "end"]:
+                kwargs = {"grascii": grascii, "search_mode": search_mode}
+                one = self.keys(uncertainty_budget=1, **kwargs)
+                two = self.keys(uncertainty_budget=2, **kwargs)
+                with self.subTest(grascii=grascii, search_mode=search_mode):
+                    self.assertLessEqual(self.keys(uncertainty=0, **kwargs), one)
+                    self.assertLessEqual(one, two)
+                    self.assertLessEqual(two, self.keys(uncertainty=2, **kwargs))
+
+    def test_total(self):
+        self.assertLess(
+            self.keys(grascii="FTH", uncertainty_budget=1),
+            self.keys(grascii="FTH", uncertainty=1),
+        )
+
+    def test_fix_first(self):
+        kwargs = {"grascii": "FTH", "uncertainty_budget": 2}
+        self.assertLess(self.keys(fix_first=True, **kwargs), self.keys(**kwargs))
+
+    def test_all_interpretations(self):
+        kwargs = {"grascii": "SSTN", "interpretation": "all"}
+        self.assertSetEqual(
+            self.keys(uncertainty_budget=0, **kwargs),
+            self.keys(uncertainty=0, **kwargs),
+        )
+        self.assertLessEqual(
+            self.keys(uncertainty_budget=2, **kwargs),
+            self.keys(uncertainty=2, **kwargs),
+        )
+
+
+class TestIndexedDictionary(SameResultsMixin, unittest.TestCase):
+    variants = [
+        {"dictionaries": [indexed_text_output_dir]},
+        {"dictionaries": [indexed_binary_output_dir]},
+    ]
+
+    def test_narrowed(self):
+        for dictionary in [indexed_text_output_dir, indexed_binary_output_dir]:
+            searcher = GrasciiSearcher(dictionaries=[dictionary])
+            for search_mode in ["contain", "end"]:
+                with self.subTest(dictionary=dictionary, search_mode=search_mode):
+                    self.assertNarrowed(
+                        searcher,
+                        dictionary,
+                        "A",
+                        grascii="ABT",
+                        search_mode=search_mode,
+                    )
+            with self.subTest(dictionary=dictionary, reverse="law"):
+                searcher = ReverseSearcher(dictionaries=[dictionary])
+                self.assertNarrowed(searcher, dictionary, "S", reverse="law")
+        # dictionaries without indexes are searched whole
+        plan = GrasciiSearcher(dictionaries=[output_dir]).plan(
+            grascii="ABT", search_mode="contain"
+        )
+        self.assertIsNone(candidate_count(plan, output_dir, "S"))
+
+    def test_grascii_search(self):
+        queries = ["ABT", "T", "NT", "N^T", "'ABT", "A|^GAT", "SSTN", "FTH)", "A&ET"]
+        for grascii in queries:
+            for search_mode in ["contain", "end"]:
+                for uncertainty in range(3):
+                    with self.subTest(
+                        grascii=grascii,
+                        search_mode=search_mode,
+                        uncertainty=uncertainty,
+                    ):
+                        self.assertSameResults(
+                            GrasciiSearcher,
+                            grascii=grascii,
+                            search_mode=search_mode,
+                            uncertainty=uncertainty,
+                        )
+
+    def test_strictness(self):
+        for mode in ["discard", "retain", "strict"]:
+            for grascii in ["'ABT", "A|^GAT", "OBVA^'T"]:
+                with self.subTest(grascii=grascii, mode=mode):
+                    self.assertSameResults(
+                        GrasciiSearcher,
+                        grascii=grascii,
+                        search_mode="contain",
+                        annotation_mode=mode,
+                        aspirate_mode=mode,
+                        disjoiner_mode=mode,
+                        uncertainty=1,
+                    )
+
+    def test_all_interpretations(self):
+        self.assertSameResults(
+            GrasciiSearcher,
+            grascii="SSTN",
+            search_mode="contain",
+            interpretation="all",
+            uncertainty=1,
+        )
+
+    def test_fix_first(self):
+        self.assertSameResults(
+            GrasciiSearcher,
+            grascii="ABT",
+            search_mode="contain",
+            fix_first=True,
+            uncertainty=2,
+        )
+
+    def test_reverse_search(self):
+        words = [
+            "habit",
+            "HABIT",
+            "hab",
+            "law",
+            "son-in",
+            "in-law",
+            "a habit",
+            "habit time",
+            "ment",
+            "é",
+            " habit",
+            "-law",
+            "xyz",
+        ]
+        for word in words:
+            with self.subTest(word=word):
+                self.assertSameResults(ReverseSearcher, reverse=word)
+
+    def test_reverse_sorted_search(self):
+        expected = ReverseSearcher(dictionaries=[output_dir]).sorted_search(
+            reverse="habit"
+        )
+        for dictionary in [indexed_text_output_dir, indexed_binary_output_dir]:
+            results = ReverseSearcher(dictionaries=[dictionary]).sorted_search(
+                reverse="habit"
+            )
+            self.assertListEqual(result_keys(results), result_keys(expected))
+
+    def test_stale_index(self):
+        with open(Path(indexed_text_output_dir, "S"), "a") as f:
+            f.write("SABT Stale\n")
+        try:
+            searcher = GrasciiSearcher(dictionaries=[indexed_text_output_dir])
+            plan = searcher.plan(grascii="ABT", search_mode="contain")
+            self.assertIsNone(candidate_count(plan, indexed_text_output_dir, "S"))
+            self.assertIsNotNone(candidate_count(plan, indexed_text_output_dir, "A"))
+            results = searcher.search(grascii="ABT", search_mode="contain")
+            self.assertIn("SABT", [r.entry.grascii for r in results])
+        finally:
+            build_dictionary(
+                "tests/dictionaries/search.txt", indexed_text_output_dir, index=True
+            )
+
+    def test_stale_index_same_count(self):
+        path = Path(indexed_text_output_dir, "S")
+        lines = path.read_text().splitlines(keepends=True)
+        path.write_text("SABT Stale\n" + "".join(lines[1:]))
+        try:
+            dictionary = Dictionary.new(indexed_text_output_dir)
+            index = dictionary.load_ngram_index()
+            self.assertIsNotNone(index)
+            self.assertEqual(index.counts["S"], len(dictionary.load("S")))
+            self.assertFalse(index.is_current("S", dictionary.load("S")))
+            plan = GrasciiSearcher(dictionaries=[indexed_text_output_dir]).plan(
+                grascii="ABT", search_mode="contain"
+            )
+            self.assertIsNone(candidate_count(plan, indexed_text_output_dir, "S"))
+            results = GrasciiSearcher(dictionaries=[indexed_text_output_dir]).search(
+                grascii="ABT", search_mode="contain"
+            )
+            self.assertIn("SABT", [r.entry.grascii for r in results])
+        finally:
+            build_dictionary(
+                "tests/dictionaries/search.txt", indexed_text_output_dir, index=True
+            )
+
+
+class TestCombinedPattern(unittest.TestCase):
+    def test_prefilter(self):
+        builder = RegexBuilder(uncertainty=2)
+        interps = list(GrasciiParser().interpret("SSTN"))
+        patterns = builder.generate_patterns_map(interps)
+        prefilter = builder.generate_combined_pattern(interps)
+        for dictionary in [output_dir, binary_output_dir]:
+            searcher = GrasciiSearcher(dictionaries=[dictionary])
+            letters = builder.get_starting_letters(interps)
+            expected = searcher.perform_search(patterns, letters)
+            results = searcher.perform_search(patterns, letters, prefilter=prefilter)
+            with self.subTest(dictionary=dictionary):
+                self.assertListEqual(result_keys(results), result_keys(expected))
+
+
+class TestSearchMany(unittest.TestCase):
+    queries = ["ABT", "'ABT", "A|^GAT", "STN", "FTH)", "ABT", "SSTN"]
+
+    def assertSameAsSearch(self, dictionary, queries=None, **kwargs):
+        queries = queries or self.queries
+        searcher = GrasciiSearcher(dictionaries=[dictionary])
+        results = list(searcher.search_many(queries, **kwargs))
+        for grascii in set(queries):
+            with self.subTest(dictionary=dictionary, grascii=grascii, **kwargs):
+                expected = searcher.search(grascii=grascii, **kwargs)
+                found = [r for query, r in results if query == grascii]
+                # the results of repeated queries are yielded together
+                count = queries.count(grascii)
+                self.assertListEqual(
+                    result_keys(found),
+                    [key for key in result_keys(expected) for _ in range(count)],
+                )
+
+    def test_search_many(self):
+        for dictionary in [output_dir, sorted_text_output_dir]:
+            for search_mode in ["match", "start", "contain", "end"]:
+                for uncertainty in range(3):
+                    self.assertSameAsSearch(
+                        dictionary, search_mode=search_mode, uncertainty=uncertainty
+                    )
+
+    def test_narrowed(self):
+        for dictionary in [sorted_binary_output_dir, indexed_text_output_dir]:
+            for search_mode in ["start", "contain"]:
+                self.assertSameAsSearch(
+                    dictionary, search_mode=search_mode, interpretation="all"
+                )
+
+    def test_all_interpretations(self):
+        for dictionary in [output_dir, binary_output_dir]:
+            for uncertainty in range(3):
+                self.assertSameAsSearch(
+                    dictionary, interpretation="all", uncertainty=uncertainty
+                )
+
+    def test_uncertainty_budget(self):
+        for search_mode in ["match", "start", "contain", "end"]:
+            for budget in range(3):
+                self.assertSameAsSearch(
+                    output_dir, search_mode=search_mode, uncertainty_budget=budget
+                )
+        with tempfile.TemporaryDirectory() as directory:
+            src = Path(directory, "src.txt")
+            src.write_text("MN Mn\nMMN Mmn\nNN Nn\nMM Mm\n")
+            dictionary = Path(directory, "out")
+            build_dictionary(src, dictionary)
+            # the budget finds fewer entries than the patterns of NM match,
+            # so MN must not be found for NM through the ranges of MN
+            self.assertSameAsSearch(
+                dictionary, ["NM", "MN"], search_mode="match", uncertainty_budget=1
+            )
+
+    def test_invalid(self):
+        searcher = GrasciiSearcher(dictionaries=[output_dir])
+        with self.assertRaises(InvalidGrascii):
+            searcher.search_many(["ABT", "ABT|"])
+
+    def test_empty(self):
+        searcher = GrasciiSearcher(dictionaries=[output_dir])
+        self.assertListEqual(list(searcher.search_many([])), [])
+
+
+class TestGrasciiQuery(unittest.TestCase):
+    options = [
+        {"grascii": "ABT"},
+        {"grascii": "abt", "uncertainty": 2},
+        {"grascii": "A|^GAT", "search_mode": "start", "interpretation": "all"},
+        {"grascii": "SSTN", "search_mode": "contain", "fix_first": True},
+        {"grascii": "'ABT", "annotation_mode": "strict"},
+        {"grascii": "FTH)", "search_mode": "end", "aspirate_mode": "retain"},
+    ]
+
+    def test_create(self):
+        query = GrasciiQuery.create("abt", search_mode="start", uncertainty=1)
+        self.assertEqual(query.grascii, "ABT")
+        self.assertIs(query.search_mode, SearchMode.START)
+        self.assertEqual(query.uncertainty, 1)
+        self.assertIs(query.annotation_mode, Strictness.LOW)
+        self.assertFalse(query.fix_first)
+
+    def test_invalid_option(self):
+        query = GrasciiQuery.create("ABT", search_mode="invalid")
+        self.assertIs(query.search_mode, SearchMode.MATCH)
+
+    def test_uncertainty_budget(self):
+        max_distance = get_similarity_matrix().max_distance
+        for budget in [0, max_distance]:
+            with self.subTest(budget=budget):
+                query = GrasciiQuery.create("ABT", uncertainty_budget=budget)
+                self.assertEqual(query.uncertainty_budget, budget)
+        for budget in [-1, max_distance + 1]:
+            with self.subTest(budget=budget), self.assertRaises(ValueError):
+                GrasciiQuery.create("ABT", uncertainty_budget=budget)
+        searcher = GrasciiSearcher(dictionaries=[output_dir])
+        with self.assertRaises(ValueError):
+            searcher.search(grascii="ABT", uncertainty_budget=-1)
+
+    def test_search_query(self):
+        searcher = GrasciiSearcher(dictionaries=[output_dir])
+        for kwargs in self.options:
+            with self.subTest(**kwargs):
+                self.assertListEqual(
+                    result_keys(searcher.search_query(GrasciiQuery.create(**kwargs))),
+                    result_keys(searcher.search(**kwargs)),
+                )
+
+    def test_concurrent_searches(self):
+        searcher = GrasciiSearcher(dictionaries=[output_dir, sorted_text_output_dir])
+        expected = [result_keys(searcher.search(**kwargs)) for kwargs in self.options]
+        with ThreadPoolExecutor(4) as pool:
+            found = pool.map(
+                lambda kwargs: result_keys(searcher.search(**kwargs)),
+                self.options * 10,
+            )
+        self.assertListEqual(list(found), expected * 10)
+        self.assertFalse(hasattr(searcher, "uncertainty"))
+
+
+class TestThreadSafety(unittest.TestCase):
+    threads = 8
+
+    def run_together(self, function):
+        barrier = threading.Barrier(self.threads)
+
+        def run():
+            barrier.wait()
+            return function()
+
+        with ThreadPoolExecutor(self.threads) as pool:
+            futures = [pool.submit(run) for _ in range(self.threads)]
+            return [future.result() for future in futures]
+
+    def test_parser(self):
+        searcher = GrasciiSearcher(dictionaries=[output_dir])
+        parsers = self.run_together(lambda: searcher._parser)
+        self.assertEqual(len({id(parser) for parser in parsers}), 1)
+
+    def test_index_candidates(self):
+        searcher = GrasciiSearcher(dictionaries=[indexed_text_output_dir])
+        plan = searcher.plan(grascii="ABT", search_mode="contain", uncertainty=1)
+        (dictionary,) = searcher.dictionaries
+        shard = dictionary.load("A")
+        expected = plan.find_ranges(dictionary, "A", shard)
+        self.assertIsNotNone(expected)
+        plan = pickle.loads(pickle.dumps(plan))
+        found = self.run_together(lambda: plan.find_ranges(dictionary, "A", shard))
+        self.assertListEqual(found, [expected] * self.threads)
+
+
+class TestUseInterpreter(unittest.TestCase):
+    queries = ["ABT", "NTN", "'ABT", "A|^GAT", "STN", "FTH)", "SSTN", "A&ET"]
+    # GrasciiInterpreter once read these with PNT and JND
+    queries += ["BPNT", "APNTA", "AJND"]
+
+    def test_same_results(self):
+        parser_searcher = GrasciiSearcher(dictionaries=[output_dir])
+        searcher = GrasciiSearcher(dictionaries=[output_dir], use_interpreter=True)
+        for grascii in self.queries:
+            for search_mode in ["match", "start", "contain"]:
+                for interpretation in ["best", "all"]:
+                    kwargs = {
+                        "grascii": grascii,
+                        "search_mode": search_mode,
+                        "interpretation": interpretation,
+                        "uncertainty": 1,
+                    }
+                    with self.subTest(**kwargs):
+                        self.assertListEqual(
+                            result_keys(searcher.search(**kwargs)),
+                            result_keys(parser_searcher.search(**kwargs)),
+                        )
+
+    def test_invalid(self):
+        searcher = GrasciiSearcher(dictionaries=[output_dir], use_interpreter=True)
+        with self.assertRaises(InvalidGrascii) as cm:
+            searcher.search(grascii="ABT^^")
+        self.assertEqual(cm.exception.grascii, "ABT^^")
+        self.assertTrue(cm.exception.context)
+
+    def test_lark_not_imported(self):
+        code = f"""
+import sys
+from grascii.searchers import GrasciiSearcher
+searcher = GrasciiSearcher(dictionaries=[{str(Path(output_dir).resolve())!r}],
+                           use_interpreter=True)
+assert list(searcher.search(grascii="ABT"))
+assert "lark" not in sys.modules
+"""
+        # warm the cache of the Grascii regular expression
+        GrasciiInterpreter()
+        subprocess.run([sys.executable, "-c", code], check=True)
+
+
+class TestSearchPlan(unittest.TestCase):
+    def test_plan(self):
+        searcher = GrasciiSearcher(dictionaries=[output_dir])
+        plan = searcher.plan(grascii="abt", search_mode="start", interpretation="all")
+        self.assertEqual(
+            plan.query,
+            GrasciiQuery.create("ABT", search_mode="start", interpretation="all"),
+        )
+        self.assertListEqual(
+            plan.interpretations, list(GrasciiParser().interpret("ABT"))
+        )
+        self.assertEqual(len(plan.patterns), len(plan.interpretations))
+        self.assertIn("A", plan.starting_letters)
+
+    def test_invalid(self):
+        searcher = GrasciiSearcher(dictionaries=[output_dir])
+        with self.assertRaises(InvalidGrascii):
+            searcher.plan(grascii="ABT^^")
+
+    def test_max_interpretations(self):
+        searcher = GrasciiSearcher(dictionaries=[output_dir])
+        all_interpretations = list(GrasciiParser().interpret("NTNTNT"))
+        for limit in [0, 1, 3, 100]:
+            with self.subTest(limit=limit):
+                plan = searcher.plan(
+                    grascii="NTNTNT", interpretation="all", max_interpretations=limit
+                )
+                self.assertEqual(plan.query.max_interpretations, limit)
+                expected = all_interpretations[:limit] if limit else all_interpretations
+                self.assertListEqual(plan.interpretations, expected)
+                self.assertEqual(len(plan.patterns), len(expected))
+
+    def test_interpretation_time_limit(self):
+        searcher = GrasciiSearcher(dictionaries=[output_dir])
+        plan = searcher.plan(
+            grascii="NTNT" * 8, interpretation="all", interpretation_time_limit=1e-9
+        )
+        self.assertListEqual(
+            plan.interpretations, [next(GrasciiParser().interpret("NTNT" * 8))]
+        )
+
+    def test_execute(self):
+        searcher = GrasciiSearcher(dictionaries=[output_dir])
+        for grascii in ["ABT", "A|^GAT", "SSTN"]:
+            for search_mode in ["match", "start", "contain"]:
+                with self.subTest(grascii=grascii, search_mode=search_mode):
+                    plan = searcher.plan(
+                        grascii=grascii, search_mode=search_mode, interpretation="all"
+                    )
+                    expected = result_keys(
+                        searcher.search(
+                            grascii=grascii,
+                            search_mode=search_mode,
+                            interpretation="all",
+                        )
+                    )
+                    self.assertListEqual(result_keys(searcher.execute(plan)), expected)
+                    # plans can be executed repeatedly
+                    self.assertListEqual(result_keys(searcher.execute(plan)), expected)
+
+    def test_execute_dictionaries(self):
+        plan = GrasciiSearcher(dictionaries=[output_dir]).plan(
+            grascii="ABT", search_mode="contain", uncertainty=1
+        )
+        dictionaries = [indexed_text_output_dir, sorted_binary_output_dir]
+        expected = GrasciiSearcher(dictionaries=dictionaries).search(
+            grascii="ABT", search_mode="contain", uncertainty=1
+        )
+        results = plan.execute(Dictionary.new(name) for name in dictionaries)
+        self.assertListEqual(result_keys(results), result_keys(expected))
+
+    def test_pickle(self):
+        searcher = GrasciiSearcher(dictionaries=[sorted_text_output_dir])
+        for search_mode in ["match", "start", "contain"]:
+            with self.subTest(search_mode=search_mode):
+                plan = searcher.plan(
+                    grascii="ABT", search_mode=search_mode, uncertainty=1
+                )
+                copy = pickle.loads(pickle.dumps(plan))
+                self.assertIsInstance(copy, SearchPlan)
+                self.assertEqual(copy.query, plan.query)
+                self.assertListEqual(
+                    result_keys(searcher.execute(copy)),
+                    result_keys(searcher.execute(plan)),
+                )
+
+
+class _RecordingRangeFinder:
+    def __init__(self):
+        self.names = []
+        self.lock = threading.Lock()
+
+    def __call__(self, dictionary, name, shard):
+        with self.lock:
+            self.names.append(name)
+        return None
+
+
+class TestAsyncSearch(unittest.IsolatedAsyncioTestCase):
+    async def collect(self, results):
+        return [result async for result in results]
+
+    async def test_asearch(self):
+        for executor in SearchExecutor:
+            searcher = GrasciiSearcher(
+                dictionaries=[output_dir, sorted_binary_output_dir],
+                executor=executor,
+                workers=2,
+            )
+            for search_mode in ["match", "start", "contain"]:
+                with self.subTest(executor=executor, search_mode=search_mode):
+                    kwargs = {
+                        "grascii": "ABT",
+                        "search_mode": search_mode,
+                        "uncertainty": 1,
+                    }
+                    self.assertListEqual(
+                        result_keys(await self.collect(searcher.asearch(**kwargs))),
+                        result_keys(searcher.search(**kwargs)),
+                    )
+
+    async def test_regex_and_reverse(self):
+        searcher = RegexSearcher(dictionaries=[output_dir])
+        self.assertListEqual(
+            result_keys(await self.collect(searcher.asearch(regexp="^A"))),
+            result_keys(searcher.search(regexp="^A")),
+        )
+        searcher = ReverseSearcher(dictionaries=[indexed_text_output_dir])
+        self.assertListEqual(
+            result_keys(await self.collect(searcher.asearch(reverse="able"))),
+            result_keys(searcher.search(reverse="able")),
+        )
+
+    async def test_invalid(self):
+        searcher = GrasciiSearcher(dictionaries=[output_dir])
+        with self.assertRaises(InvalidGrascii):
+            await self.collect(searcher.asearch(grascii="ABT^^"))
+
+    async def test_asorted_search(self):
+        searcher = GrasciiSearcher(dictionaries=[output_dir])
+        for limit in [None, 0, 1, 5, 1000]:
+            with self.subTest(limit=limit):
+                self.assertListEqual(
+                    result_keys(
+                        await searcher.asorted_search(
+                            grascii="ABT", uncertainty=2, limit=limit
+                        )
+                    ),
+                    result_keys(
+                        searcher.sorted_search(
+                            grascii="ABT", uncertainty=2, limit=limit
+                        )
+                    ),
+                )
+        searcher = ReverseSearcher(dictionaries=[output_dir])
+        self.assertListEqual(
+            result_keys(await searcher.asorted_search(reverse="habit", limit=3)),
+            result_keys(searcher.sorted_search(reverse="habit", limit=3)),
+        )
+
+    async def test_asorted_search_keys_once(self):
+        searcher = RegexSearcher(dictionaries=[output_dir])
+        scored = []
+
+        def metric(result):
+            scored.append(result)
+            return len(result.entry.translation)
+
+        results = await searcher.asorted_search(metric, limit=3, regexp="^[A-Z]")
+        total = len(list(searcher.search(regexp="^[A-Z]")))
+        self.assertEqual(len(scored), total)
+        self.assertListEqual(
+            result_keys(results),
+            result_keys(searcher.sorted_search(metric, limit=3, regexp="^[A-Z]")),
+        )
+
+    def recording_searcher(self):
+        searcher = RegexSearcher(dictionaries=[output_dir])
+        finder = _RecordingRangeFinder()
+        pattern = re.compile("^[A-Z]")
+        plan = SearchPlan([(pattern.pattern, pattern)], "ABCDEFG", finder)
+        searcher.plan = lambda **kwargs: plan
+        return searcher, finder
+
+    async def test_close(self):
+        searcher, finder = self.recording_searcher()
+        results = searcher.asearch()
+        async for _ in results:
+            break
+        await results.aclose()
+        self.assertListEqual(finder.names, ["A"])
+
+    async def test_cancel(self):
+        searcher, finder = self.recording_searcher()
+        first = asyncio.Event()
+
+        async def consume():
+            async for _ in searcher.asearch():
+                first.set()
+                await asyncio.sleep(60)
+
+        task = asyncio.create_task(consume())
+        await first.wait()
+        task.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await task
+        self.assertListEqual(finder.names, ["A"])
+
+
+class TestSearchExecutors(SameResultsMixin, unittest.TestCase):
+    reference = [
+        output_dir,
+        binary_output_dir,
+        indexed_text_output_dir,
+        sorted_binary_output_dir,
+    ]
+    variants = [
+        {"dictionaries": reference, "executor": SearchExecutor.THREAD, "workers": 2},
+        {"dictionaries": reference, "executor": SearchExecutor.PROCESS, "workers": 2},
+    ]
+
+    def test_grascii_search(self):
+        for grascii in ["ABT", "A|^GAT", "SSTN"]:
+            for search_mode in ["match", "start", "contain"]:
+                self.assertSameResults(
+                    GrasciiSearcher,
+                    grascii=grascii,
+                    search_mode=search_mode,
+                    uncertainty=1,
+                    interpretation="all",
+                )
+
+    def test_trie_engine(self):
+        self.assertSameResults(
+            GrasciiSearcher, grascii="ABT", search_mode="start", engine="trie"
+        )
+
+    def test_reverse_search(self):
+        self.assertSameResults(ReverseSearcher, reverse="able")
+
+    def test_regex_search(self):
+        self.assertSameResults(RegexSearcher, regexp="^A")
+
+    def test_defaults(self):
+        searcher = GrasciiSearcher(dictionaries=[output_dir])
+        self.assertIs(searcher.executor, SearchExecutor.SERIAL)
+        self.assertGreater(searcher.workers, 0)
+
+    def test_invalid_executor(self):
+        searcher = GrasciiSearcher(dictionaries=[output_dir], executor="invalid")
+        self.assertIs(searcher.executor, SearchExecutor.SERIAL)
+
+    def test_close(self):
+        searcher = RegexSearcher(
+            dictionaries=[output_dir], executor=SearchExecutor.THREAD, workers=1
+        )
+        finder = _RecordingRangeFinder()
+        pattern = re.compile("^[A-Z]")
+        plan = SearchPlan([(pattern.pattern, pattern)], "ABCDEFG", finder)
+        results = iter(searcher.execute(plan))
+        next(results)
+        results.close()
+        # the single worker runs any files still submitted before this task
+        _get_pool(SearchExecutor.THREAD, 1).submit(int).result()
+        self.assertListEqual(finder.names, ["A"])
+
+    def test_pickle_plan(self):
+        searcher = GrasciiSearcher(dictionaries=[indexed_text_output_dir])
+        for search_mode in ["start", "contain"]:
+            with self.subTest(search_mode=search_mode):
+                plan = searcher.plan(
+                    grascii="ABT", search_mode=search_mode, uncertainty=1
+                )
+                self.assertIsNotNone(pickle.loads(pickle.dumps(plan)))
+
+
+class TestStrokeFiles(unittest.TestCase):
+    def test_interpretation(self):
+        interpreter = GrasciiInterpreter()
+        for dictionary in [output_dir, strokes_text_output_dir]:
+            searcher = RegexSearcher(dictionaries=[dictionary])
+            for result in searcher.search(regexp="^[A-Z]"):
+                with self.subTest(dictionary=dictionary, entry=result.entry):
+                    self.assertEqual(
+                        result.interpretation,
+                        interpreter.interpret(result.entry.grascii),
+                    )
+
+    def test_interpretation_from_stroke_file(self):
+        for dictionary in [strokes_text_output_dir, strokes_binary_output_dir]:
+            results = list(
+                GrasciiSearcher(dictionaries=[dictionary]).search(grascii="ABT")
+            )
+            self.assertTrue(results)
+            for result in results:
+                name, index = result.location
+                strokes = result.dictionary.load_strokes(name)
+                self.assertIsNotNone(strokes)
+                self.assertEqual(result.interpretation, strokes[index])
+                self.assertEqual(
+                    result.interpretation,
+                    GrasciiInterpreter().interpret(result.entry.grascii),
+                )
+
+    def test_no_stroke_files(self):
+        dictionary = Dictionary.new(output_dir)
+        self.assertIsNone(dictionary.load_strokes("A"))
+
+    def test_stale_stroke_file_same_count(self):
+        path = Path(strokes_text_output_dir, "S")
+        lines = path.read_text().splitlines(keepends=True)
+        path.write_text("SABT Stale\n" + "".join(lines[1:]))
+        try:
+            dictionary = Dictionary.new(strokes_text_output_dir)
+            self.assertIsNone(dictionary.load_strokes("S"))
+        finally:
+            build_dictionary(
+                "tests/dictionaries/search.txt", strokes_text_output_dir, strokes=True
+            )
+
+    def test_stroke_file_other_tokens(self):
+        path = Path(strokes_text_output_dir, "S" + STROKES_SUFFIX)
+        lines = path.read_text().splitlines(keepends=True)
+        checksum = lines[0].split()[0]
+        try:
+            for header in [f"{checksum}\n", f"{checksum} {TOKENS_CHECKSUM + 1}\n"]:
+                path.write_text(header + "".join(lines[1:]))
+                with self.subTest(header=header):
+                    dictionary = Dictionary.new(strokes_text_output_dir)
+                    self.assertIsNone(dictionary.load_strokes("S"))
+        finally:
+            build_dictionary(
+                "tests/dictionaries/search.txt", strokes_text_output_dir, strokes=True
+            )
+
+    def test_stale_stroke_file(self):
+        with open(Path(strokes_text_output_dir, "S"), "a") as f:
+            f.write("SABT Stale\n")
+        try:
+            dictionary = Dictionary.new(strokes_text_output_dir)
+            self.assertIsNone(dictionary.load_strokes("S"))
+            results = GrasciiSearcher(dictionaries=[strokes_text_output_dir]).search(
+                grascii="SABT"
+            )
+            interpretations = [r.interpretation for r in results]
+            self.assertIn(["S", "A", "B", "T"], interpretations)
+        finally:
+            build_dictionary(
+                "tests/dictionaries/search.txt", strokes_text_output_dir, strokes=True
+            )
+
+
 class TestSortedGrasciiSearches(unittest.TestCase):
     def test_shorter_grascii_first(self):
         searcher = GrasciiSearcher(dictionaries=[sorted_output_dir])
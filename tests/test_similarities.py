@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from grascii import defaults, grammar
+from grascii.config import ConfigPreset
+from grascii.regen import RegexBuilder
+from grascii.similarities import (
+    InvalidSimilarityGraph,
+    SimilarityMatrix,
+    _disconnected_nodes,
+    _trans_edges,
+    get_node,
+    get_similar,
+    get_similarity_matrix,
+    load_graphml,
+)
+
+GRAPHML = """<?xml version="1.0" encoding="UTF-8"?>
+<graphml xmlns="http://graphml.graphdrawing.org/xmlns">
+  <key id="d0" for="node" attr.name="label" attr.type="string"/>
+  <graph edgedefault="undirected">
+    <node id="k"><data key="d0">K</data></node>
+    <node id="t"><data key="d0">T</data></node>
+    <node id="s"><data key="d0">S, Z</data></node>
+    <node id="O"/>
+    <edge source="k" target="t"/>
+    <edge source="s" target="t"/>
+  </graph>
+</graphml>
+"""
+
+
+def reference_similar(stroke, distance):
+    """The strokes within a distance of a stroke found with a breadth-first
+    search of the default graph."""
+
+    neighbors = {}
+    for node1, node2 in _trans_edges:
+        neighbors.setdefault(node1, set()).add(node2)
+        neighbors.setdefault(node2, set()).add(node1)
+    similar = {get_node(stroke)}
+    for _ in range(distance):
+        similar |= {n for node in similar for n in neighbors.get(node, ())}
+    return similar
+
+
+class TestSimilarityMatrix(unittest.TestCase):
+    def test_default(self):
+        for stroke in sorted(grammar.STROKES):
+            for distance in range(4):
+                with self.subTest(stroke=stroke, distance=distance):
+                    self.assertSetEqual(
+                        get_similar(stroke, distance),
+                        reference_similar(stroke, distance),
+                    )
+
+    def test_distance(self):
+        matrix = get_similarity_matrix()
+        self.assertEqual(matrix.distance("S", "Z"), 0)
+        self.assertEqual(matrix.distance("T", "D"), 1)
+        self.assertEqual(matrix.distance("T", "DD"), 2)
+        self.assertIsNone(matrix.distance("O", "A"))
+        for stroke1 in sorted(grammar.STROKES):
+            for stroke2 in sorted(grammar.STROKES):
+                distance = matrix.distance(stroke1, stroke2)
+                if distance is not None:
+                    self.assertIn(
+                        matrix.get_node(stroke2), get_similar(stroke1, distance)
+                    )
+                    self.assertNotIn(
+                        matrix.get_node(stroke2), get_similar(stroke1, distance - 1)
+                    )
+
+    def test_unreachable(self):
+        matrix = get_similarity_matrix()
+        for distance in [len(matrix.nodes), len(matrix.nodes) + 1, 1000]:
+            similar = get_similar("T", distance)
+            self.assertNotIn(("O",), similar)
+            self.assertNotIn(("U",), similar)
+            self.assertSetEqual(similar, reference_similar("T", distance))
+
+    def test_presets(self):
+        self.assertIs(
+            get_similarity_matrix(ConfigPreset.PREANNIVERSARY), get_similarity_matrix()
+        )
+        for preset in ConfigPreset:
+            self.assertIsInstance(get_similarity_matrix(preset), SimilarityMatrix)
+
+    def test_configured_preset(self):
+        with mock.patch.dict(defaults.SEARCH, {"Preset": "anniversary"}):
+            self.assertIs(
+                get_similarity_matrix(),
+                get_similarity_matrix(ConfigPreset.ANNIVERSARY),
+            )
+        with mock.patch.dict(defaults.SEARCH, {"Preset": "unknown"}):
+            self.assertIs(
+                get_similarity_matrix(),
+                get_similarity_matrix(ConfigPreset.PREANNIVERSARY),
+            )
+
+    def test_cache_bounded(self):
+        matrix = SimilarityMatrix.from_edges(_trans_edges, _disconnected_nodes)
+        self.assertEqual(
+            matrix.get_similar("T", 1000), matrix.get_similar("T", matrix.max_distance)
+        )
+        for distance in range(1000):
+            matrix.get_similar("T", distance)
+        self.assertLessEqual(len(matrix._similar), matrix.max_distance + 1)
+
+    def test_unknown_stroke(self):
+        matrix = SimilarityMatrix.from_edges([(("K",), ("G",))])
+        self.assertEqual(matrix.get_similar("T", 2), {("T",)})
+        self.assertEqual(matrix.distance("T", "T"), 0)
+        self.assertIsNone(matrix.distance("T", "K"))
+
+
+class TestGraphML(unittest.TestCase):
+    def load(self, text):
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory, "graph.graphml")
+            path.write_text(text)
+            return load_graphml(path)
+
+    def test_docs_graph(self):
+        matrix = load_graphml("docs/images/sim_graph.graphml")
+        default = SimilarityMatrix.from_edges(_trans_edges, _disconnected_nodes)
+        for stroke1 in sorted(grammar.STROKES):
+            for stroke2 in sorted(grammar.STROKES):
+                self.assertEqual(
+                    matrix.distance(stroke1, stroke2),
+                    default.distance(stroke1, stroke2),
+                )
+
+    def test_labels(self):
+        matrix = self.load(GRAPHML)
+        self.assertEqual(matrix.get_node("Z"), ("S", "Z"))
+        self.assertEqual(matrix.distance("K", "S"), 2)
+        self.assertIsNone(matrix.distance("O", "K"))
+
+    def test_invalid(self):
+        invalid = [
+            "<graphml",
+            '<graphml xmlns="http://graphml.graphdrawing.org/xmlns"/>',
+            GRAPHML.replace(">K<", ">Q<"),
+            GRAPHML.replace(">K<", ">S<"),
+            GRAPHML.replace('target="t"', 'target="x"'),
+        ]
+        for text in invalid:
+            with self.subTest(text=text), self.assertRaises(InvalidSimilarityGraph):
+                self.load(text)
+
+    def test_regex_builder(self):
+        builder = RegexBuilder(uncertainty=1, similarity=self.load(GRAPHML))
+        alternatives = builder.get_stroke_alternatives(["K"])
+        self.assertCountEqual(alternatives[0], ["K", "T"])
+        alternatives = RegexBuilder(uncertainty=1).get_stroke_alternatives(["K"])
+        self.assertCountEqual(alternatives[0], ["K", "G"])